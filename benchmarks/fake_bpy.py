@@ -0,0 +1,912 @@
+"""
+In-memory stand-in for the parts of bpy and mathutils that dynamic_slideshow.py uses.
+
+Only meant for the benchmarks: state lives in plain Python objects, nothing is
+evaluated, drawn or rendered. Call install() before importing the add-on and
+reset() before building a new scene.
+"""
+import heapq, math, os, struct, sys, types
+
+
+################### mathutils
+
+class Vector:
+    __slots__ = ('_values',)
+
+    def __init__(self, values=(0.0, 0.0, 0.0)):
+        self._values = [float(value) for value in values]
+
+    x = property(lambda self: self._values[0], lambda self, value: self.__setitem__(0, value))
+    y = property(lambda self: self._values[1], lambda self, value: self.__setitem__(1, value))
+    z = property(lambda self: self._values[2], lambda self, value: self.__setitem__(2, value))
+
+    def __getitem__(self, index):
+        return self._values[index]
+
+    def __setitem__(self, index, value):
+        self._values[index] = float(value)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __add__(self, other):
+        return Vector(a + b for a, b in zip(self, other))
+
+    def __sub__(self, other):
+        return Vector(a - b for a, b in zip(self, other))
+
+    def __mul__(self, factor):
+        return Vector(a * factor for a in self)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return 'Vector(' + repr(tuple(self._values)) + ')'
+
+    @property
+    def length(self):
+        return math.sqrt(sum(a * a for a in self._values))
+
+    def copy(self):
+        return Vector(self._values)
+
+class KDTree:
+    """Brute force, same interface as mathutils.kdtree.KDTree"""
+    def __init__(self, size):
+        self.points = []
+
+    def insert(self, co, index):
+        self.points.append((Vector(co), index))
+
+    def balance(self):
+        pass
+
+    def find_n(self, co, n):
+        co = Vector(co)
+        nearest = heapq.nsmallest(n, self.points, key=lambda point: (point[0] - co).length)
+        return [(point_co, index, (point_co - co).length) for point_co, index in nearest]
+
+    def find(self, co):
+        nearest = self.find_n(co, 1)
+        if len(nearest) == 0:
+            return (None, None, None)
+        return nearest[0]
+
+
+################### Properties
+
+class Property:
+    """Data descriptor like the ones bpy.props registers on a type"""
+    def __init__(self, default=None, update=None, factory=None):
+        self.default = default
+        self.update = update
+        self.factory = factory
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        values = instance.__dict__.setdefault('_rna_values', {})
+        if id(self) not in values:
+            values[id(self)] = self.factory() if self.factory != None else self.default
+        return values[id(self)]
+
+    def __set__(self, instance, value):
+        instance.__dict__.setdefault('_rna_values', {})[id(self)] = value
+        if self.update != None:
+            self.update(instance, context)
+
+def make_property(default):
+    def property_function(**kwargs):
+        return Property(kwargs.get('default', default), kwargs.get('update'))
+    return property_function
+
+def EnumProperty(**kwargs):
+    default = kwargs.get('default', kwargs['items'][0][0])
+    return Property(default, kwargs.get('update'))
+
+def CollectionProperty(**kwargs):
+    item_type = kwargs['type']
+    return Property(factory=lambda: PropertyCollection(item_type))
+
+def PointerProperty(**kwargs):
+    item_type = kwargs['type']
+    if issubclass(item_type, PropertyGroup):
+        return Property(factory=item_type, update=kwargs.get('update'))
+    return Property(None, kwargs.get('update'))
+
+class PropertyCollection:
+    def __init__(self, item_type):
+        self.item_type = item_type
+        self.items = []
+
+    def add(self):
+        item = self.item_type()
+        self.items.append(item)
+        return item
+
+    def remove(self, index):
+        del self.items[index]
+
+    def move(self, old_index, new_index):
+        self.items.insert(new_index, self.items.pop(old_index))
+
+    def clear(self):
+        self.items = []
+
+    def find(self, name):
+        for i, item in enumerate(self.items):
+            if item.name == name:
+                return i
+        return -1
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __iter__(self):
+        return iter(list(self.items))
+
+
+################### bpy.types
+
+class bpy_struct:
+    def __init__(self):
+        self.id_properties = {}
+
+    def __getitem__(self, key):
+        return self.id_properties[key]
+
+    def __setitem__(self, key, value):
+        self.id_properties[key] = value
+
+    def __delitem__(self, key):
+        del self.id_properties[key]
+
+    def __contains__(self, key):
+        return key in self.id_properties
+
+    def get(self, key, default=None):
+        return self.id_properties.get(key, default)
+
+    def keys(self):
+        return self.id_properties.keys()
+
+class PropertyGroup(bpy_struct):
+    pass
+
+class Operator(bpy_struct):
+    def __init__(self):
+        bpy_struct.__init__(self)
+        self.reports = []
+
+    def report(self, type, message):
+        self.reports.append((type, message))
+
+class OperatorFileListElement(PropertyGroup):
+    pass
+
+class Panel:
+    pass
+
+class Menu:
+    pass
+
+class UIList:
+    pass
+
+class ID(bpy_struct):
+    collection_name = None
+
+    def __init__(self, name):
+        bpy_struct.__init__(self)
+        self._name = name
+        self.is_updated = False
+
+    def _set_name(self, name):
+        # renamed data is found by its new name
+        collection = getattr(data, self.collection_name)
+        if collection.items.get(self._name) is self:
+            del collection.items[self._name]
+            collection.add(self, name)
+        else:
+            self._name = name
+
+    name = property(lambda self: self._name, _set_name)
+
+    def copy(self):
+        new_id = self.__class__.__new__(self.__class__)
+        new_id.__dict__.update(self.__dict__)
+        new_id.id_properties = dict(self.id_properties)
+        new_id.__dict__['_rna_values'] = dict(self.__dict__.get('_rna_values', {}))
+        getattr(data, self.collection_name).add(new_id, self.name)
+        return new_id
+
+class Camera(ID):
+    collection_name = 'cameras'
+
+    def __init__(self, name):
+        ID.__init__(self, name)
+        self.type = 'PERSP'
+        self.lens = 35.0
+        self.sensor_width = 32.0
+        self.ortho_scale = 7.0
+        self.shift_x = 0.0
+        self.shift_y = 0.0
+        self.clip_start = 0.1
+        self.clip_end = 100.0
+
+class MeshUVLoops:
+    def __init__(self):
+        self.uv = []
+
+    def foreach_set(self, attr, values):
+        setattr(self, attr, [float(value) for value in values])
+
+class MeshUVTextures(list):
+    def __init__(self, mesh):
+        list.__init__(self)
+        self.mesh = mesh
+        self.active = None
+
+    def new(self, name='UVMap'):
+        uv_texture = types.SimpleNamespace(name=name, data=[types.SimpleNamespace(image=None) for polygon in self.mesh.polygons])
+        self.append(uv_texture)
+        self.mesh.uv_layers.append(types.SimpleNamespace(name=name, data=MeshUVLoops()))
+        if self.active == None:
+            self.active = uv_texture
+        return uv_texture
+
+class Mesh(ID):
+    collection_name = 'meshes'
+
+    def __init__(self, name):
+        ID.__init__(self, name)
+        self.materials = []
+        self.vertices = []
+        self.polygons = []
+        self.uv_layers = []
+        self.uv_textures = MeshUVTextures(self)
+
+    def from_pydata(self, vertices, edges, faces):
+        self.vertices = [Vector(vertex) for vertex in vertices]
+        self.polygons = [tuple(face) for face in faces]
+
+class TextureSlots(list):
+    def add(self):
+        texture_slot = TextureSlot(None)
+        self.append(texture_slot)
+        return texture_slot
+
+class Material(ID):
+    collection_name = 'materials'
+
+    def __init__(self, name):
+        ID.__init__(self, name)
+        self.use_shadeless = False
+        self.use_fake_user = False
+        self.texture_slots = TextureSlots()
+
+    def copy(self):
+        new_material = ID.copy(self)
+        new_material.texture_slots = TextureSlots()
+        for texture_slot in self.texture_slots:
+            new_texture_slot = new_material.texture_slots.add()
+            new_texture_slot.__dict__.update(texture_slot.__dict__)
+        return new_material
+
+class Texture(ID):
+    collection_name = 'textures'
+
+    def __init__(self, name, type='IMAGE', image=None):
+        ID.__init__(self, name)
+        self.type = type
+        self.image = image
+
+class TextureSlot:
+    def __init__(self, texture):
+        self.texture = texture
+        self.texture_coords = 'ORCO'
+
+class Image(ID):
+    collection_name = 'images'
+
+    def __init__(self, name, filepath='', size=(1920, 1080)):
+        ID.__init__(self, name)
+        self.filepath = filepath
+        self.size = list(size)
+
+    def buffers_free(self):
+        pass
+
+class KeyframeVector:
+    # view of one point's pair in the flat lists of KeyframePoints
+    def __init__(self, points, attr, index):
+        self.points = points
+        self.attr = attr
+        self.index = index
+
+    @property
+    def x(self):
+        return self.points.values[self.attr][self.index*2]
+
+    @x.setter
+    def x(self, value):
+        self.points.values[self.attr][self.index*2] = float(value)
+
+    @property
+    def y(self):
+        return self.points.values[self.attr][self.index*2 + 1]
+
+    @y.setter
+    def y(self, value):
+        self.points.values[self.attr][self.index*2 + 1] = float(value)
+
+class Keyframe:
+    def __init__(self, points, index):
+        self.co = KeyframeVector(points, 'co', index)
+        self.handle_left = KeyframeVector(points, 'handle_left', index)
+        self.handle_right = KeyframeVector(points, 'handle_right', index)
+
+class KeyframePoints:
+    def __init__(self):
+        self.values = {'co': [], 'handle_left': [], 'handle_right': []}
+
+    def add(self, count):
+        for attr in self.values:
+            self.values[attr] += [0.0] * (count * 2)
+
+    def __len__(self):
+        return len(self.values['co']) // 2
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return Keyframe(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield Keyframe(self, index)
+
+    def foreach_get(self, attr, values):
+        values[:] = self.values[attr]
+
+    def foreach_set(self, attr, values):
+        self.values[attr] = [float(value) for value in values]
+
+class FCurve:
+    def __init__(self, data_path, index=0):
+        self.data_path = data_path
+        self.array_index = index
+        self.keyframe_points = KeyframePoints()
+
+    def update(self):
+        pass
+
+class FCurves(list):
+    def new(self, data_path, index=0, action_group=''):
+        fcurve = FCurve(data_path, index)
+        self.append(fcurve)
+        return fcurve
+
+class Action(ID):
+    collection_name = 'actions'
+
+    def __init__(self, name):
+        ID.__init__(self, name)
+        self.fcurves = FCurves()
+
+    def copy(self):
+        new_action = ID.copy(self)
+        new_action.fcurves = FCurves()
+        for fcurve in self.fcurves:
+            new_fcurve = new_action.fcurves.new(fcurve.data_path, fcurve.array_index)
+            for attr, values in fcurve.keyframe_points.values.items():
+                new_fcurve.keyframe_points.values[attr] = list(values)
+        return new_action
+
+class AnimData:
+    def __init__(self):
+        self.action = None
+
+class MaterialSlot:
+    def __init__(self, material):
+        self.material = material
+        self.link = 'DATA'
+
+class Object(ID):
+    collection_name = 'objects'
+
+    def __init__(self, name, object_data):
+        ID.__init__(self, name)
+        self.data = object_data
+        if isinstance(object_data, Camera):
+            self.type = 'CAMERA'
+        elif isinstance(object_data, Mesh):
+            self.type = 'MESH'
+        else:
+            self.type = 'EMPTY'
+        self._location = Vector()
+        self._delta_location = Vector()
+        self._scale = Vector((1.0, 1.0, 1.0))
+        self.rotation_euler = Vector()
+        # bounding box size, there is no geometry to compute it from
+        self._dimensions = Vector((1.0, 1.0, 0.0))
+        self.draw_type = 'TEXTURED'
+        self.select = False
+        self.animation_data = None
+        # material slots follow the mesh materials, linked to the mesh data
+        self.material_slots = [MaterialSlot(material) for material in getattr(object_data, 'materials', [])]
+        self.parent = None
+
+    location = property(lambda self: self._location, lambda self, value: setattr(self, '_location', Vector(value)))
+    delta_location = property(lambda self: self._delta_location, lambda self, value: setattr(self, '_delta_location', Vector(value)))
+    scale = property(lambda self: self._scale, lambda self, value: setattr(self, '_scale', Vector(value)))
+    dimensions = property(lambda self: self._dimensions, lambda self, value: setattr(self, '_dimensions', Vector(value)))
+
+    def copy(self):
+        new_object = ID.copy(self)
+        new_object._location = self._location.copy()
+        new_object._delta_location = self._delta_location.copy()
+        new_object._scale = self._scale.copy()
+        new_object.rotation_euler = self.rotation_euler.copy()
+        new_object._dimensions = self._dimensions.copy()
+        new_object.material_slots = [MaterialSlot(slot.material) for slot in self.material_slots]
+        if self.animation_data != None:
+            new_object.animation_data = AnimData()
+            new_object.animation_data.action = self.animation_data.action
+        return new_object
+
+    @property
+    def users(self):
+        # only scenes use objects here
+        return sum(1 for scene in data.scenes if self in scene.objects)
+
+    def animation_data_create(self):
+        if self.animation_data == None:
+            self.animation_data = AnimData()
+        return self.animation_data
+
+class Sequence(bpy_struct):
+    def __init__(self, name, type, channel, frame_start, duration):
+        bpy_struct.__init__(self)
+        self.name = name
+        self.type = type
+        self.channel = channel
+        self._start = frame_start
+        self._duration = duration
+        self.select = False
+        self.animation_offset_start = 0
+
+    def _get_frame_start(self):
+        return self._start
+
+    def _set_frame_start(self, value):
+        self._start = value
+
+    frame_start = property(lambda self: self._get_frame_start(), lambda self, value: self._set_frame_start(value))
+    frame_final_start = property(lambda self: self._get_frame_start())
+    frame_final_duration = property(lambda self: self._duration, lambda self, value: setattr(self, '_duration', value))
+
+    def _get_frame_final_end(self):
+        return self.frame_final_start + self._duration
+
+    def _set_frame_final_end(self, value):
+        self._duration = value - self.frame_final_start
+
+    frame_final_end = property(lambda self: self._get_frame_final_end(), lambda self, value: self._set_frame_final_end(value))
+
+    def update(self, data=False):
+        pass
+
+class SceneSequence(Sequence):
+    def __init__(self, name, scene, channel, frame_start):
+        Sequence.__init__(self, name, 'SCENE', channel, frame_start, scene.frame_end - scene.frame_start + 1)
+        self.scene = scene
+        self.scene_camera = None
+
+class ImageSequence(Sequence):
+    def __init__(self, name, filepath, channel, frame_start):
+        Sequence.__init__(self, name, 'IMAGE', channel, frame_start, 1)
+        self.directory = os.path.dirname(filepath)
+        self.elements = ImageElements(self, os.path.basename(filepath))
+
+class ImageElements(list):
+    def __init__(self, sequence, filename):
+        list.__init__(self, [types.SimpleNamespace(filename=filename)])
+        self.sequence = sequence
+
+    def append(self, filename):
+        list.append(self, types.SimpleNamespace(filename=filename))
+        self.sequence._duration = len(self)
+
+class EffectSequence(Sequence):
+    def __init__(self, name, type, channel, frame_start, frame_end, seq1, seq2):
+        Sequence.__init__(self, name, type, channel, frame_start, max(frame_end - frame_start, 1))
+        self.input_1 = seq1
+        self.input_2 = seq2
+        self.transition_type = 'SINGLE'
+        self.direction = 'OUT'
+        self.blur_width = 0.0
+        self.angle = 0.0
+
+    def _get_frame_start(self):
+        # effects with two inputs cover the overlap of their inputs
+        if self.input_1 != None and self.input_2 != None:
+            return max(self.input_1.frame_final_start, self.input_2.frame_final_start)
+        return self._start
+
+    def _get_frame_final_end(self):
+        if self.input_1 != None and self.input_2 != None:
+            return min(self.input_1.frame_final_end, self.input_2.frame_final_end)
+        return Sequence._get_frame_final_end(self)
+
+    frame_final_duration = property(lambda self: self._get_frame_final_end() - self._get_frame_start(), lambda self, value: setattr(self, '_duration', value))
+
+class Sequences:
+    def __init__(self):
+        self.items = []
+
+    def new_scene(self, name, scene, channel, frame_start):
+        return self._add(SceneSequence(name, scene, channel, frame_start))
+
+    def new_image(self, name, filepath, channel, frame_start):
+        return self._add(ImageSequence(name, filepath, channel, frame_start))
+
+    def new_effect(self, name, type, channel, frame_start, frame_end=0, seq1=None, seq2=None, seq3=None):
+        return self._add(EffectSequence(name, type, channel, frame_start, frame_end, seq1, seq2))
+
+    def _add(self, seq):
+        self.items.append(seq)
+        return seq
+
+    def remove(self, seq):
+        self.items.remove(seq)
+
+    def get(self, name, default=None):
+        for seq in self.items:
+            if seq.name == name:
+                return seq
+        return default
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(list(self.items))
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.get(key)
+        return self.items[key]
+
+class SequenceEditor:
+    def __init__(self):
+        self.sequences = Sequences()
+        self.sequences_all = self.sequences
+        self.active_strip = None
+
+class SceneObjects:
+    def __init__(self):
+        self.items = []
+        self.active = None
+
+    def link(self, obj):
+        self.items.append(obj)
+
+    def unlink(self, obj):
+        self.items.remove(obj)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(list(self.items))
+
+    def __contains__(self, obj):
+        return obj in self.items
+
+class TimelineMarker:
+    def __init__(self, name, frame):
+        self.name = name
+        self.frame = frame
+        self.camera = None
+
+class TimelineMarkers(list):
+    def new(self, name, frame=1):
+        marker = TimelineMarker(name, frame)
+        self.append(marker)
+        return marker
+
+class RenderSettings:
+    def __init__(self):
+        self.engine = 'BLENDER_RENDER'
+        self.resolution_x = 1920
+        self.resolution_y = 1080
+        self.resolution_percentage = 100
+        self.fps = 25
+        self.fps_base = 1.0
+        self.filepath = '/tmp/'
+        self.use_file_extension = True
+        self.pixel_aspect_x = 1.0
+        self.pixel_aspect_y = 1.0
+        self.is_movie_format = False
+        self.use_sequencer = True
+        self.use_compositing = True
+        self.threads = 1
+        self.image_settings = types.SimpleNamespace(file_format='PNG', color_mode='RGBA', quality=90)
+
+    def frame_path(self, frame=0, preview=False, view=''):
+        return self.filepath + '{:04d}.png'.format(frame)
+
+class Scene(ID):
+    collection_name = 'scenes'
+
+    def __init__(self, name):
+        ID.__init__(self, name)
+        self.objects = SceneObjects()
+        self.camera = None
+        self.frame_current = 1
+        self.frame_start = 1
+        self.frame_end = 250
+        self.sequence_editor = None
+        self.render = RenderSettings()
+        self.game_settings = types.SimpleNamespace(material_mode='MULTITEXTURE')
+        self.cursor_location = Vector()
+        self.timeline_markers = TimelineMarkers()
+        self.view_settings = types.SimpleNamespace(view_transform='Default', look='None', exposure=0.0, gamma=1.0)
+
+    def sequence_editor_create(self):
+        if self.sequence_editor == None:
+            self.sequence_editor = SequenceEditor()
+        return self.sequence_editor
+
+    def frame_set(self, frame, subframe=0.0):
+        self.frame_current = frame
+
+class WindowManager(bpy_struct):
+    def progress_begin(self, min_value, max_value):
+        pass
+
+    def progress_update(self, value):
+        pass
+
+    def progress_end(self):
+        pass
+
+    def invoke_props_dialog(self, operator):
+        return {'RUNNING_MODAL'}
+
+    def fileselect_add(self, operator):
+        pass
+
+
+################### bpy.data
+
+class IDCollection:
+    def __init__(self, id_type):
+        self.id_type = id_type
+        self.items = {}
+        self.is_updated = False
+        # last used number suffix per name, the search must not dominate the timings
+        self.name_counters = {}
+
+    def unique_name(self, name):
+        if name not in self.items:
+            return name
+        base_name = name.rsplit('.', 1)[0] if name[-4:-3] == '.' and name[-3:].isdigit() else name
+        i = self.name_counters.get(base_name, 0) + 1
+        while base_name + '.{:03d}'.format(i) in self.items:
+            i += 1
+        self.name_counters[base_name] = i
+        return base_name + '.{:03d}'.format(i)
+
+    def add(self, new_id, name):
+        new_id._name = self.unique_name(name)
+        self.items[new_id.name] = new_id
+        return new_id
+
+    def new(self, name, *args, **kwargs):
+        new_id = self.id_type(name, *args, **kwargs)
+        return self.add(new_id, name)
+
+    def remove(self, old_id, do_unlink=False):
+        del self.items[old_id.name]
+        if do_unlink and isinstance(old_id, Object):
+            for scene in data.scenes:
+                if old_id in scene.objects:
+                    scene.objects.unlink(old_id)
+
+    def get(self, name, default=None):
+        return self.items.get(name, default)
+
+    def load(self, filepath, check_existing=False):
+        # only the header size is known, files that can't be parsed get the default size
+        image = self.new(os.path.basename(filepath), filepath)
+        try:
+            with open(filepath, 'rb') as f:
+                header = f.read(24)
+            if header[:8] == b'\x89PNG\r\n\x1a\n':
+                image.size = list(struct.unpack('>II', header[16:24]))
+        except OSError:
+            pass
+        return image
+
+    def __getitem__(self, name):
+        return self.items[name]
+
+    def __contains__(self, name):
+        return name in self.items
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(list(self.items.values()))
+
+class BlendData:
+    def __init__(self):
+        self.objects = IDCollection(Object)
+        self.cameras = IDCollection(Camera)
+        self.meshes = IDCollection(Mesh)
+        self.materials = IDCollection(Material)
+        self.textures = IDCollection(Texture)
+        self.images = IDCollection(Image)
+        self.actions = IDCollection(Action)
+        self.scenes = IDCollection(Scene)
+        self.filepath = ''
+
+class Context:
+    def __init__(self, scene):
+        self.scene = scene
+        self.window_manager = window_manager
+        self.screen = types.SimpleNamespace(areas=[], is_animation_playing=False)
+        self.space_data = None
+        self.user_preferences = types.SimpleNamespace(addons={}, edit=None)
+
+    @property
+    def active_object(self):
+        return self.scene.objects.active
+
+
+################### bpy.ops
+
+def select_all(action='TOGGLE'):
+    for obj in context.scene.objects:
+        obj.select = action == 'SELECT'
+    return {'FINISHED'}
+
+def duplicate_move(OBJECT_OT_duplicate=None, TRANSFORM_OT_translate=None):
+    # like Blender, walks every object of the scene for the selected ones
+    scene = context.scene
+    selected_objects = [obj for obj in scene.objects if obj.select]
+    for obj in selected_objects:
+        new_object = obj.copy()
+        if obj.data != None and not (OBJECT_OT_duplicate or {}).get('linked', False):
+            new_object.data = obj.data.copy()
+            if obj.animation_data != None and obj.animation_data.action != None:
+                new_object.animation_data.action = obj.animation_data.action.copy()
+        obj.select = False
+        new_object.select = True
+        scene.objects.link(new_object)
+        scene.objects.active = new_object
+    return {'FINISHED'}
+
+def render(animation=False, write_still=False, scene=''):
+    # writes empty frame files, the timings must not depend on pixels
+    render_scene = data.scenes[scene] if scene != '' else context.scene
+    frames = range(render_scene.frame_start, render_scene.frame_end + 1) if animation else [render_scene.frame_current]
+    if animation or write_still:
+        for frame in frames:
+            open(render_scene.render.frame_path(frame), 'wb').close()
+    return {'FINISHED'}
+
+class OperatorNamespace:
+    """Any operator not listed does nothing"""
+    def __init__(self, operators=None):
+        self.operators = operators or {}
+
+    def __getattr__(self, name):
+        if name in self.operators:
+            return self.operators[name]
+        return lambda *args, **kwargs: {'FINISHED'}
+
+
+################### Module setup
+
+window_manager = WindowManager()
+data = BlendData()
+context = None
+
+def reset():
+    """
+    Start from empty data with one scene, keeps the registered properties.
+    """
+    global data, context
+    data = BlendData()
+    scene = data.scenes.new('Scene')
+    context = Context(scene)
+    bpy_module.data = data
+    bpy_module.context = context
+    return context
+
+def persistent(function):
+    return function
+
+bpy_module = types.ModuleType('bpy')
+
+def install():
+    """
+    Register the stand-in as bpy, bpy.props, bpy.app.handlers, mathutils and mathutils.kdtree.
+    """
+    bpy_types = types.ModuleType('bpy.types')
+    for cls in (bpy_struct, PropertyGroup, Operator, OperatorFileListElement, Panel, Menu, UIList, ID, Object, Camera, Mesh, Material,
+                Texture, Image, Action, Scene, WindowManager, Sequence):
+        setattr(bpy_types, cls.__name__, cls)
+
+    props = types.ModuleType('bpy.props')
+    props.IntProperty = make_property(0)
+    props.FloatProperty = make_property(0.0)
+    props.BoolProperty = make_property(False)
+    props.StringProperty = make_property('')
+    props.EnumProperty = EnumProperty
+    props.CollectionProperty = CollectionProperty
+    props.PointerProperty = PointerProperty
+
+    handlers = types.ModuleType('bpy.app.handlers')
+    for name in ('frame_change_pre', 'frame_change_post', 'load_post', 'undo_post', 'redo_post', 'scene_update_pre',
+                 'scene_update_post', 'render_init', 'render_complete', 'render_cancel', 'render_pre', 'render_post',
+                 'save_pre'):
+        setattr(handlers, name, [])
+    handlers.persistent = persistent
+    app = types.ModuleType('bpy.app')
+    app.handlers = handlers
+    app.binary_path = 'blender'
+    # an interactive session, background sessions skip the viewport updates
+    app.background = False
+
+    bpy_path = types.ModuleType('bpy.path')
+    bpy_path.abspath = lambda path: path[2:] if path.startswith('//') else path
+    bpy_path.basename = lambda path: os.path.basename(path[2:] if path.startswith('//') else path)
+
+    utils = types.ModuleType('bpy.utils')
+    utils.register_module = lambda module: None
+    utils.unregister_module = lambda module: None
+
+    bpy_module.types = bpy_types
+    bpy_module.props = props
+    bpy_module.app = app
+    bpy_module.path = bpy_path
+    bpy_module.utils = utils
+    bpy_module.ops = types.SimpleNamespace(
+        object=OperatorNamespace({'select_all': select_all, 'duplicate_move': duplicate_move}),
+        view3d=OperatorNamespace(),
+        wm=OperatorNamespace(),
+        render=OperatorNamespace({'render': render}),
+        )
+
+    mathutils = types.ModuleType('mathutils')
+    mathutils.Vector = Vector
+    kdtree = types.ModuleType('mathutils.kdtree')
+    kdtree.KDTree = KDTree
+    mathutils.kdtree = kdtree
+
+    sys.modules.update({
+        'bpy': bpy_module,
+        'bpy.types': bpy_types,
+        'bpy.props': props,
+        'bpy.app': app,
+        'bpy.app.handlers': handlers,
+        'bpy.path': bpy_path,
+        'bpy.utils': utils,
+        'mathutils': mathutils,
+        'mathutils.kdtree': kdtree,
+        })
+    reset()
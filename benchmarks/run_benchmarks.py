@@ -0,0 +1,467 @@
+"""
+Scaling benchmarks of dynamic_slideshow.py, run against the in-memory bpy stand-in
+in fake_bpy.py, so they need neither Blender nor a display:
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sizes 10 100 --repeat 1
+    python benchmarks/run_benchmarks.py --update-baseline
+
+Each benchmark runs --repeat times at every size and the median counts, the
+exponent column is the slope of the log-log curve to the previous size (1.0 is
+linear). The run fails if a timing exceeds its stored baseline by more than
+the tolerance factor, or if an exponent grew by more than 0.5 against the
+baseline. Timings under MIN_COMPARED_TIME are not compared.
+"""
+import argparse, gc, json, math, os, shutil, statistics, struct, sys, tempfile, time, types
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCHMARK_DIR)
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+import fake_bpy
+fake_bpy.install()
+import dynamic_slideshow as ds
+ds.register()
+
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+# frames between two frame_change_handler calls when playing the timeline
+FRAME_STEP = 5
+# frames per draw type run, independent of the size
+PLAYBACK_FRAMES = 250
+# Next/Previous presses per navigation run, independent of the size
+NAVIGATION_STEPS = 100
+# grown exponents below this are measuring noise
+EXPONENT_SLACK = 0.5
+# timings below this are not compared, in seconds, shorter stages vary by more than the tolerance
+MIN_COMPARED_TIME = 0.010
+# benchmarks of replaced quadratic code paths, only run up to this size
+MAX_SIZES = {'duplicate_cameras': 5000}
+
+
+################### Scenes
+
+def new_context(sequence_length=100, effect_length=25):
+    context = fake_bpy.reset()
+    wm = context.window_manager
+    wm.ds_sequence_length = sequence_length
+    wm.ds_effect_length = effect_length
+    wm.ds_start_frame = 1
+    # the add-on caches belong to the previous scene
+    ds.load_post_handler(None)
+    return context
+
+def add_camera(scene, keyframe_count=4):
+    camera = fake_bpy.data.objects.new('Camera', fake_bpy.data.cameras.new('Camera'))
+    camera.location = (0.0, 0.0, 2.0)
+    action = fake_bpy.data.actions.new('CameraAction')
+    for i in range(3):
+        keyframe_points = action.fcurves.new('location', i).keyframe_points
+        keyframe_points.add(keyframe_count)
+        keyframe_points.foreach_set('co', [value for k in range(keyframe_count) for value in (k*25.0 + 1.0, 0.0)])
+    camera.animation_data_create().action = action
+    scene.objects.link(camera)
+    scene.camera = camera
+    return camera
+
+def add_image_planes(scene, image_count, gap=0.2):
+    planes = []
+    for i in range(image_count):
+        mesh = fake_bpy.data.meshes.new('Image.{:05d}'.format(i))
+        plane = fake_bpy.data.objects.new('Image.{:05d}'.format(i), mesh)
+        plane.location = (i*(2.0 + gap), 0.0, 0.0)
+        plane.dimensions = (2.0 if i%4 else 0.75, 1.0, 0.0)
+        material = fake_bpy.data.materials.new('Image.{:05d}'.format(i))
+        image = fake_bpy.data.images.new('Image.{:05d}.jpg'.format(i), '//images/Image.{:05d}.jpg'.format(i))
+        material.texture_slots.append(fake_bpy.TextureSlot(fake_bpy.data.textures.new('Image.{:05d}'.format(i), 'IMAGE', image)))
+        plane.material_slots.append(fake_bpy.MaterialSlot(material))
+        scene.objects.link(plane)
+        planes.append(plane)
+    return planes
+
+def new_slideshow_scene(image_count, sequence_length=100, effect_length=25):
+    context = new_context(sequence_length, effect_length)
+    add_image_planes(context.scene, image_count)
+    add_camera(context.scene)
+    return context
+
+def new_setup_slideshow(image_count, sequence_length=100, effect_length=25):
+    context = new_slideshow_scene(image_count, sequence_length, effect_length)
+    operator = ds.SetupSlideshowOperator()
+    if operator.execute(context) != {'FINISHED'}:
+        raise RuntimeError('Setup failed: ' + str(operator.reports))
+    return context
+
+
+def write_jpeg_header(path, width, height, capture_time, orientation=1):
+    # a JPEG with EXIF segment and frame header, there is no scan data
+    date_time = time.strftime('%Y:%m:%d %H:%M:%S', time.localtime(capture_time)).encode('ascii') + b'\0'
+    exif_ifd_offset = 8 + 2 + 2*12 + 4
+    date_offset = exif_ifd_offset + 2 + 12 + 4
+    tiff = b'MM\0*' + struct.pack('>I', 8)
+    tiff += struct.pack('>H', 2)
+    tiff += struct.pack('>HHIHH', 0x0112, 3, 1, orientation, 0)
+    tiff += struct.pack('>HHII', 0x8769, 4, 1, exif_ifd_offset)
+    tiff += struct.pack('>I', 0)
+    tiff += struct.pack('>H', 1) + struct.pack('>HHII', 0x9003, 2, len(date_time), date_offset) + struct.pack('>I', 0)
+    tiff += date_time
+    app1 = b'Exif\0\0' + tiff
+    sof = struct.pack('>BHHB', 8, height, width, 3) + b'\x01\x22\0\x02\x11\x01\x03\x11\x01'
+    with open(path, 'wb') as image_file:
+        image_file.write(b'\xff\xd8')
+        image_file.write(b'\xff\xe1' + struct.pack('>H', len(app1) + 2) + app1)
+        image_file.write(b'\xff\xc0' + struct.pack('>H', len(sof) + 2) + sof)
+        image_file.write(b'\xff\xd9')
+
+def write_png_header(path, width, height):
+    with open(path, 'wb') as image_file:
+        image_file.write(b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0) + b'\0\0\0\0')
+
+def write_image_headers(image_dir, image_count):
+    image_files = []
+    for i in range(image_count):
+        if i%10 == 9:
+            path = os.path.join(image_dir, 'image_{:05d}.png'.format(i))
+            write_png_header(path, 1200, 800)
+        else:
+            path = os.path.join(image_dir, 'image_{:05d}.jpg'.format(i))
+            write_jpeg_header(path, 4000 + i%3, 3000, 1500000000 + (image_count - i)*60, 1 + i%8)
+        image_files.append(path)
+    return image_files
+
+
+################### Benchmarks
+
+def run_setup(image_count):
+    context = new_slideshow_scene(image_count)
+    operator = ds.SetupSlideshowOperator()
+    start = time.perf_counter()
+    operator.execute(context)
+    return time.perf_counter() - start
+
+def create_cameras_duplicate_move(template_camera, template_plane, planes):
+    # the operator loop create_cameras_for_planes replaced, kept for the comparison
+    scene = fake_bpy.context.scene
+    fake_bpy.select_all('DESELECT')
+    template_camera.select = True
+    scene.objects.active = template_camera
+    last_plane = template_plane
+    for plane in planes:
+        fake_bpy.bpy_module.ops.object.duplicate_move(OBJECT_OT_duplicate={'linked': False})
+        new_camera = fake_bpy.context.active_object
+        new_camera.delta_location[0] += plane.location.x - last_plane.location.x
+        new_camera.delta_location[1] += plane.location.y - last_plane.location.y
+        new_camera.ds_picture_plane = plane
+        last_plane = plane
+
+def run_create_cameras(image_count):
+    context = new_slideshow_scene(image_count)
+    planes = [obj for obj in context.scene.objects if obj.type == 'MESH']
+    start = time.perf_counter()
+    ds.create_cameras_for_planes(context.scene.camera, planes[0], planes[1:])
+    return time.perf_counter() - start
+
+def run_duplicate_cameras(image_count):
+    # compare with create_cameras
+    context = new_slideshow_scene(image_count)
+    planes = [obj for obj in context.scene.objects if obj.type == 'MESH']
+    start = time.perf_counter()
+    create_cameras_duplicate_move(context.scene.camera, planes[0], planes[1:])
+    return time.perf_counter() - start
+
+def run_navigation(image_count):
+    context = new_setup_slideshow(image_count)
+    scene = context.scene
+    ds.reset_camera_navigation()
+    next_operator = ds.ActivateNextCameraOperator()
+    previous_operator = ds.ActivatePreviousCameraOperator()
+    operator = next_operator
+    start = time.perf_counter()
+    for step in range(NAVIGATION_STEPS):
+        # the panel polls both buttons on every redraw
+        if not (ds.ActivateNextCameraOperator.poll(context) and ds.ActivatePreviousCameraOperator.poll(context)):
+            break
+        camera = scene.camera
+        operator.execute(context)
+        if scene.camera == camera:
+            # end of the row reached, walk back
+            operator = previous_operator if operator == next_operator else next_operator
+    return time.perf_counter() - start
+
+def run_frame_handler(image_count):
+    context = new_setup_slideshow(image_count)
+    scene = context.scene
+    ds.reset_textured_planes()
+    start = time.perf_counter()
+    for frame in range(scene.frame_start, scene.frame_end + 1, FRAME_STEP):
+        scene.frame_current = frame
+        ds.frame_change_handler(scene)
+    return time.perf_counter() - start
+
+def play_draw_types(scene, full_update):
+    ds.reset_textured_planes()
+    # the sequence index and plane registry are built before, both variants share them
+    ds.get_sequences_for_frame(scene.frame_start)
+    ds.get_slideshow_planes()
+    start = time.perf_counter()
+    for frame in range(scene.frame_start, scene.frame_start + PLAYBACK_FRAMES):
+        scene.frame_current = frame
+        if full_update:
+            # every frame change starts from all planes 'WIRE'
+            ds.reset_textured_planes()
+        ds.update_textured_planes()
+    return time.perf_counter() - start
+
+def run_draw_types(image_count):
+    context = new_setup_slideshow(image_count)
+    return play_draw_types(context.scene, False)
+
+def run_draw_types_all_planes(image_count):
+    # the full pass per frame update_textured_planes replaced, compare with draw_types
+    context = new_setup_slideshow(image_count)
+    return play_draw_types(context.scene, True)
+
+def run_render_frames(image_count):
+    # frame changes of an animation render, compare with frame_handler
+    context = new_setup_slideshow(image_count)
+    scene = context.scene
+    ds.reset_textured_planes()
+    start = time.perf_counter()
+    ds.render_init_handler(None)
+    for frame in range(scene.frame_start, scene.frame_end + 1, FRAME_STEP):
+        scene.frame_current = frame
+        ds.frame_change_handler(scene)
+    ds.render_end_handler(None)
+    return time.perf_counter() - start
+
+def run_manual_add_effects(image_count):
+    context = new_context()
+    scene = context.scene
+    sequences = scene.sequence_editor_create().sequences
+    for i in range(image_count):
+        seq = sequences.new_scene('strip_{:05d}'.format(i), scene, 1 + i%2, 1 + i*100)
+        seq.frame_final_duration = 125
+        seq.select = True
+    operator = ds.ManualAddEffectsTypeOperator()
+    start = time.perf_counter()
+    operator.execute(context)
+    return time.perf_counter() - start
+
+def run_layout(image_count):
+    # lay out a set up slideshow and lay it out again, cameras move along
+    context = new_setup_slideshow(image_count)
+    start = time.perf_counter()
+    for layout in ('GRID', 'SPIRAL'):
+        operator = ds.LayoutPlanesOperator()
+        operator.layout = layout
+        operator.execute(context)
+    return time.perf_counter() - start
+
+def run_ken_burns(image_count):
+    # replaces the template animation of every camera
+    context = new_setup_slideshow(image_count)
+    start = time.perf_counter()
+    ds.animate_ken_burns(context, ds.get_camera_navigation()['cameras'], 'RANDOM', 1.25, 1)
+    return time.perf_counter() - start
+
+def run_cached_render(image_count):
+    # one camera moved since the last render, short strips keep the cache small
+    cache_dir = tempfile.mkdtemp(prefix='ds_benchmark_')
+    try:
+        context = new_setup_slideshow(image_count, 4, 1)
+        context.window_manager.ds_frame_cache_dir = cache_dir
+        context.scene.render.filepath = os.path.join(cache_dir, 'output_')
+        operator = ds.CachedRenderOperator()
+        operator.execute(context)
+        ds.get_camera_navigation()['cameras'][image_count//2].location.z += 1.0
+        start = time.perf_counter()
+        operator.execute(context)
+        return time.perf_counter() - start
+    finally:
+        shutil.rmtree(cache_dir)
+
+def run_scan_metadata(image_count):
+    # cold scan, the header cache starts empty
+    image_dir = tempfile.mkdtemp(prefix='ds_benchmark_')
+    try:
+        image_files = write_image_headers(image_dir, image_count)
+        context = new_context()
+        context.window_manager.ds_proxy_cache_dir = image_dir
+        ds.reset_image_metadata_cache()
+        start = time.perf_counter()
+        ds.scan_image_metadata(image_files)
+        return time.perf_counter() - start
+    finally:
+        ds.reset_image_metadata_cache()
+        shutil.rmtree(image_dir)
+
+def run_import_images(image_count):
+    # headers are cached already, this times plane creation
+    image_dir = tempfile.mkdtemp(prefix='ds_benchmark_')
+    try:
+        image_files = write_image_headers(image_dir, image_count)
+        context = new_context()
+        context.window_manager.ds_proxy_cache_dir = image_dir
+        ds.reset_image_metadata_cache()
+        ds.scan_image_metadata(image_files)
+        operator = ds.ImportImagePlanesOperator()
+        operator.directory = image_dir
+        operator.files = [types.SimpleNamespace(name=os.path.basename(path)) for path in image_files]
+        start = time.perf_counter()
+        operator.execute(context)
+        return time.perf_counter() - start
+    finally:
+        ds.reset_image_metadata_cache()
+        shutil.rmtree(image_dir)
+
+def move_action_on_x_per_point(action, x_movement):
+    # the per point loop move_action_on_x replaced, kept for the comparison
+    for fcurve in action.fcurves:
+        for point in fcurve.keyframe_points:
+            point.co.x += x_movement
+            point.handle_left.x += x_movement
+            point.handle_right.x += x_movement
+
+def new_keyframe_action(keyframe_count):
+    context = new_context()
+    return add_camera(context.scene, keyframe_count).animation_data.action
+
+def run_move_action(keyframe_count):
+    # the size is the count of keys per fcurve here
+    action = new_keyframe_action(keyframe_count)
+    start = time.perf_counter()
+    ds.move_action_on_x(action, 100)
+    return time.perf_counter() - start
+
+def run_move_action_per_point(keyframe_count):
+    # compare with move_action_on_x
+    action = new_keyframe_action(keyframe_count)
+    start = time.perf_counter()
+    move_action_on_x_per_point(action, 100)
+    return time.perf_counter() - start
+
+BENCHMARKS = (
+    ('setup', run_setup),
+    ('create_cameras', run_create_cameras),
+    ('duplicate_cameras', run_duplicate_cameras),
+    ('navigation', run_navigation),
+    ('frame_handler', run_frame_handler),
+    ('draw_types', run_draw_types),
+    ('draw_types_all_planes', run_draw_types_all_planes),
+    ('render_frames', run_render_frames),
+    ('manual_add_effects', run_manual_add_effects),
+    ('layout', run_layout),
+    ('ken_burns', run_ken_burns),
+    ('cached_render', run_cached_render),
+    ('scan_metadata', run_scan_metadata),
+    ('import_images', run_import_images),
+    ('move_action_on_x', run_move_action),
+    ('move_action_per_point', run_move_action_per_point),
+    )
+
+
+################### Reporting
+
+def get_exponents(sizes, timings):
+    exponents = [None]
+    for i in range(1, len(sizes)):
+        if timings[i-1] > 0 and timings[i] > 0:
+            exponents.append(math.log(timings[i]/timings[i-1]) / math.log(sizes[i]/sizes[i-1]))
+        else:
+            exponents.append(None)
+    return exponents
+
+def format_exponent(exponent):
+    if exponent == None:
+        return '-'
+    return '{:.2f}'.format(exponent)
+
+def run_benchmark(function, size):
+    # like timeit, garbage of the previous runs is not collected during this one
+    gc.collect()
+    gc.disable()
+    try:
+        return function(size)
+    finally:
+        gc.enable()
+
+def run_benchmarks(sizes, repeat, names):
+    """
+    return: dict. Median timing in seconds per benchmark name and size
+    """
+    results = {}
+    for name, function in BENCHMARKS:
+        if names and name not in names:
+            continue
+        results[name] = {}
+        for size in sizes:
+            if size > MAX_SIZES.get(name, size):
+                continue
+            # large sizes take long enough to be stable after one run
+            runs = repeat if size < 10000 else 1
+            results[name][str(size)] = statistics.median(run_benchmark(function, size) for i in range(runs))
+    return results
+
+def print_results(results, baseline):
+    print('{:<20} {:>7} {:>12} {:>12} {:>9}'.format('benchmark', 'size', 'time [ms]', 'base [ms]', 'exponent'))
+    for name, timings in results.items():
+        sizes = sorted(int(size) for size in timings)
+        exponents = get_exponents(sizes, [timings[str(size)] for size in sizes])
+        for size, exponent in zip(sizes, exponents):
+            base_time = baseline.get(name, {}).get(str(size))
+            print('{:<20} {:>7} {:>12.2f} {:>12} {:>9}'.format(name, size, timings[str(size)]*1000.0,
+                  '-' if base_time == None else '{:.2f}'.format(base_time*1000.0), format_exponent(exponent)))
+
+def get_regressions(results, baseline, tolerance):
+    """
+    return: list. Messages of timings and exponents worse than the baseline
+    """
+    regressions = []
+    for name, timings in results.items():
+        base_timings = baseline.get(name, {})
+        for size, seconds in timings.items():
+            base_time = base_timings.get(size)
+            if base_time != None and seconds > MIN_COMPARED_TIME and seconds > base_time*tolerance:
+                regressions.append('{} at {}: {:.2f} ms, baseline {:.2f} ms'.format(name, size, seconds*1000.0, base_time*1000.0))
+        sizes = sorted(int(size) for size in timings if size in base_timings)
+        exponents = get_exponents(sizes, [timings[str(size)] for size in sizes])
+        base_exponents = get_exponents(sizes, [base_timings[str(size)] for size in sizes])
+        for size, exponent, base_exponent in zip(sizes, exponents, base_exponents):
+            if exponent != None and base_exponent != None and timings[str(size)] > MIN_COMPARED_TIME and exponent > base_exponent + EXPONENT_SLACK:
+                regressions.append('{} at {}: exponent {:.2f}, baseline {:.2f}'.format(name, size, exponent, base_exponent))
+    return regressions
+
+def load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH) as baseline_file:
+        return json.load(baseline_file)
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Scaling benchmarks of dynamic_slideshow.py')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Image counts')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per size, the median counts')
+    parser.add_argument('--tolerance', type=float, default=2.0, help='Allowed factor over the baseline timing')
+    parser.add_argument('--only', nargs='+', choices=[name for name, function in BENCHMARKS], help='Benchmarks to run')
+    parser.add_argument('--update-baseline', action='store_true', help='Store the timings as new baseline')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(sorted(args.sizes), args.repeat, args.only)
+    baseline = load_baseline()
+    print_results(results, baseline)
+
+    if args.update_baseline:
+        for name, timings in results.items():
+            baseline.setdefault(name, {}).update(timings)
+        with open(BASELINE_PATH, 'w') as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+        print('Baseline written to ' + BASELINE_PATH)
+        return 0
+
+    regressions = get_regressions(results, baseline, args.tolerance)
+    for message in regressions:
+        print('REGRESSION ' + message)
+    return 1 if len(regressions) > 0 else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
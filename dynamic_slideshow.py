@@ -4,7 +4,7 @@ bl_info = {
     "version": (0, 7),
     "blender": (2, 79, 0),
     "location": "View3D > Tool shelf > Slideshow (Tab)",
-    "description": "Addon for creating dynamic slideshows. Inspired by a CG Cookie Tutorial, this addon creates cameras and sequences for a slideshow. It uses the 'images as planes' addon for adding pictures.",
+    "description": "Addon for creating dynamic slideshows. Inspired by a CG Cookie Tutorial, this addon creates cameras and sequences for a slideshow. Pictures are added with its own importer or the 'images as planes' addon.",
     #"warning": "",
     "wiki_url": "https://github.com/hapit/blender_addon_dynamic_slideshow/wiki/Documentation",
     'tracker_url': 'https://github.com/hapit/blender_addon_dynamic_slideshow/issues',
@@ -12,35 +12,214 @@ bl_info = {
     "category": "Tools"}
 
 
-import bpy, urllib.request, random
-from math import sqrt
-from bpy.props import IntProperty, BoolProperty, EnumProperty, FloatProperty, StringProperty, CollectionProperty
+import bpy, urllib.request, random, os, sys, time, argparse, shutil, subprocess, tempfile, hashlib, json, cProfile, functools, struct, math
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from bpy.props import IntProperty, BoolProperty, EnumProperty, FloatProperty, StringProperty, CollectionProperty, PointerProperty
 from bpy.app.handlers import persistent
 from mathutils import Vector
+from mathutils.kdtree import KDTree
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+################### Instrumentation
+
+# upper bounds in ms of the frame change handler histogram buckets, the last bucket is open
+FRAME_HANDLER_BUCKETS = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0)
+
+# opt-in, set from ds_instrumentation. Instrumented functions only check this flag while it is off
+instrumentation_enabled = False
+instrumentation_stats = {}
+frame_handler_histogram = [0]*(len(FRAME_HANDLER_BUCKETS)+1)
+instrumentation_profile = None
+instrumentation_depth = 0
+
+def reset_instrumentation():
+    global instrumentation_stats, frame_handler_histogram, instrumentation_profile
+    instrumentation_stats = {}
+    frame_handler_histogram = [0]*(len(FRAME_HANDLER_BUCKETS)+1)
+    instrumentation_profile = None
+
+def set_instrumentation(enabled, use_cprofile=False):
+    global instrumentation_enabled, instrumentation_profile
+    instrumentation_enabled = enabled
+    if enabled and use_cprofile and instrumentation_profile == None:
+        instrumentation_profile = cProfile.Profile()
+    elif not use_cprofile:
+        instrumentation_profile = None
+
+def record_instrumentation(name, seconds):
+    stats = instrumentation_stats.get(name)
+    if stats == None:
+        stats = instrumentation_stats[name] = {'count': 0, 'total': 0.0, 'max': 0.0}
+    stats['count'] += 1
+    stats['total'] += seconds
+    stats['max'] = max(stats['max'], seconds)
+    if name == 'frame_change_handler':
+        frame_handler_histogram[bisect_left(FRAME_HANDLER_BUCKETS, seconds*1000)] += 1
+
+@contextmanager
+def instrument_section(name):
+    """
+    Record call count and wall time of the with block as name.
+    """
+    global instrumentation_depth
+    if not instrumentation_enabled:
+        yield
+        return
+    profile = instrumentation_profile
+    if profile != None and instrumentation_depth == 0:
+        profile.enable()
+    instrumentation_depth += 1
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_instrumentation(name, time.perf_counter() - start_time)
+        instrumentation_depth -= 1
+        if profile != None and instrumentation_depth == 0:
+            profile.disable()
+
+def instrumented(name):
+    """
+    Decorator, records the calls of the function as name while instrumentation is on.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not instrumentation_enabled:
+                return function(*args, **kwargs)
+            with instrument_section(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def get_instrumentation_report():
+    sections = {}
+    for name, stats in instrumentation_stats.items():
+        sections[name] = {
+            'count': stats['count'],
+            'total_ms': stats['total']*1000,
+            'mean_ms': stats['total']*1000/stats['count'],
+            'max_ms': stats['max']*1000,
+            }
+    histogram = []
+    for i, count in enumerate(frame_handler_histogram):
+        if i < len(FRAME_HANDLER_BUCKETS):
+            histogram.append(['<'+str(FRAME_HANDLER_BUCKETS[i]), count])
+        else:
+            histogram.append(['>='+str(FRAME_HANDLER_BUCKETS[-1]), count])
+    return {'sections': sections, 'frame_change_handler_ms': histogram}
 
 ################### Functions
 
-def get_distance(obj1, obj2):
+# highest channel of the VSE
+MAX_VSE_CHANNEL = 32
+
+class ChannelAllocator:
     """
-    return: float. Distance of the two objects
+    Occupied frame ranges [frame_start, frame_end) per VSE channel, sorted by start.
     """
-    l = []  # we store the loacation vector of each object
-    l.append(obj1.location)
-    l.append(obj2.location)
+    def __init__(self):
+        self.channels = {}
+    
+    def add(self, channel, frame_start, frame_end):
+        starts, ends = self.channels.setdefault(channel, ([], []))
+        i = bisect_right(starts, frame_start)
+        starts.insert(i, frame_start)
+        ends.insert(i, frame_end)
+    
+    def add_all(self, ranges):
+        # ranges: (channel, frame_start, frame_end) rows, sorted once per channel
+        for channel, frame_start, frame_end in ranges:
+            starts, ends = self.channels.setdefault(channel, ([], []))
+            starts.append(frame_start)
+            ends.append(frame_end)
+        for channel, (starts, ends) in self.channels.items():
+            order = sorted(range(len(starts)), key=lambda i: starts[i])
+            starts[:] = [starts[i] for i in order]
+            ends[:] = [ends[i] for i in order]
+    
+    def remove(self, channel, frame_start, frame_end):
+        starts, ends = self.channels.get(channel, ([], []))
+        i = bisect_left(starts, frame_start)
+        while i < len(starts) and starts[i] == frame_start:
+            if ends[i] == frame_end:
+                del starts[i]
+                del ends[i]
+                return True
+            i += 1
+        return False
     
-    distance = sqrt( (l[0][0] - l[1][0])**2 + (l[0][1] - l[1][1])**2 + (l[0][2] - l[1][2])**2)
-    return distance
+    def is_free(self, channel, frame_start, frame_end):
+        if channel not in self.channels:
+            return True
+        starts, ends = self.channels[channel]
+        i = bisect_right(starts, frame_start)
+        if i > 0 and ends[i-1] > frame_start:
+            return False
+        if i < len(starts) and starts[i] < frame_end:
+            return False
+        return True
+    
+    def find_free_channel(self, frame_start, frame_end, min_channel=1):
+        for channel in range(min_channel, MAX_VSE_CHANNEL+1):
+            if self.is_free(channel, frame_start, frame_end):
+                return channel
+        return None
+    
+    def allocate(self, frame_start, frame_end, min_channel=1):
+        """
+        return: int. Lowest channel >= min_channel with a free frame range, None if there is none
+        """
+        channel = self.find_free_channel(frame_start, frame_end, min_channel)
+        if channel != None:
+            self.add(channel, frame_start, frame_end)
+        return channel
+
+def build_channel_allocator(sequences, skip_sequences=()):
+    allocator = ChannelAllocator()
+    allocator.add_all([(seq.channel, seq.frame_final_start, seq.frame_final_end) for seq in sequences if seq not in skip_sequences])
+    return allocator
 
-def get_first_free_vse_channel():
+def get_vse_channel_allocator():
     if bpy.context.scene.sequence_editor == None:
-        return 1
-    else:
-        first_free_channel = 1
-        for seq in bpy.context.scene.sequence_editor.sequences:
-            if first_free_channel <= seq.channel:
-                first_free_channel = seq.channel + 1
-        return first_free_channel
+        return ChannelAllocator()
+    return build_channel_allocator(bpy.context.scene.sequence_editor.sequences)
+
+def move_sequences_to_channels(sequence_channels, allocator):
+    """
+    Move strips to new channels without overlapping on the way.
+    sequence_channels: list. (sequence, channel) pairs
+    allocator: ChannelAllocator of all strips, kept up to date
+    return: bool. False if a strip could not be moved
+    """
+    pending = [(seq, channel) for seq, channel in sequence_channels if seq.channel != channel]
+    while len(pending) > 0:
+        blocked = []
+        for seq, channel in pending:
+            if allocator.is_free(channel, seq.frame_final_start, seq.frame_final_end):
+                allocator.remove(seq.channel, seq.frame_final_start, seq.frame_final_end)
+                seq.channel = channel
+                allocator.add(channel, seq.frame_final_start, seq.frame_final_end)
+            else:
+                blocked.append((seq, channel))
+        if len(blocked) == len(pending):
+            # strips block each other, park the first one in any free channel
+            seq = blocked[0][0]
+            parking_channel = allocator.find_free_channel(seq.frame_final_start, seq.frame_final_end)
+            if parking_channel == None:
+                return False
+            allocator.remove(seq.channel, seq.frame_final_start, seq.frame_final_end)
+            seq.channel = parking_channel
+            allocator.add(parking_channel, seq.frame_final_start, seq.frame_final_end)
+        pending = blocked
+    return True
 
 def is_vse_empty():
     if bpy.context.scene.sequence_editor == None:
@@ -54,80 +233,330 @@ def set_3d_viewport_shade(shade):
         if area.type == 'VIEW_3D':
             area.spaces.active.viewport_shade = shade
 
-def set_all_mesh_draw_type(draw_type):
-    for mesh_obj in bpy.context.scene.objects:
-        if mesh_obj.type == 'MESH':
-            mesh_obj.draw_type = draw_type
+# registered slideshow planes of Scene.ds_planes, rebuilt lazily when planes are (un)registered
+plane_registry = None
+
+def reset_plane_registry():
+    global plane_registry
+    plane_registry = None
+
+def build_plane_registry(scene):
+    # items of planes deleted from the scene are left out, their objects may still exist without users
+    scene_objects = set(scene.objects)
+    planes = []
+    plane_set = set()
+    for item in scene.ds_planes:
+        if item.plane in scene_objects and item.plane not in plane_set:
+            planes.append(item.plane)
+            plane_set.add(item.plane)
+    return {
+        'scene': scene.name,
+        'item_count': len(scene.ds_planes),
+        'object_count': len(scene.objects),
+        'planes': planes,
+        }
+
+def get_plane_registry():
+    global plane_registry
+    scene = bpy.context.scene
+    if plane_registry == None or plane_registry['scene'] != scene.name or plane_registry['item_count'] != len(scene.ds_planes):
+        plane_registry = build_plane_registry(scene)
+    return plane_registry
+
+def check_plane_registry(scene):
+    """
+    Reset the plane registry when objects were deleted from scene, a registered plane
+    may be one of them. Added objects are no planes until they are registered.
+    """
+    if plane_registry == None or plane_registry['scene'] != scene.name:
+        return
+    object_count = len(scene.objects)
+    if object_count < plane_registry['object_count']:
+        reset_plane_registry()
+    else:
+        plane_registry['object_count'] = object_count
+
+def get_slideshow_planes():
+    return get_plane_registry()['planes']
+
+def register_slideshow_planes(scene, planes):
+    """
+    return: int. Count of newly registered planes
+    """
+    plane_set = set(item.plane for item in scene.ds_planes)
+    added_count = 0
+    for plane in planes:
+        if plane not in plane_set:
+            scene.ds_planes.add().plane = plane
+            plane_set.add(plane)
+            added_count += 1
+    reset_plane_registry()
+    return added_count
+
+def unregister_slideshow_planes(scene, planes):
+    """
+    Remove planes and items of deleted objects from the registry.
+    return: int. Count of removed items
+    """
+    plane_set = set(planes)
+    removed_count = 0
+    for i in reversed(range(len(scene.ds_planes))):
+        plane = scene.ds_planes[i].plane
+        if plane == None or plane in plane_set:
+            scene.ds_planes.remove(i)
+            removed_count += 1
+    reset_plane_registry()
+    return removed_count
+
+def get_image_plane_candidates(scene):
+    # meshes with an image texture
+    return [obj for obj in scene.objects if obj.type == 'MESH' and len(get_object_images(obj)) > 0]
+
+def ensure_slideshow_planes(scene):
+    """
+    Register the image meshes of the scene if no plane is registered yet.
+    return: list. The registered planes
+    """
+    if len(get_slideshow_planes()) == 0:
+        # registry order is the order of the slideshow
+        register_slideshow_planes(scene, sorted(get_image_plane_candidates(scene), key=lambda plane: plane.location.x))
+    return get_slideshow_planes()
+
+def migrate_picture_meshes(scene):
+    """
+    Turn the 'picture_mesh' object names of cameras from older files into plane pointers.
+    return: int. Count of migrated cameras
+    """
+    planes = []
+    for cam in scene.objects:
+        if cam.type == 'CAMERA' and 'picture_mesh' in cam:
+            plane = bpy.data.objects.get(cam['picture_mesh'])
+            if plane != None:
+                cam.ds_picture_plane = plane
+                planes.append(plane)
+            del cam['picture_mesh']
+    if len(planes) > 0:
+        register_slideshow_planes(scene, planes)
+    return len(planes)
+
+def get_camera_plane(cam):
+    if cam == None:
+        return None
+    return cam.ds_picture_plane
+
+def set_all_plane_draw_type(draw_type):
+    for plane in get_slideshow_planes():
+        plane.draw_type = draw_type
+
+# interval index over the SCENE strips, rebuilt lazily when the strips change
+sequence_index = None
+# seconds between the checks of all strip ranges in scene_update_post
+SEQUENCE_CHECK_INTERVAL = 0.25
+last_sequence_check_time = 0.0
+
+def reset_sequence_index():
+    global sequence_index
+    sequence_index = None
+
+def get_sequence_signature(scene):
+    # cheap change detection: strip count and the range of the strip the user edits last
+    se = scene.sequence_editor
+    act_seq = se.active_strip
+    if act_seq == None:
+        return (scene.name, len(se.sequences), None)
+    return (scene.name, len(se.sequences), act_seq.name, act_seq.frame_final_start, act_seq.frame_final_end)
 
-def get_sequences_for_frame():
+def get_sequence_ranges_hash(scene):
+    return hash(tuple((seq.frame_final_start, seq.frame_final_end) for seq in scene.sequence_editor.sequences if seq.type == 'SCENE'))
+
+def check_sequence_index(scene):
+    """
+    Reset the sequence index if any SCENE strip moved since it was built. Walks all
+    strips, so it runs from scene_update_post at most every SEQUENCE_CHECK_INTERVAL
+    and not per frame.
+    """
+    global last_sequence_check_time
+    if sequence_index == None or scene.sequence_editor == None or sequence_index['signature'][0] != scene.name:
+        return
+    if time.perf_counter() - last_sequence_check_time < SEQUENCE_CHECK_INTERVAL:
+        return
+    last_sequence_check_time = time.perf_counter()
+    if sequence_index['ranges_hash'] != get_sequence_ranges_hash(scene):
+        reset_sequence_index()
+
+def build_sequence_index(scene):
+    scene_sequences = []
+    for seq in scene.sequence_editor.sequences:
+        if seq.type == 'SCENE':
+            scene_sequences.append((seq.frame_final_start, seq.frame_final_end, seq))
+    scene_sequences.sort(key=lambda entry: entry[0])
+    
+    max_duration = 0
+    for start, end, seq in scene_sequences:
+        max_duration = max(max_duration, end - start)
+    
+    return {
+        'signature': get_sequence_signature(scene),
+        'ranges_hash': get_sequence_ranges_hash(scene),
+        'starts': [entry[0] for entry in scene_sequences],
+        'ends': [entry[1] for entry in scene_sequences],
+        'sequences': [entry[2] for entry in scene_sequences],
+        'max_duration': max_duration,
+        }
+
+def get_sequence_index(scene):
+    global sequence_index
+    if sequence_index == None or sequence_index['signature'] != get_sequence_signature(scene):
+        sequence_index = build_sequence_index(scene)
+    return sequence_index
+
+def query_sequence_index(index, frame):
+    # only strips starting within max_duration before the frame can cover it
+    first = bisect_left(index['starts'], frame - index['max_duration'])
+    last = bisect_right(index['starts'], frame)
     seq_list = []
-    for seq in bpy.context.scene.sequence_editor.sequences:
-        cur_frame = bpy.context.scene.frame_current
-        if seq.frame_final_start <= cur_frame and seq.frame_final_end >= cur_frame and seq.type == 'SCENE':
+    for i in range(first, last):
+        seq = index['sequences'][i]
+        start = seq.frame_final_start
+        end = seq.frame_final_end
+        if start != index['starts'][i] or end != index['ends'][i]:
+            # strip was moved or retimed since the index was built
+            return None
+        if start <= frame and end >= frame:
             seq_list.append(seq)
     return seq_list
 
+def get_sequences_for_frame(frame=None):
+    scene = bpy.context.scene
+    if frame == None:
+        frame = scene.frame_current
+    seq_list = query_sequence_index(get_sequence_index(scene), frame)
+    if seq_list == None:
+        reset_sequence_index()
+        seq_list = query_sequence_index(get_sequence_index(scene), frame)
+    return seq_list
+
 def get_sorted_scene_cameras_list():
     # list of all cameras in scene
     scene_cameras = []
     for obj in bpy.context.scene.objects:
         if obj.type == 'CAMERA':
             scene_cameras.append(obj)
-    scene_cameras.sort(key=lambda cam: cam.location.x+cam.delta_location.x)
+    if bpy.context.scene.ds_layout != 'MANUAL':
+        # the layout order is the registry order of the planes
+        plane_positions = {}
+        for i, plane in enumerate(get_slideshow_planes()):
+            plane_positions[plane] = i
+        unknown_position = len(plane_positions)
+        scene_cameras.sort(key=lambda cam: (plane_positions.get(cam.ds_picture_plane, unknown_position), get_camera_placement_x(cam)))
+    else:
+        scene_cameras.sort(key=get_camera_placement_x)
     return scene_cameras
 
+def get_camera_placement_x(cam):
+    # the action moves location on every frame, an animated camera is placed by its first x key
+    location_x = cam.location.x
+    if cam.animation_data != None and cam.animation_data.action != None:
+        for fcurve in cam.animation_data.action.fcurves:
+            if fcurve.data_path == 'location' and fcurve.array_index == 0 and len(fcurve.keyframe_points) > 0:
+                location_x = fcurve.keyframe_points[0].co.y
+                break
+    return location_x + cam.delta_location.x
+
+def get_camera_placement(cam):
+    # what the camera order depends on
+    return (cam.ds_picture_plane, get_camera_placement_x(cam))
+
+# ordered cameras and their positions, rebuilt lazily when cameras are added, removed or moved
+camera_navigation = None
+
+def reset_camera_navigation():
+    global camera_navigation
+    camera_navigation = None
+
+def build_camera_navigation(scene):
+    cameras = get_sorted_scene_cameras_list()
+    positions = {}
+    has_picture_planes = True
+    for i, cam in enumerate(cameras):
+        positions[cam] = i
+        if cam.ds_picture_plane == None:
+            has_picture_planes = False
+    return {
+        'scene': scene.name,
+        'object_count': len(scene.objects),
+        'cameras': cameras,
+        'positions': positions,
+        'placements': dict((cam, get_camera_placement(cam)) for cam in cameras),
+        'has_picture_planes': has_picture_planes,
+        }
+
+def get_camera_navigation():
+    global camera_navigation
+    scene = bpy.context.scene
+    if camera_navigation == None or camera_navigation['scene'] != scene.name or camera_navigation['object_count'] != len(scene.objects):
+        camera_navigation = build_camera_navigation(scene)
+    return camera_navigation
+
 def has_multiple_cameras():
-    cam_count = 0
-    for obj in bpy.context.scene.objects:
-        if obj.type == 'CAMERA':
-            cam_count += 1
-            if cam_count > 1:
-                return True
-    return False
+    return len(get_camera_navigation()['cameras']) > 1
 
+@instrumented('has_camera_navigation')
 def has_camera_navigation():
-    if not has_multiple_cameras():
-        return False
-    else:
-        for cam in get_sorted_scene_cameras_list():
-            if cam['picture_mesh'] == None or cam['picture_mesh'] == '':
-                return False
-    return True
-    
-def get_prev_camera():
-    cameras = get_sorted_scene_cameras_list()
+    navigation = get_camera_navigation()
+    return len(navigation['cameras']) > 1 and navigation['has_picture_planes']
+
+def get_camera_by_offset(offset):
+    navigation = get_camera_navigation()
     current_cam = bpy.context.scene.camera
-    last_cam = None
-    for cam in cameras:
-        if cam == current_cam:
-            if last_cam == None:
-                return current_cam
-            else:
-                return last_cam
-        else:
-            last_cam = cam
-    return current_cam
+    if current_cam == None or current_cam not in navigation['positions']:
+        return current_cam
+    new_position = navigation['positions'][current_cam] + offset
+    if new_position < 0 or new_position >= len(navigation['cameras']):
+        return current_cam
+    return navigation['cameras'][new_position]
+
+def get_prev_camera():
+    return get_camera_by_offset(-1)
 
 def get_next_camera():
-    cameras = get_sorted_scene_cameras_list()
-    current_cam = bpy.context.scene.camera
-    cam_found = False
-    for cam in cameras:
-        if cam_found:
-            return cam
-        if cam == current_cam:
-            cam_found = True
-    return current_cam
+    return get_camera_by_offset(1)
 
 def is_draw_type_handling():
     return True
 
+def shift_keyframe_values(values, x_movement):
+    # values are (x, y) pairs, only x is moved
+    if numpy != None:
+        values[0::2] += x_movement
+    else:
+        values[0::2] = [x + x_movement for x in values[0::2]]
+
 def move_action_on_x(action, x_movement):
     for fcurve in action.fcurves:
-        for point in fcurve.keyframe_points:
-            point.co.x += x_movement
-            point.handle_left.x += x_movement
-            point.handle_right.x += x_movement
+        point_count = len(fcurve.keyframe_points)
+        if point_count == 0:
+            continue
+        for attr in ('co', 'handle_left', 'handle_right'):
+            if numpy != None:
+                values = numpy.empty(point_count*2, dtype=numpy.float32)
+            else:
+                values = [0.0]*(point_count*2)
+            fcurve.keyframe_points.foreach_get(attr, values)
+            shift_keyframe_values(values, x_movement)
+            fcurve.keyframe_points.foreach_set(attr, values)
+
+@instrumented('move_actions_on_x')
+def move_actions_on_x(action_movements):
+    """
+    Move the camera actions in bulk, then each camera remembers the frame its action was moved to.
+    action_movements: list. (camera, seq_start_frame, x_movement) rows, see get_action_movement()
+    """
+    for camera, seq_start_frame, x_movement in action_movements:
+        action = get_camera_action(camera)
+        if action != None and x_movement != 0:
+            move_action_on_x(action, x_movement)
+        camera['ds_action_offset'] = seq_start_frame
 
 def has_sequence():
     se = bpy.context.scene.sequence_editor
@@ -137,6 +566,23 @@ def has_sequence():
         return False
     return True
 
+# effect strip types created by the slideshow
+SLIDESHOW_EFFECT_TYPES = {'CROSS', 'GAMMA_CROSS', 'WIPE'}
+
+def get_slideshow_sequences():
+    """
+    return: tuple. SCENE strips with camera and the effect strips between two of them, both sorted by start
+    """
+    se = bpy.context.scene.sequence_editor
+    if se == None:
+        return [], []
+    scene_sequences = [seq for seq in se.sequences if seq.type == 'SCENE' and seq.scene == bpy.context.scene and seq.scene_camera != None]
+    scene_sequences.sort(key=lambda seq: seq.frame_final_start)
+    scene_sequence_set = set(scene_sequences)
+    effect_sequences = [seq for seq in se.sequences if seq.type in SLIDESHOW_EFFECT_TYPES and seq.input_1 in scene_sequence_set and seq.input_2 in scene_sequence_set]
+    effect_sequences.sort(key=lambda seq: seq.frame_final_start)
+    return scene_sequences, effect_sequences
+
 def select_single_object(obj):
     bpy.ops.object.select_all(action='DESELECT')
     obj.select = True
@@ -153,46 +599,973 @@ def set_sequence_active_for_camera(camera):
             if area.type == 'SEQUENCE_EDITOR':
                 area.tag_redraw()
 
-def get_effect_type(index):
-    # retruns EffectCollection item
-    scene = bpy.context.scene
-    wm = bpy.context.window_manager
-    
-    if scene.ds_effect_types != None and len(scene.ds_effect_types) > 0:
-        if wm.ds_effect_add_type == 'RANDOM':
-            return scene.ds_effect_types[random.randrange(0,len(scene.ds_effect_types))]
-        else: # CYCLIC
-            return scene.ds_effect_types[index%len(scene.ds_effect_types)]
-    else:
-        new_effect = bpy.context.scene.ds_effect_types.add()
-        new_effect.name = "Cross"
-        return new_effect
+# (name, type, wipe_type, direction, blur, angle) of a new 'Cross' EffectCollection item
+DEFAULT_EFFECT_SETTINGS = ('Cross', 'GAMMA_CROSS', 'SINGLE', 'OUT', 0.2, 0.0)
+
+def get_effect_schedule(transition_count, effect_count, effect_add_type='CYCLIC', effect_seed=0):
+    """
+    Effect of each transition, computed up front. RANDOM uses its own generator
+    seeded with effect_seed, so the same seed always gives the same show.
+    return: list. Index into the effect settings list per transition
+    """
+    if effect_count == 0:
+        return [0]*transition_count
+    if effect_add_type == 'RANDOM':
+        effect_random = random.Random(effect_seed)
+        return [effect_random.randrange(effect_count) for i in range(transition_count)]
+    # CYCLIC
+    return [i%effect_count for i in range(transition_count)]
+
+def get_scene_effect_schedule(context, transition_count, effect_settings_list):
+    return get_effect_schedule(transition_count, len(effect_settings_list), context.window_manager.ds_effect_add_type, context.scene.ds_effect_seed)
 
-def add_new_effect(effect_index, effect_channel, seq_start_frame, seq_end_frame, sequence1, sequence2):
-    effect_item = get_effect_type(effect_index)
+def get_effect_settings(effect_item):
+    """
+    return: tuple. (name, type, wipe_type, direction, blur, angle) of the EffectCollection item
+    """
     effect_type = 'GAMMA_CROSS'
-    
     if effect_item.effect_type == 'CROSS':
         effect_type = effect_item.cross_type
     elif effect_item.effect_type == 'WIPE':
         effect_type = 'WIPE'
+    return (effect_item.name, effect_type, effect_item.wipe_type, effect_item.direction, effect_item.blur, effect_item.angle)
+
+def get_effect_settings_list(add_default=True):
+    scene = bpy.context.scene
+    if len(scene.ds_effect_types) == 0:
+        if not add_default:
+            return [DEFAULT_EFFECT_SETTINGS]
+        new_effect = scene.ds_effect_types.add()
+        new_effect.name = "Cross"
+    return [get_effect_settings(effect_item) for effect_item in scene.ds_effect_types]
+
+@instrumented('add_effect_sequence')
+def add_effect_sequence(effect_settings, effect_channel, seq_start_frame, seq_end_frame, sequence1, sequence2, scene=None):
+    """
+    scene: Scene. Add the effect to the VSE of this scene, None for the current scene
+    """
+    if scene == None:
+        scene = bpy.context.scene
+    name, effect_type, wipe_type, direction, blur, angle = effect_settings
+    new_effect_sequence = scene.sequence_editor.sequences.new_effect(name=name, type = effect_type, channel=effect_channel, frame_start=seq_start_frame, frame_end=seq_end_frame, seq1=sequence1, seq2=sequence2)
+    set_effect_sequence_settings(new_effect_sequence, effect_settings)
+    return new_effect_sequence
+
+def set_effect_sequence_settings(seq, effect_settings):
+    """
+    Set the wipe settings of an effect strip, the strip type can not be changed.
+    return: bool. True if a setting changed
+    """
+    name, effect_type, wipe_type, direction, blur, angle = effect_settings
+    if effect_type != 'WIPE':
+        return False
+    if seq.transition_type == wipe_type and seq.direction == direction and abs(seq.blur_width - blur) < 1e-6 and abs(seq.angle - angle) < 1e-6:
+        return False
+    seq.transition_type = wipe_type
+    seq.direction = direction
+    seq.blur_width = blur
+    seq.angle = angle
+    return True
+
+# image planes drawn 'TEXTURED' by the last frame change, None forces a full update
+textured_planes = None
+
+def reset_textured_planes():
+    global textured_planes
+    textured_planes = None
+
+def get_strip_plane(seq):
+    return get_camera_plane(seq.scene_camera)
+
+def get_textured_planes_for_frame():
+    planes = set()
+    for seq in get_sequences_for_frame():
+        plane = get_strip_plane(seq)
+        if plane != None:
+            planes.add(plane)
+    return planes
+
+def set_plane_draw_type(plane, draw_type):
+    if plane != None and plane.draw_type != draw_type:
+        plane.draw_type = draw_type
+
+def update_textured_planes():
+    global textured_planes
+    new_textured_planes = get_textured_planes_for_frame()
+    if textured_planes == None:
+        # first frame change after load or a manual change, touch every plane once
+        set_all_plane_draw_type('WIRE')
+        for plane in new_textured_planes:
+            set_plane_draw_type(plane, 'TEXTURED')
+    else:
+        # only planes whose visibility changed since the last frame
+        for plane in textured_planes - new_textured_planes:
+            set_plane_draw_type(plane, 'WIRE')
+        for plane in new_textured_planes - textured_planes:
+            set_plane_draw_type(plane, 'TEXTURED')
+    textured_planes = new_textured_planes
+
+# image planes with loaded images, None forces a full update
+resident_planes = None
+prefetch_executor = None
+
+def reset_resident_planes():
+    global resident_planes
+    resident_planes = None
+
+def get_window_planes(index, first, last):
+    planes = []
+    for seq in index['sequences'][max(first, 0):max(last+1, 0)]:
+        plane = get_strip_plane(seq)
+        if plane != None:
+            planes.append(plane)
+    return planes
+
+def read_image_file(filepath):
+    # warms the disk cache, decoding has to stay in the main thread
+    with open(filepath, 'rb') as image_file:
+        while image_file.read(1 << 20):
+            pass
+
+def prefetch_image_files(planes):
+    global prefetch_executor
+    if prefetch_executor == None:
+        prefetch_executor = ThreadPoolExecutor(max_workers=1)
+    for plane in planes:
+        for image in get_object_images(plane):
+            filepath = bpy.path.abspath(image.filepath)
+            if os.path.isfile(filepath):
+                prefetch_executor.submit(read_image_file, filepath)
+
+def shutdown_prefetch_executor():
+    # unregister does not wait for the queued reads, the thread ends after them
+    global prefetch_executor
+    if prefetch_executor != None:
+        prefetch_executor.shutdown(wait=False)
+        prefetch_executor = None
+
+def set_plane_images_resident(plane, resident):
+    for image in get_object_images(plane):
+        if resident:
+            # reading the size decodes the image file
+            image.size
+        else:
+            image.buffers_free()
+
+@instrumented('update_texture_residency')
+def update_texture_residency(scene):
+    """
+    Keep the images of the planes within ds_residency_window strips around the
+    current frame loaded, plus ds_residency_prefetch strips ahead, and free all others.
+    """
+    global resident_planes
+    wm = bpy.context.window_manager
+    index = get_sequence_index(scene)
+    position = bisect_right(index['starts'], scene.frame_current) - 1
+    first = position - wm.ds_residency_window
+    last = position + wm.ds_residency_window + wm.ds_residency_prefetch
+    new_resident_planes = set(get_window_planes(index, first, last))
+    
+    if resident_planes == None:
+        # free everything outside the window once
+        old_resident_planes = set(get_window_planes(index, 0, len(index['sequences'])-1))
+    else:
+        old_resident_planes = resident_planes
     
-    new_effect_sequence = bpy.context.scene.sequence_editor.sequences.new_effect(name=effect_item.name, type = effect_type, channel=effect_channel, frame_start=seq_start_frame, frame_end=seq_end_frame, seq1=sequence1, seq2=sequence2)
-    if effect_type == 'WIPE':
-        new_effect_sequence.transition_type = effect_item.wipe_type
-        new_effect_sequence.direction = effect_item.direction
-        new_effect_sequence.blur_width = effect_item.blur
-        new_effect_sequence.angle = effect_item.angle
+    for plane in old_resident_planes - new_resident_planes:
+        set_plane_images_resident(plane, False)
+    for plane in new_resident_planes - old_resident_planes:
+        set_plane_images_resident(plane, True)
+    if wm.ds_residency_thread:
+        prefetch_image_files(get_window_planes(index, last+1, last + wm.ds_residency_prefetch))
+    resident_planes = new_resident_planes
+
+# True between render_init and render_complete/render_cancel
+is_rendering = False
+# frame change skipped during playback, applied once the playback interval passed
+pending_frame_update = False
+last_frame_update_time = 0.0
+
+def is_viewport_update_needed():
+    # draw types and loaded images only matter for the viewport
+    return not is_rendering and not bpy.app.background
+
+def is_playing_animation():
+    screen = bpy.context.screen
+    return screen != None and screen.is_animation_playing
+
+def is_frame_update_due():
+    interval = bpy.context.window_manager.ds_playback_interval / 1000.0
+    if interval <= 0 or not is_playing_animation():
+        return True
+    return time.perf_counter() - last_frame_update_time >= interval
+
+def update_viewport_planes(scene):
+    global pending_frame_update, last_frame_update_time
+    pending_frame_update = False
+    last_frame_update_time = time.perf_counter()
+    if is_draw_type_handling() and has_sequence():
+        update_textured_planes()
+    if bpy.context.window_manager.ds_texture_residency and has_sequence():
+        update_texture_residency(scene)
 
 @persistent
+@instrumented('frame_change_handler')
 def frame_change_handler(scene):
-    if is_draw_type_handling() and has_sequence():
-        set_all_mesh_draw_type('WIRE')
-        for seq in get_sequences_for_frame():
-            bpy.data.objects[seq.scene_camera['picture_mesh']].draw_type = 'TEXTURED'
+    global pending_frame_update
+    if not is_viewport_update_needed():
+        return
+    if not is_frame_update_due():
+        # playback is faster than the updates, only the latest frame is applied
+        pending_frame_update = True
+        return
+    update_viewport_planes(scene)
+
+@persistent
+def render_init_handler(dummy):
+    global is_rendering
+    is_rendering = True
+
+@persistent
+def render_end_handler(dummy):
+    global is_rendering, pending_frame_update
+    is_rendering = False
+    # frames changed without updates, catch up with the current one
+    pending_frame_update = True
+
+@persistent
+def load_post_handler(dummy):
+    global is_rendering, pending_frame_update
+    is_rendering = False
+    pending_frame_update = False
+    wm = bpy.context.window_manager
+    set_instrumentation(wm.ds_instrumentation, wm.ds_instrumentation_cprofile)
+    reset_textured_planes()
+    reset_resident_planes()
+    reset_sequence_index()
+    reset_camera_navigation()
+    reset_plane_registry()
+    restore_missing_proxies()
+    for scene in bpy.data.scenes:
+        migrate_picture_meshes(scene)
+
+@persistent
+def undo_post_handler(dummy):
+    # undo restores the strips and objects from memory, cached references are invalid
+    reset_sequence_index()
+    reset_camera_navigation()
+    reset_plane_registry()
+    reset_textured_planes()
+    reset_resident_planes()
+
+@persistent
+def scene_update_handler(scene):
+    if pending_frame_update and is_viewport_update_needed() and is_frame_update_due():
+        update_viewport_planes(scene)
+    # strips moved by hand, the per frame signature only sees the active one
+    if not is_playing_animation() and not is_rendering:
+        check_sequence_index(scene)
+    if bpy.data.objects.is_updated:
+        check_plane_registry(scene)
+    # cameras moved by hand since the navigation index was built, animated cameras
+    # are updated on every frame of the playback without changing their placement
+    if camera_navigation != None and bpy.data.objects.is_updated and not is_playing_animation() and not is_rendering:
+        for cam, placement in camera_navigation['placements'].items():
+            if cam.is_updated and placement != get_camera_placement(cam):
+                reset_camera_navigation()
+                break
+
+################### Image proxies
+
+# folder of the proxies next to the blend file or the original images
+PROXY_DIR_NAME = 'slideshow_proxies'
+# content hash per file path, with the size and mtime it was computed for
+file_hash_cache = {}
+
+def get_file_hash(filepath):
+    """
+    SHA1 of the content of filepath, read again only after its size or mtime changed.
+    return: str. Hex digest
+    """
+    stat = os.stat(filepath)
+    cache_entry = file_hash_cache.get(filepath)
+    if cache_entry != None and cache_entry[0] == stat.st_size and cache_entry[1] == stat.st_mtime:
+        return cache_entry[2]
+    file_hash = hashlib.sha1()
+    with open(filepath, 'rb') as image_file:
+        for block in iter(lambda: image_file.read(1 << 20), b''):
+            file_hash.update(block)
+    file_hash_cache[filepath] = (stat.st_size, stat.st_mtime, file_hash.hexdigest())
+    return file_hash_cache[filepath][2]
+
+def get_proxy_max_size(scene, proxy_scale):
+    render = scene.render
+    return (int(render.resolution_x * render.resolution_percentage / 100 * proxy_scale),
+            int(render.resolution_y * render.resolution_percentage / 100 * proxy_scale))
+
+def get_proxy_size(width, height, max_size):
+    # fit into max_size, never upscale
+    scale = min(max_size[0] / max(width, 1), max_size[1] / max(height, 1), 1.0)
+    return max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+
+def get_proxy_cache_dir(image_dir=None):
+    """
+    Proxies are kept next to the blend file, so a saved file finds its proxies again.
+    Unsaved files keep them next to the original images in image_dir.
+    return: str. Existing folder of the proxy cache
+    """
+    wm = bpy.context.window_manager
+    if wm.ds_proxy_cache_dir != '':
+        cache_dir = bpy.path.abspath(wm.ds_proxy_cache_dir)
+    elif bpy.data.filepath != '':
+        cache_dir = os.path.join(os.path.dirname(bpy.data.filepath), PROXY_DIR_NAME)
+    elif image_dir != None:
+        cache_dir = os.path.join(image_dir, PROXY_DIR_NAME)
+    else:
+        cache_dir = os.path.join(tempfile.gettempdir(), 'dynamic_slideshow_proxies')
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def evict_cache_files(cache_dir, max_bytes, keep_names=()):
+    """
+    Remove the least recently used files until cache_dir is smaller than max_bytes.
+    keep_names: iterable. Names of files that are neither counted nor removed
+    return: int. Count of removed files
+    """
+    cache_files = []
+    cache_bytes = 0
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and entry.name not in keep_names:
+            stat = entry.stat()
+            cache_files.append((stat.st_mtime, stat.st_size, entry.path))
+            cache_bytes += stat.st_size
+    cache_files.sort()
+    
+    removed_count = 0
+    for mtime, size, path in cache_files:
+        if cache_bytes <= max_bytes:
+            break
+        os.remove(path)
+        cache_bytes -= size
+        removed_count += 1
+    return removed_count
+
+def get_used_proxy_names(cache_dir):
+    """
+    return: set. Names of the files in cache_dir that images of the open blend file load
+    """
+    cache_dir = os.path.normpath(cache_dir)
+    names = set()
+    for image in bpy.data.images:
+        image_path = os.path.normpath(bpy.path.abspath(image.filepath))
+        if os.path.dirname(image_path) == cache_dir:
+            names.add(os.path.basename(image_path))
+    return names
+
+def evict_image_proxies(cache_dir):
+    """
+    Keep the proxy cache under its size cap, proxies the images still load are never removed.
+    return: int. Count of removed proxies
+    """
+    keep_names = get_used_proxy_names(cache_dir)
+    keep_names.add(IMAGE_METADATA_CACHE_NAME)
+    return evict_cache_files(cache_dir, bpy.context.window_manager.ds_proxy_cache_size * 1024 * 1024, keep_names)
+
+def restore_missing_proxies():
+    """
+    Point images back to their originals when their proxy file is gone,
+    removed by hand or evicted from a cache folder other blend files share.
+    return: int. Count of restored images
+    """
+    restored_count = 0
+    for image in bpy.data.images:
+        if 'ds_source_filepath' in image and not os.path.isfile(bpy.path.abspath(image.filepath)) and os.path.isfile(image['ds_source_filepath']):
+            image.filepath = image['ds_source_filepath']
+            del image['ds_source_filepath']
+            restored_count += 1
+    return restored_count
+
+def get_image_proxy(filepath, max_size, cache_dir):
+    """
+    Downscaled copy of filepath in cache_dir, keyed by content hash and max_size.
+    return: str. Path of the proxy file
+    """
+    extension = '.png' if os.path.splitext(filepath)[1].lower() == '.png' else '.jpg'
+    proxy_path = os.path.join(cache_dir, get_file_hash(filepath)+'_'+str(max_size[0])+'x'+str(max_size[1])+extension)
+    if os.path.exists(proxy_path):
+        # mark as recently used
+        os.utime(proxy_path)
+        return proxy_path
+    
+    image = bpy.data.images.load(filepath)
+    proxy_width, proxy_height = get_proxy_size(image.size[0], image.size[1], max_size)
+    temp_path = proxy_path+'.tmp'+extension
+    if (proxy_width, proxy_height) == tuple(image.size) and os.path.splitext(filepath)[1].lower() in ('.png', '.jpg', '.jpeg'):
+        shutil.copyfile(filepath, temp_path)
+    else:
+        image.scale(proxy_width, proxy_height)
+        image.filepath_raw = temp_path
+        image.file_format = 'PNG' if extension == '.png' else 'JPEG'
+        image.save()
+    bpy.data.images.remove(image)
+    os.replace(temp_path, proxy_path)
+    return proxy_path
+
+def get_object_images(obj):
+    """
+    return: set. Images used by the material textures and UV faces of obj
+    """
+    images = set()
+    for mat_slot in obj.material_slots:
+        if mat_slot.material != None:
+            for texture_slot in mat_slot.material.texture_slots:
+                if texture_slot != None and texture_slot.texture != None and texture_slot.texture.type == 'IMAGE' and texture_slot.texture.image != None:
+                    images.add(texture_slot.texture.image)
+    if obj.type == 'MESH' and obj.data.uv_textures.active != None:
+        for face in obj.data.uv_textures.active.data:
+            if face.image != None:
+                images.add(face.image)
+    return images
+
+def get_plane_images():
+    """
+    return: set. Images used by the textures of the image planes
+    """
+    images = set()
+    for plane in get_slideshow_planes():
+        images |= get_object_images(plane)
+    return images
+
+################### Image metadata
+
+# TIFF/EXIF tags read by the header scan
+TIFF_TAG_WIDTH = 0x0100
+TIFF_TAG_HEIGHT = 0x0101
+TIFF_TAG_ORIENTATION = 0x0112
+TIFF_TAG_DATETIME = 0x0132
+TIFF_TAG_EXIF_IFD = 0x8769
+TIFF_TAG_DATETIME_ORIGINAL = 0x9003
+TIFF_TAG_PIXEL_WIDTH = 0xA002
+TIFF_TAG_PIXEL_HEIGHT = 0xA003
+# JPEG start of frame markers, they hold the pixel size
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# path -> (file size, mtime, metadata) of scanned images
+image_metadata_cache = None
+
+def reset_image_metadata_cache():
+    global image_metadata_cache
+    image_metadata_cache = None
+
+def parse_exif_time(value):
+    """
+    return: float. Timestamp of an EXIF 'YYYY:MM:DD HH:MM:SS' value, None if invalid
+    """
+    try:
+        return time.mktime(time.strptime(value.strip(' \0')[:19], '%Y:%m:%d %H:%M:%S'))
+    except (ValueError, OverflowError):
+        return None
+
+def read_tiff_value(image_file, base, byte_order, value_type, count, value):
+    if value_type == 3: # SHORT
+        return struct.unpack(byte_order+'H', value[:2])[0]
+    if value_type == 4: # LONG
+        return struct.unpack(byte_order+'I', value)[0]
+    if value_type == 2: # ASCII
+        if count > 4:
+            image_file.seek(base + struct.unpack(byte_order+'I', value)[0])
+            value = image_file.read(count)
+        return value[:count].decode('ascii', 'replace')
+    return None
+
+def read_tiff_tags(image_file, base):
+    """
+    Read the size, orientation and time tags of the first IFD and its EXIF IFD.
+    base: int. File position of the TIFF header, offsets are relative to it
+    return: dict. Values by tag
+    """
+    image_file.seek(base)
+    header = image_file.read(8)
+    if header[:4] == b'II*\0':
+        byte_order = '<'
+    elif header[:4] == b'MM\0*':
+        byte_order = '>'
+    else:
+        return {}
+    wanted_tags = {TIFF_TAG_WIDTH, TIFF_TAG_HEIGHT, TIFF_TAG_ORIENTATION, TIFF_TAG_DATETIME, TIFF_TAG_EXIF_IFD,
+                   TIFF_TAG_DATETIME_ORIGINAL, TIFF_TAG_PIXEL_WIDTH, TIFF_TAG_PIXEL_HEIGHT}
+    tags = {}
+    ifd_offsets = [struct.unpack(byte_order+'I', header[4:8])[0]]
+    while len(ifd_offsets) > 0:
+        image_file.seek(base + ifd_offsets.pop())
+        entry_count_data = image_file.read(2)
+        if len(entry_count_data) < 2:
+            break
+        entry_count = struct.unpack(byte_order+'H', entry_count_data)[0]
+        entries = image_file.read(12*entry_count)
+        for i in range(len(entries)//12):
+            tag, value_type, count = struct.unpack(byte_order+'HHI', entries[i*12:i*12+8])
+            if tag in wanted_tags and tag not in tags:
+                tags[tag] = read_tiff_value(image_file, base, byte_order, value_type, count, entries[i*12+8:i*12+12])
+        if TIFF_TAG_EXIF_IFD in tags:
+            ifd_offsets.append(tags.pop(TIFF_TAG_EXIF_IFD))
+            wanted_tags.discard(TIFF_TAG_EXIF_IFD)
+    return tags
+
+def read_jpeg_header(image_file):
+    """
+    Walk the JPEG segments up to the start of frame, the pixel data is not read.
+    return: tuple. (width, height, TIFF tags of the EXIF segment)
+    """
+    image_file.seek(2)
+    tags = {}
+    while True:
+        marker = image_file.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return (None, None, tags)
+        if marker[1] == 0xFF:
+            # fill byte
+            image_file.seek(-1, 1)
+            continue
+        length_data = image_file.read(2)
+        if len(length_data) < 2:
+            return (None, None, tags)
+        segment_start = image_file.tell()
+        length = struct.unpack('>H', length_data)[0]
+        if marker[1] == 0xE1 and image_file.read(6) == b'Exif\0\0':
+            tags = read_tiff_tags(image_file, segment_start + 6)
+        elif marker[1] in JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>xHH', image_file.read(5))
+            return (width, height, tags)
+        image_file.seek(segment_start + length - 2)
+
+def read_png_header(image_file):
+    """
+    return: tuple. (width, height) of the IHDR chunk
+    """
+    image_file.seek(8)
+    chunk = image_file.read(16)
+    if len(chunk) < 16 or chunk[4:8] != b'IHDR':
+        return (None, None)
+    return struct.unpack('>II', chunk[8:16])
+
+def read_image_metadata(filepath):
+    """
+    Read pixel size, EXIF orientation and capture time from the file header, without decoding the image.
+    return: dict. 'width', 'height', 'orientation' and 'capture_time' (None if unknown), None if the file is no JPEG, PNG or TIFF
+    """
+    width = height = None
+    tags = {}
+    with open(filepath, 'rb') as image_file:
+        signature = image_file.read(8)
+        if signature[:2] == b'\xff\xd8':
+            width, height, tags = read_jpeg_header(image_file)
+        elif signature == b'\x89PNG\r\n\x1a\n':
+            width, height = read_png_header(image_file)
+        elif signature[:4] in (b'II*\0', b'MM\0*'):
+            tags = read_tiff_tags(image_file, 0)
+            width, height = tags.get(TIFF_TAG_WIDTH), tags.get(TIFF_TAG_HEIGHT)
+        else:
+            return None
+    if width == None:
+        width, height = tags.get(TIFF_TAG_PIXEL_WIDTH), tags.get(TIFF_TAG_PIXEL_HEIGHT)
+    capture_time = None
+    for tag in (TIFF_TAG_DATETIME_ORIGINAL, TIFF_TAG_DATETIME):
+        if capture_time == None and isinstance(tags.get(tag), str):
+            capture_time = parse_exif_time(tags[tag])
+    return {
+        'width': width,
+        'height': height,
+        'orientation': tags.get(TIFF_TAG_ORIENTATION) or 1,
+        'capture_time': capture_time,
+        }
+
+# kept in the proxy cache folder, but never evicted with the proxies
+IMAGE_METADATA_CACHE_NAME = 'image_metadata.json'
+
+def get_image_metadata_cache_path():
+    return os.path.join(get_proxy_cache_dir(), IMAGE_METADATA_CACHE_NAME)
+
+def get_image_metadata_cache():
+    global image_metadata_cache
+    if image_metadata_cache == None:
+        image_metadata_cache = {}
+        try:
+            with open(get_image_metadata_cache_path()) as cache_file:
+                image_metadata_cache = json.load(cache_file)
+        except (OSError, ValueError):
+            pass
+    return image_metadata_cache
+
+def save_image_metadata_cache():
+    cache_path = get_image_metadata_cache_path()
+    with open(cache_path+'.tmp', 'w') as cache_file:
+        json.dump(get_image_metadata_cache(), cache_file)
+    os.replace(cache_path+'.tmp', cache_path)
+
+def scan_image_file(filepath):
+    """
+    return: tuple. (file size, mtime, metadata) of filepath, metadata None if the header is not readable
+    """
+    stat = os.stat(filepath)
+    try:
+        metadata = read_image_metadata(filepath)
+    except (OSError, struct.error):
+        metadata = None
+    return (stat.st_size, stat.st_mtime, metadata)
+
+@instrumented('scan_image_metadata')
+def scan_image_metadata(image_files, workers=None):
+    """
+    Header metadata of image_files, read by a thread pool. Files with unchanged size
+    and mtime come from the cache, which is saved next to the proxies.
+    return: list. Metadata per file like read_image_metadata(), None for unreadable files
+    """
+    cache = get_image_metadata_cache()
+    scan_files = []
+    for filepath in image_files:
+        stat = os.stat(filepath)
+        cache_entry = cache.get(filepath)
+        if cache_entry == None or cache_entry[0] != stat.st_size or cache_entry[1] != stat.st_mtime:
+            scan_files.append(filepath)
+    
+    if len(scan_files) > 0:
+        # the scan waits on the disk, not the GIL
+        with ThreadPoolExecutor(max_workers=workers or min(32, 4*(os.cpu_count() or 1))) as executor:
+            for filepath, cache_entry in zip(scan_files, executor.map(scan_image_file, scan_files)):
+                cache[filepath] = list(cache_entry)
+        save_image_metadata_cache()
+    return [cache[filepath][2] for filepath in image_files]
+
+def sort_image_files_by_time(image_files, metadata_list):
+    """
+    Order by capture time, files without one by mtime, equal times by name.
+    return: list. Sorted (filepath, metadata) pairs
+    """
+    cache = get_image_metadata_cache()
+    def get_sort_key(entry):
+        filepath, metadata = entry
+        capture_time = metadata['capture_time'] if metadata != None else None
+        if capture_time == None:
+            capture_time = cache[filepath][1]
+        return (capture_time, os.path.basename(filepath))
+    return sorted(zip(image_files, metadata_list), key=get_sort_key)
+
+################### Layout
+
+SLIDESHOW_LAYOUT_ITEMS = (
+    ('LINE', 'Line', 'One row along x'),
+    ('GRID', 'Grid', 'Rows from left to right'),
+    ('SERPENTINE', 'Serpentine', 'Rows alternating from left to right and right to left'),
+    ('SPIRAL', 'Spiral', 'Square spiral around the first plane'),
+    )
+
+def get_spiral_cells(count):
+    """
+    Cells of a square spiral, cell 0 is (0, 0) and each cell touches the next one.
+    Ring k starts right of the previous ring and runs up, left, down and right.
+    return: tuple. Lists of x and y cell coordinates
+    """
+    if numpy != None:
+        n = numpy.arange(count)
+        k = numpy.ceil((numpy.sqrt(n + 1) - 1) / 2).astype(numpy.int64)
+        j = n - (2*k - 1)**2
+        x = numpy.select([n == 0, j < 2*k, j < 4*k, j < 6*k], [0, k, 3*k - 1 - j, -k], j - 7*k + 1)
+        y = numpy.select([n == 0, j < 2*k, j < 4*k, j < 6*k], [0, j - k + 1, k, 5*k - 1 - j], -k)
+        return x.tolist(), y.tolist()
+    
+    x = []
+    y = []
+    for n in range(count):
+        k = int(math.ceil((math.sqrt(n + 1) - 1) / 2))
+        j = n - (2*k - 1)**2
+        if n == 0:
+            cell = (0, 0)
+        elif j < 2*k:
+            cell = (k, j - k + 1)
+        elif j < 4*k:
+            cell = (3*k - 1 - j, k)
+        elif j < 6*k:
+            cell = (-k, 5*k - 1 - j)
+        else:
+            cell = (j - 7*k + 1, -k)
+        x.append(cell[0])
+        y.append(cell[1])
+    return x, y
+
+def compute_layout(widths, heights, layout='LINE', gap=0.2, columns=0):
+    """
+    Plane centers of a layout, the first plane stays at (0, 0). Plain math, no bpy.
+    widths, heights: list. Plane sizes in layout order
+    columns: int. Columns of GRID and SERPENTINE, 0 for a square
+    return: tuple. Lists of x and y positions
+    """
+    count = len(widths)
+    if count == 0:
+        return [], []
+    if layout == 'LINE':
+        if numpy != None:
+            widths = numpy.asarray(widths, dtype=numpy.float64)
+            # left edge of each plane is the sum of the widths and gaps before it
+            left = numpy.cumsum(widths + gap) - (widths + gap)
+            return (left + 0.5*widths - 0.5*widths[0]).tolist(), [0.0]*count
+        x = []
+        left = 0.0
+        for width in widths:
+            x.append(left + 0.5*width - 0.5*widths[0])
+            left += width + gap
+        return x, [0.0]*count
+    
+    # all other layouts use cells of the largest plane
+    cell_width = max(widths) + gap
+    cell_height = max(heights) + gap
+    if layout == 'SPIRAL':
+        cell_x, cell_y = get_spiral_cells(count)
+        return [cx*cell_width for cx in cell_x], [cy*cell_height for cy in cell_y]
+    
+    if columns <= 0:
+        columns = int(math.ceil(math.sqrt(count)))
+    if numpy != None:
+        n = numpy.arange(count)
+        row = n // columns
+        column = n % columns
+        if layout == 'SERPENTINE':
+            column = numpy.where(row % 2 == 1, columns - 1 - column, column)
+        return (column*cell_width).tolist(), (-row*cell_height).tolist()
+    x = []
+    y = []
+    for n in range(count):
+        row = n // columns
+        column = n % columns
+        if layout == 'SERPENTINE' and row % 2 == 1:
+            column = columns - 1 - column
+        x.append(column*cell_width)
+        y.append(-row*cell_height)
+    return x, y
+
+@instrumented('layout_slideshow_planes')
+def layout_slideshow_planes(planes, layout='LINE', gap=0.2, columns=0):
+    """
+    Move planes to their layout positions in the order of planes. Cameras of
+    a plane move along, the scene keeps the order of the layout.
+    """
+    scene = bpy.context.scene
+    x, y = compute_layout([plane.dimensions.x for plane in planes], [plane.dimensions.y for plane in planes], layout, gap, columns)
+    plane_movements = {}
+    for plane, new_x, new_y in zip(planes, x, y):
+        plane_movements[plane] = (new_x - plane.location.x, new_y - plane.location.y)
+        plane.location.x = new_x
+        plane.location.y = new_y
+    for cam in scene.objects:
+        if cam.type == 'CAMERA' and cam.ds_picture_plane in plane_movements:
+            movement = plane_movements[cam.ds_picture_plane]
+            cam.delta_location[0] += movement[0]
+            cam.delta_location[1] += movement[1]
+    scene.ds_layout = layout
+    reset_camera_navigation()
+
+################### Ken Burns
+
+KEN_BURNS_MOTION_ITEMS = (
+    ('RANDOM', 'Random', 'Zoom in, zoom out or pan, chosen per camera'),
+    ('ZOOM_IN', 'Zoom in', 'Zoom in to a random point of the picture'),
+    ('ZOOM_OUT', 'Zoom out', 'Zoom out from a random point of the picture'),
+    ('PAN', 'Pan', 'Pan along the long side of the picture'),
+    )
+
+def get_view_size(plane_width, plane_height, render_aspect, zoom):
+    """
+    Largest view of the render aspect ratio inside the plane, divided by zoom.
+    return: tuple. View width and height
+    """
+    view_width = min(plane_width, plane_height*render_aspect) / zoom
+    return view_width, view_width / render_aspect
+
+def get_view_distance(camera_data, view_width, render_aspect):
+    """
+    Distance of a camera looking straight down to see view_width.
+    return: float
+    """
+    sensor_width = getattr(camera_data, 'sensor_width', 32.0)
+    if render_aspect < 1.0:
+        # the sensor fits the larger vertical side
+        return view_width / render_aspect * camera_data.lens / sensor_width
+    return view_width * camera_data.lens / sensor_width
+
+def plan_ken_burns_motion(rng, motion, plane_width, plane_height, render_aspect, zoom):
+    """
+    Start and end view of one camera, the views never leave the plane.
+    rng: random.Random. Source of the motion type and the points
+    return: list. (x, y, view_width) of the start and the end view, x and y relative to the plane center
+    """
+    if motion == 'RANDOM':
+        motion = rng.choice(('ZOOM_IN', 'ZOOM_OUT', 'PAN'))
+    full_width, full_height = get_view_size(plane_width, plane_height, render_aspect, 1.0)
+    zoom_width, zoom_height = get_view_size(plane_width, plane_height, render_aspect, zoom)
+    # free space around the zoomed view
+    slack_x = 0.5*(plane_width - zoom_width)
+    slack_y = 0.5*(plane_height - zoom_height)
+    if motion == 'PAN':
+        direction = rng.choice((-1.0, 1.0))
+        if slack_x >= slack_y:
+            return [(-direction*slack_x, 0.0, zoom_width), (direction*slack_x, 0.0, zoom_width)]
+        return [(0.0, -direction*slack_y, zoom_width), (0.0, direction*slack_y, zoom_width)]
+    # the zoomed view shows a random part of the picture
+    full_view = (0.0, 0.0, full_width)
+    zoom_view = (rng.uniform(-slack_x, slack_x), rng.uniform(-slack_y, slack_y), zoom_width)
+    if motion == 'ZOOM_OUT':
+        return [zoom_view, full_view]
+    return [full_view, zoom_view]
+
+def get_ken_burns_action(camera):
+    """
+    return: Action. The generated action of camera without F-Curves, a new one if it has none
+    """
+    animation_data = camera.animation_data_create()
+    action = animation_data.action
+    if action == None or not action.get('ds_ken_burns', False):
+        action = bpy.data.actions.new(camera.name+'_ken_burns')
+        action['ds_ken_burns'] = True
+        animation_data.action = action
+    for fcurve in list(action.fcurves):
+        action.fcurves.remove(fcurve)
+    return action
+
+def set_location_keyframes(action, frames, locations):
+    """
+    Key the location channels of action in bulk, interpolated with eased Bezier curves.
+    frames: list. Frame of each key
+    locations: list. Location vector of each key
+    """
+    for index in range(3):
+        fcurve = action.fcurves.new('location', index, 'Location')
+        fcurve.keyframe_points.add(len(frames))
+        co = [0.0]*(2*len(frames))
+        co[0::2] = frames
+        co[1::2] = [location[index] for location in locations]
+        fcurve.keyframe_points.foreach_set('co', co)
+        fcurve.update()
+
+def get_camera_strip_frames():
+    """
+    return: dict. (frame start, frame end) of the SCENE strip of each camera
+    """
+    return dict((seq.scene_camera, (seq.frame_final_start, seq.frame_final_end)) for seq in get_slideshow_sequences()[0])
+
+@instrumented('animate_ken_burns')
+def animate_ken_burns(context, cameras, motion='RANDOM', zoom=1.25, seed=0):
+    """
+    Replace the animation of cameras with a pan or zoom over their picture plane, keyed at
+    the frames of their SCENE strip. Cameras look straight down, the motion only moves them.
+    seed: int. Same seed, same motions
+    return: int. Count of animated cameras
+    """
+    render = context.scene.render
+    render_aspect = render.resolution_x / max(render.resolution_y, 1)
+    wm = context.window_manager
+    strip_frames = get_camera_strip_frames()
+    rng = random.Random(seed)
+    animated_count = 0
+    for cam in cameras:
+        plane = cam.ds_picture_plane
+        if plane == None or cam.data.type != 'PERSP':
+            continue
+        # cameras without strip keep their animation at its current offset
+        frame_start = cam.get('ds_action_offset', wm.ds_start_frame)
+        frames = strip_frames.get(cam, (frame_start, frame_start + wm.ds_sequence_length + wm.ds_effect_length))
+        views = plan_ken_burns_motion(rng, motion, plane.dimensions.x, plane.dimensions.y, render_aspect, zoom)
+        locations = []
+        for x, y, view_width in views:
+            # delta_location keeps the camera above its plane, the keys are relative to it
+            locations.append((plane.location.x + x - cam.delta_location.x,
+                              plane.location.y + y - cam.delta_location.y,
+                              plane.location.z + get_view_distance(cam.data, view_width, render_aspect) - cam.delta_location.z))
+        set_location_keyframes(get_ken_burns_action(cam), frames, locations)
+        cam['ds_action_offset'] = frames[0]
+        animated_count += 1
+    return animated_count
 
 ################### Operators
 
+def init_scene(scene):
+    """
+    Data part of 'Init scene', works without UI context.
+    return: Object. The new slideshow camera
+    """
+    scene.cursor_location = (0.0, 0.0, 0.0)
+    scene.render.engine = 'BLENDER_RENDER'
+    scene.game_settings.material_mode = 'GLSL'
+    
+    # clean scene, objects still used by other scenes are only unlinked
+    for obj in list(scene.objects):
+        scene.objects.unlink(obj)
+        if obj.users == 0:
+            bpy.data.objects.remove(obj, do_unlink=True)
+    
+    # N-Panel Screen Preview/Render
+    scene.render.sequencer_gl_preview = 'SOLID'
+    scene.render.use_sequencer_gl_textured_solid = True
+    
+    camera = bpy.data.objects.new('Camera', bpy.data.cameras.new('Camera'))
+    camera.location = (0.0, 0.0, 2.0)
+    scene.objects.link(camera)
+    scene.camera = camera
+    reset_camera_navigation()
+    return camera
+
+@instrumented('execute_import_images')
+def execute_import_images(self, context, image_files, order='NAME', gap=0.2):
+    """
+    Add and register planes for image_files after the registered planes.
+    """
+    image_files = sorted(filepath for filepath in image_files if os.path.splitext(filepath)[1].lower() in BATCH_IMAGE_EXTENSIONS)
+    if len(image_files) == 0:
+        self.report({'ERROR'}, 'No image files selected.')
+        return False
+    metadata_list = scan_image_metadata(image_files)
+    if order == 'TIME':
+        sorted_images = sort_image_files_by_time(image_files, metadata_list)
+        image_files = [filepath for filepath, metadata in sorted_images]
+        metadata_list = [metadata for filepath, metadata in sorted_images]
+    
+    scene = context.scene
+    left_edge = None
+    if len(get_slideshow_planes()) > 0:
+        left_edge = max(plane.location.x + 0.5*plane.dimensions.x for plane in get_slideshow_planes()) + gap
+    planes = import_image_planes(image_files, gap, metadata_list=metadata_list, left_edge=left_edge)
+    register_slideshow_planes(scene, planes)
+    if scene.ds_layout not in ('MANUAL', 'LINE'):
+        layout_slideshow_planes(get_slideshow_planes(), scene.ds_layout, gap)
+    reset_textured_planes()
+    self.report({'INFO'}, str(len(planes))+' images imported.')
+    return True
+
+class ImportImagePlanesOperator(bpy.types.Operator):
+    """Add shadeless image planes for the selected images"""
+    bl_idname = "dyn_slideshow.import_images"
+    bl_label = "Import images"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    directory = StringProperty(subtype='DIR_PATH')
+    files = CollectionProperty(type=bpy.types.OperatorFileListElement)
+    order = EnumProperty(
+        name="Order",
+        items=(('NAME', 'File name', ''),
+               ('TIME', 'Capture time', '')),
+        default='NAME',
+        )
+    
+    def execute(self, context):
+        image_files = [os.path.join(self.directory, file_element.name) for file_element in self.files]
+        if execute_import_images(self, context, image_files, self.order):
+            return {'FINISHED'}
+        else:
+            return {'CANCELLED'}
+    
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
 class InitSceneOperator(bpy.types.Operator):
     """Init scene for slideshow"""
     bl_idname = "dyn_slideshow.init_scene"
@@ -200,27 +1573,93 @@ class InitSceneOperator(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
-        bpy.context.scene.cursor_location = (0.0, 0.0, 0.0)
-        bpy.context.scene.render.engine = 'BLENDER_RENDER'
-        
-        bpy.context.space_data.viewport_shade = 'WIREFRAME'
-        bpy.context.scene.game_settings.material_mode = 'GLSL'
-        bpy.context.space_data.show_textured_solid = True
-        bpy.ops.view3d.viewnumpad(type='TOP', align_active=False)
-
-        # clean scene, remove everything
-        bpy.ops.object.select_all(action='SELECT')
-        bpy.ops.object.delete() 
+        if context.space_data != None:
+            context.space_data.viewport_shade = 'WIREFRAME'
+            context.space_data.show_textured_solid = True
+            bpy.ops.view3d.viewnumpad(type='TOP', align_active=False)
         
-        # N-Panel Screen Preview/Render
-        bpy.context.scene.render.sequencer_gl_preview = 'SOLID'
-        bpy.context.scene.render.use_sequencer_gl_textured_solid = True
+        camera = init_scene(context.scene)
+        camera.select = True
+        context.scene.objects.active = camera
         
-        bpy.ops.object.camera_add(location=(0,0,2),rotation=(0,0,0))
-        
-        bpy.context.space_data.viewport_shade = 'SOLID'
+        if context.space_data != None:
+            context.space_data.viewport_shade = 'SOLID'
         return {'FINISHED'}
 
+def get_plane_co(plane):
+    # cameras and image planes are matched in the top view
+    return Vector((plane.location.x, plane.location.y, 0.0))
+
+def get_camera_co(cam):
+    return Vector((cam.location.x+cam.delta_location.x, cam.location.y+cam.delta_location.y, 0.0))
+
+def build_plane_kdtree(planes):
+    plane_kdtree = KDTree(len(planes))
+    for i, plane in enumerate(planes):
+        plane_kdtree.insert(get_plane_co(plane), i)
+    plane_kdtree.balance()
+    return plane_kdtree
+
+def find_nearest_free_plane(plane_kdtree, plane_count, co, used_planes):
+    # grow the neighbour count until a plane without camera shows up
+    n = 1
+    while True:
+        for plane_co, index, distance in plane_kdtree.find_n(co, n):
+            if index not in used_planes:
+                return index
+        if n >= plane_count:
+            return None
+        n = min(n*2, plane_count)
+
+def attach_cameras_to_planes(cameras, planes):
+    """
+    Link each camera to its nearest plane without camera.
+    return: int. Count of attached cameras
+    """
+    if len(planes) == 0:
+        return 0
+    plane_kdtree = build_plane_kdtree(planes)
+    used_planes = set()
+    attached_count = 0
+    for cam in cameras:
+        index = find_nearest_free_plane(plane_kdtree, len(planes), get_camera_co(cam), used_planes)
+        if index == None:
+            break
+        used_planes.add(index)
+        cam.ds_picture_plane = planes[index]
+        attached_count += 1
+    reset_camera_navigation()
+    return attached_count
+
+def create_cameras_for_planes(template_camera, template_plane, planes):
+    """
+    Create a copy of template_camera above each plane, with the same offset
+    template_camera has to template_plane. Uses the data API, no operators.
+    return: list. The new cameras in the order of planes
+    """
+    scene = bpy.context.scene
+    template_action = None
+    if template_camera.animation_data != None:
+        template_action = template_camera.animation_data.action
+    
+    new_cameras = []
+    for plane in planes:
+        new_camera = template_camera.copy()
+        new_camera.data = template_camera.data.copy()
+        if template_action != None:
+            # each camera needs its own action, it is moved to the frames of its sequence
+            new_camera.animation_data.action = template_action.copy()
+        
+        new_camera.delta_location[0] += plane.location.x - template_plane.location.x
+        new_camera.delta_location[1] += plane.location.y - template_plane.location.y
+        new_camera.ds_picture_plane = plane
+        new_cameras.append(new_camera)
+    
+    for new_camera in new_cameras:
+        scene.objects.link(new_camera)
+    return new_cameras
+
+@instrumented('execute_init_cameras')
 def execute_init_cameras(self, context):
     cameraCount = 0
     cameraObj = None
@@ -233,48 +1672,24 @@ def execute_init_cameras(self, context):
         select_single_object(cameraObj)
         bpy.context.scene.camera = cameraObj
         
-        # list of all meshes in scene
-        scene_meshes = []
-        for obj in bpy.context.scene.objects:
-            if obj.type == 'MESH':
-                scene_meshes.append(obj)
+        scene_meshes = list(ensure_slideshow_planes(bpy.context.scene))
         
         # get image_plane under camera
         camera_image_mesh = None
-        for mesh_obj in scene_meshes:
-            if mesh_obj.type == 'MESH':
-                if camera_image_mesh == None:
-                    camera_image_mesh = mesh_obj
-                elif get_distance(cameraObj, mesh_obj) < get_distance(cameraObj, camera_image_mesh):
-                    camera_image_mesh = mesh_obj
+        if len(scene_meshes) > 0:
+            plane_kdtree = build_plane_kdtree(scene_meshes)
+            camera_image_mesh = scene_meshes[plane_kdtree.find(get_camera_co(cameraObj))[1]]
                     
         scene_meshes.sort(key=lambda mesh: mesh.location.x)
         if is_draw_type_handling() and camera_image_mesh != None:
             camera_image_mesh.draw_type = 'TEXTURED'
         
-        last_mesh = camera_image_mesh
-        for mesh_obj in scene_meshes:
-            if mesh_obj.type == 'MESH':
-                if mesh_obj == camera_image_mesh:
-                    print('image_plane already has first camera: '+str(mesh_obj))
-                    cameraObj['picture_mesh'] = camera_image_mesh.name
-                else:
-                    camera_offset_x = mesh_obj.location.x - last_mesh.location.x
-                    camera_offset_y = mesh_obj.location.y - last_mesh.location.y
-                    
-                    bpy.ops.object.duplicate_move(OBJECT_OT_duplicate = {"linked":False})
-                    newObj = bpy.context.active_object
-                    
-                    newObj.delta_location[0] += camera_offset_x
-                    newObj.delta_location[1] += camera_offset_y
-                    
-                    newObj['picture_mesh'] = mesh_obj.name
-                    
-                    last_mesh = mesh_obj
-                    
-            else:
-                print('ERROR: type is '+mesh_obj.type)
+        if camera_image_mesh != None:
+            cameraObj.ds_picture_plane = camera_image_mesh
+            other_meshes = [mesh_obj for mesh_obj in scene_meshes if mesh_obj != camera_image_mesh]
+            create_cameras_for_planes(cameraObj, camera_image_mesh, other_meshes)
         
+        reset_camera_navigation()
                 
     else:
         msg = 'Please add and position camera in scene.'
@@ -283,101 +1698,697 @@ def execute_init_cameras(self, context):
         self.report({'ERROR'}, msg)
         return False
     
-    return True
+    return True
+
+def plan_slideshow(camera_count, start_frame, sequence_length, effect_length, effect_settings_list, effect_add_type='CYCLIC', allocator=None, sequence_lengths=None, effect_seed=0):
+    """
+    Plan the slideshow timeline without touching the VSE. Strips are placed in the
+    lowest free channels of allocator, effects above both of their strips.
+    sequence_lengths: list. Sequence length per camera, None uses sequence_length for all
+    effect_seed: int. Seed of the RANDOM effect schedule
+    return: dict. 'frame_end', 'sequences' with a (frame_start, duration, channel) row per camera
+    and 'effects' with a (frame_start, frame_end, channel, sequence1, sequence2, effect_settings) row per transition.
+    Without cameras the plan is empty and ends at start_frame. None if the VSE has not enough free channels
+    """
+    if camera_count == 0:
+        return {'frame_end': start_frame, 'sequences': [], 'effects': []}
+    if allocator == None:
+        allocator = ChannelAllocator()
+    if sequence_lengths == None:
+        sequence_lengths = [sequence_length]*camera_count
+    effect_schedule = get_effect_schedule(max(camera_count-1, 0), len(effect_settings_list), effect_add_type, effect_seed)
+    
+    sequences = []
+    effects = []
+    seq_start_frame = start_frame
+    for sequence_index in range(camera_count):
+        if sequence_index > 0:
+            # the previous sequence is shown alone for its length after its first effect
+            seq_start_frame += sequence_lengths[sequence_index-1]
+            if sequence_index > 1:
+                seq_start_frame += effect_length
+        
+        # first sequence has only one effect overlap, the last one is trimmed after its effect
+        if sequence_index == 0:
+            duration = sequence_lengths[sequence_index] + effect_length
+        else:
+            duration = sequence_lengths[sequence_index] + 2*effect_length
+        if sequence_index == camera_count-1:
+            duration = duration - effect_length + 1
+        
+        seq_channel = allocator.allocate(seq_start_frame, seq_start_frame + duration)
+        if seq_channel == None:
+            return None
+        sequences.append((seq_start_frame, duration, seq_channel))
+        
+        if sequence_index > 0 and effect_length > 0:
+            effect_settings = effect_settings_list[effect_schedule[sequence_index-1]]
+            effect_channel = allocator.allocate(seq_start_frame, seq_start_frame + effect_length, max(sequences[-2][2], seq_channel)+1)
+            if effect_channel == None:
+                return None
+            effects.append((seq_start_frame, seq_start_frame + effect_length, effect_channel, sequence_index-1, sequence_index, effect_settings))
+    
+    return {
+        'frame_end': start_frame + sum(sequence_lengths) + (camera_count-1)*effect_length,
+        'sequences': sequences,
+        'effects': effects,
+        }
+
+def get_slideshow_plan(context, camera_count, add_default_effect=True, allocator=None):
+    wm = context.window_manager
+    if allocator == None:
+        allocator = get_vse_channel_allocator()
+    return plan_slideshow(camera_count, wm.ds_start_frame, wm.ds_sequence_length, wm.ds_effect_length,
+                          get_effect_settings_list(add_default_effect), wm.ds_effect_add_type, allocator,
+                          effect_seed=context.scene.ds_effect_seed)
+
+def get_camera_action(camera):
+    if camera.animation_data != None:
+        return camera.animation_data.action
+    return None
+
+def get_action_movement(camera, seq_start_frame, action_offset=0):
+    """
+    Cameras remember how far their action was moved already in 'ds_action_offset',
+    move_actions_on_x() updates it.
+    action_offset: int. Offset to assume for cameras without it
+    return: tuple. (camera, seq_start_frame, x_movement) to move the action to seq_start_frame
+    """
+    return (camera, seq_start_frame, seq_start_frame - camera.get('ds_action_offset', action_offset))
+
+def add_scene_sequence(camera, seq_start_frame, duration, seq_channel, target_scene=None):
+    """
+    Add a SCENE strip for camera. The strip shows the scene frames of its own timeline range,
+    the camera action still has to be moved there, see get_action_movement().
+    target_scene: Scene. Add the strip to the VSE of this scene, None for the current scene
+    return: Sequence. The new strip
+    """
+    scene = bpy.context.scene
+    if target_scene == None:
+        target_scene = scene
+    scene_sequence_name = 'scene'
+    new_sequence = target_scene.sequence_editor.sequences.new_scene(name=scene_sequence_name+'_'+str(camera.name), scene=scene, channel=seq_channel, frame_start=seq_start_frame)
+    
+    # set offset in strip
+    new_sequence.frame_final_duration = duration
+    new_sequence.animation_offset_start = seq_start_frame
+    new_sequence.frame_final_duration = duration
+    
+    new_sequence.scene_camera = camera
+    return new_sequence
+
+def apply_slideshow_plan(plan, scene_cameras):
+    """
+    Create the sequences and effects of the plan, one SCENE strip per camera.
+    return: list. The new SCENE strips in camera order
+    """
+    scene = bpy.context.scene
+    scene.sequence_editor_create()
+    scene.frame_end = plan['frame_end']
+    
+    new_sequences = []
+    action_movements = []
+    for camera, (seq_start_frame, duration, seq_channel) in zip(scene_cameras, plan['sequences']):
+        new_sequences.append(add_scene_sequence(camera, seq_start_frame, duration, seq_channel))
+        # move animation to strip frames
+        action_movements.append(get_action_movement(camera, seq_start_frame))
+    
+    for seq_start_frame, seq_end_frame, effect_channel, sequence1, sequence2, effect_settings in plan['effects']:
+        add_effect_sequence(effect_settings, effect_channel, seq_start_frame, seq_end_frame, new_sequences[sequence1], new_sequences[sequence2])
+    
+    move_actions_on_x(action_movements)
+    reset_sequence_index()
+    return new_sequences
+
+def set_scene_sequence_range(seq, seq_start_frame, duration):
+    """
+    Move and resize a SCENE strip, its animation offset moves along so it keeps
+    showing the scene frames of its own timeline range.
+    return: int. Frames the strip moved
+    """
+    frame_delta = seq_start_frame - seq.frame_final_start
+    if duration < seq.frame_final_duration:
+        seq.frame_final_duration = duration
+    if frame_delta != 0:
+        old_duration = seq.frame_final_duration
+        seq.frame_start += frame_delta
+        seq.animation_offset_start += frame_delta
+        seq.frame_final_duration = old_duration
+    if duration != seq.frame_final_duration:
+        seq.frame_final_duration = duration
+    return frame_delta
+
+def find_free_channel_for_ranges(allocator, ranges, min_channel=1):
+    """
+    return: int. Lowest channel >= min_channel free at all frame ranges, None if there is none
+    """
+    for channel in range(min_channel, MAX_VSE_CHANNEL+1):
+        if all(allocator.is_free(channel, frame_start, frame_end) for frame_start, frame_end in ranges):
+            return channel
+    return None
+
+def plan_scene_sequence_moves(sequence_ranges, allocator):
+    """
+    Plan moving SCENE strips to new frame ranges without overlapping on the way, no strip
+    is touched. A strip keeps its channel and waits for the strips in its way to move first.
+    Only strips that can not move in their channel at all take the lowest channel that is
+    free at their old and their new range.
+    sequence_ranges: list. (sequence, frame_start, duration) rows
+    allocator: ChannelAllocator of all strips that stay, changed to the planned layout
+    return: list. (sequence, channel, frame_start, duration) moves in the order to apply them, None if a strip can not be moved
+    """
+    moves = []
+    # right moves from the end, left moves from the start, so strips rarely block each other
+    right_moves = sorted([row for row in sequence_ranges if row[1] > row[0].frame_final_start], key=lambda row: -row[1])
+    left_moves = sorted([row for row in sequence_ranges if row[1] <= row[0].frame_final_start], key=lambda row: row[1])
+    pending = [row for row in right_moves + left_moves if row[1] != row[0].frame_final_start or row[2] != row[0].frame_final_duration]
+    change_channels = False
+    while len(pending) > 0:
+        blocked = []
+        for seq, seq_start_frame, duration in pending:
+            old_range = (seq.frame_final_start, seq.frame_final_end)
+            new_range = (seq_start_frame, seq_start_frame + duration)
+            allocator.remove(seq.channel, old_range[0], old_range[1])
+            channel = seq.channel
+            if not allocator.is_free(channel, new_range[0], new_range[1]):
+                channel = None
+                if change_channels:
+                    # the channel changes first, so it must be free at the old range too
+                    channel = find_free_channel_for_ranges(allocator, (old_range, new_range))
+            if channel == None:
+                allocator.add(seq.channel, old_range[0], old_range[1])
+                blocked.append((seq, seq_start_frame, duration))
+                continue
+            allocator.add(channel, new_range[0], new_range[1])
+            moves.append((seq, channel, seq_start_frame, duration))
+        if len(blocked) == len(pending):
+            if change_channels:
+                return None
+            # nothing moves in its own channel any more, the blocked strips may change it
+            change_channels = True
+        else:
+            change_channels = False
+        pending = blocked
+    return moves
+
+def apply_scene_sequence_moves(moves):
+    """
+    Apply moves of plan_scene_sequence_moves().
+    return: list. (camera, seq_start_frame, x_movement) rows of the moved strips, see move_actions_on_x()
+    """
+    action_movements = []
+    for seq, channel, seq_start_frame, duration in moves:
+        old_frame_start = seq.frame_final_start
+        seq.channel = channel
+        set_scene_sequence_range(seq, seq_start_frame, duration)
+        action_movements.append(get_action_movement(seq.scene_camera, seq_start_frame, old_frame_start))
+    return action_movements
+
+def get_sequence_layout(sequences, moves):
+    """
+    return: dict. (channel, frame_start, frame_end) of each strip after the moves of plan_scene_sequence_moves()
+    """
+    sequence_layout = dict((seq, (seq.channel, seq.frame_final_start, seq.frame_final_end)) for seq in sequences)
+    for seq, channel, seq_start_frame, duration in moves:
+        sequence_layout[seq] = (channel, seq_start_frame, seq_start_frame + duration)
+    return sequence_layout
+
+def plan_effect_channels(effect_sequences, sequence_layout, allocator):
+    """
+    Channels of effects whose strips move. An effect keeps its channel if it stays
+    above both strips and is free at the new overlap of the strips.
+    sequence_layout: dict. Strip layout after the moves, see get_sequence_layout()
+    allocator: ChannelAllocator of the planned layout, the effects move to their new ranges
+    return: list. (effect, channel) pairs, None if there is no free channel
+    """
+    for seq in effect_sequences:
+        allocator.remove(seq.channel, seq.frame_final_start, seq.frame_final_end)
+    effect_channels = []
+    for seq in effect_sequences:
+        channel_1, frame_start_1, frame_end_1 = sequence_layout[seq.input_1]
+        channel_2, frame_start_2, frame_end_2 = sequence_layout[seq.input_2]
+        frame_start, frame_end = max(frame_start_1, frame_start_2), min(frame_end_1, frame_end_2)
+        min_channel = max(channel_1, channel_2) + 1
+        channel = seq.channel
+        if channel < min_channel or not allocator.is_free(channel, frame_start, frame_end):
+            channel = allocator.find_free_channel(frame_start, frame_end, min_channel)
+            if channel == None:
+                return None
+        allocator.add(channel, frame_start, frame_end)
+        effect_channels.append((seq, channel))
+    return effect_channels
+
+def apply_effect_channels(effect_channels):
+    # effects follow their moved strips, then change channel
+    for seq, channel in effect_channels:
+        seq.update()
+        if seq.channel != channel:
+            seq.channel = channel
+
+def plan_missing_effects(plan, sequence_channels, joined_sequences, allocator):
+    """
+    Effects of the plan whose two strips are not joined by an effect yet.
+    sequence_channels: list. Channel of each strip of the plan after the moves
+    joined_sequences: set. (sequence1, sequence2) index pairs of the plan with an effect
+    return: list. (effect_settings, channel, frame_start, frame_end, sequence1, sequence2) rows, None if there is no free channel
+    """
+    new_effects = []
+    for seq_start_frame, seq_end_frame, effect_channel, sequence1, sequence2, effect_settings in plan['effects']:
+        if (sequence1, sequence2) not in joined_sequences:
+            effect_channel = allocator.allocate(seq_start_frame, seq_end_frame, max(sequence_channels[sequence1], sequence_channels[sequence2])+1)
+            if effect_channel == None:
+                return None
+            new_effects.append((effect_settings, effect_channel, seq_start_frame, seq_end_frame, sequence1, sequence2))
+    return new_effects
+
+def add_missing_effects(new_effects, scene_sequences):
+    # effects of plan_missing_effects()
+    for effect_settings, effect_channel, seq_start_frame, seq_end_frame, sequence1, sequence2 in new_effects:
+        add_effect_sequence(effect_settings, effect_channel, seq_start_frame, seq_end_frame, scene_sequences[sequence1], scene_sequences[sequence2])
+
+def get_orphan_scene_sequences():
+    # slideshow strips whose camera was deleted
+    se = bpy.context.scene.sequence_editor
+    return [seq for seq in se.sequences if seq.type == 'SCENE' and seq.scene == bpy.context.scene and seq.scene_camera == None and seq.name.startswith('scene_')]
+
+@instrumented('execute_sync_slideshow')
+def execute_sync_slideshow(self, context):
+    """
+    Bring the slideshow strips in line with the current cameras: strips of removed
+    cameras are deleted, strips for new cameras are added and the strips after a
+    change ripple along. Strips and effects that are already right are not touched.
+    """
+    scene = context.scene
+    se = scene.sequence_editor
+    # sync is the explicit rebuild, the cached order may miss cameras moved by hand
+    reset_camera_navigation()
+    scene_cameras = get_camera_navigation()['cameras']
+    # only frames are used from the plan, channels come from the existing strips
+    plan = get_slideshow_plan(context, len(scene_cameras), allocator=ChannelAllocator())
+    if plan == None:
+        self.report({'ERROR'}, 'Not enough free VSE channels.')
+        return False
+    
+    camera_positions = get_camera_navigation()['positions']
+    scene_sequences, effect_sequences = get_slideshow_sequences()
+    camera_sequences = {}
+    removed_sequences = get_orphan_scene_sequences()
+    for seq in scene_sequences:
+        if seq.scene_camera not in camera_positions or seq.scene_camera in camera_sequences:
+            removed_sequences.append(seq)
+        else:
+            camera_sequences[seq.scene_camera] = seq
+    
+    # effects stay if they still join the same two neighbouring cameras
+    wanted_pairs = set()
+    for i in range(1, len(scene_cameras)):
+        wanted_pairs.add((scene_cameras[i-1].name, scene_cameras[i].name))
+    effect_pairs = {}
+    removed_effects = []
+    removed_sequence_set = set(removed_sequences)
+    for seq in effect_sequences:
+        pair = (seq.input_1.scene_camera.name, seq.input_2.scene_camera.name)
+        if pair not in wanted_pairs or pair in effect_pairs or seq.input_1 in removed_sequence_set or seq.input_2 in removed_sequence_set:
+            removed_effects.append(seq)
+        else:
+            effect_pairs[pair] = seq
+    
+    # plan every change on the allocator before the first strip is touched
+    allocator = build_channel_allocator(se.sequences, removed_sequence_set | set(removed_effects))
+    sequence_ranges = []
+    for camera, (seq_start_frame, duration, seq_channel) in zip(scene_cameras, plan['sequences']):
+        if camera in camera_sequences:
+            sequence_ranges.append((camera_sequences[camera], seq_start_frame, duration))
+    moves = plan_scene_sequence_moves(sequence_ranges, allocator)
+    effect_channels = None
+    if moves != None:
+        sequence_layout = get_sequence_layout(camera_sequences.values(), moves)
+        effect_channels = plan_effect_channels(list(effect_pairs.values()), sequence_layout, allocator)
+    if effect_channels == None:
+        self.report({'ERROR'}, 'Could not move strips, not enough free VSE channels.')
+        return False
+    
+    sequence_channels = []
+    new_sequence_channels = {}
+    for camera, (seq_start_frame, duration, seq_channel) in zip(scene_cameras, plan['sequences']):
+        if camera in camera_sequences:
+            sequence_channels.append(sequence_layout[camera_sequences[camera]][0])
+        else:
+            seq_channel = allocator.allocate(seq_start_frame, seq_start_frame + duration)
+            if seq_channel == None:
+                self.report({'ERROR'}, 'Not enough free VSE channels.')
+                return False
+            new_sequence_channels[camera] = seq_channel
+            sequence_channels.append(seq_channel)
+    camera_indices = dict((camera, i) for i, camera in enumerate(scene_cameras))
+    joined_sequences = set((camera_indices[seq.input_1.scene_camera], camera_indices[seq.input_2.scene_camera]) for seq in effect_pairs.values())
+    new_effects = plan_missing_effects(plan, sequence_channels, joined_sequences, allocator)
+    if new_effects == None:
+        self.report({'ERROR'}, 'Not enough free VSE channels.')
+        return False
+    
+    for seq in removed_effects + removed_sequences:
+        se.sequences.remove(seq)
+    scene.frame_end = plan['frame_end']
+    action_movements = apply_scene_sequence_moves(moves)
+    changed_count = len(action_movements)
+    apply_effect_channels(effect_channels)
+    
+    added_count = 0
+    for camera, (seq_start_frame, duration, seq_channel) in zip(scene_cameras, plan['sequences']):
+        if camera in new_sequence_channels:
+            camera_sequences[camera] = add_scene_sequence(camera, seq_start_frame, duration, new_sequence_channels[camera])
+            action_movements.append(get_action_movement(camera, seq_start_frame))
+            added_count += 1
+    add_missing_effects(new_effects, [camera_sequences[camera] for camera in scene_cameras])
+    
+    move_actions_on_x(action_movements)
+    reset_sequence_index()
+    reset_textured_planes()
+    self.report({'INFO'}, 'Slideshow synced: '+str(added_count)+' added, '+str(len(removed_sequences))+' removed, '+str(changed_count)+' moved.')
+    return True
+
+@instrumented('execute_init_sequences')
+def execute_init_sequences(self, context):
+    scene_cameras = get_sorted_scene_cameras_list()
+    if len(scene_cameras) == 0:
+        self.report({'ERROR'}, 'Please add and position camera in scene.')
+        return False
+    
+    plan = get_slideshow_plan(context, len(scene_cameras))
+    if plan == None:
+        self.report({'ERROR'}, 'Not enough free VSE channels.')
+        return False
+    apply_slideshow_plan(plan, scene_cameras)
+    return True
+
+@instrumented('execute_setup_materials')
+def execute_setup_materials(self, context):
+    # set shadeless and wire
+    if is_draw_type_handling():
+        for mesh_obj in ensure_slideshow_planes(context.scene):
+            for mat_slot in mesh_obj.material_slots:
+                # imported planes are shadeless already
+                if mat_slot.material != None and not mat_slot.material.use_shadeless:
+                    mat_slot.material.use_shadeless = True
+            mesh_obj.draw_type = 'WIRE'
+            if mesh_obj.location == Vector((0.0, 0.0, 0.0)):
+                mesh_obj.draw_type = 'SOLID'
+        reset_textured_planes()
+    return True
+
+@instrumented('execute_setup_cameras')
+def execute_setup_cameras(self, context):
+    if not has_multiple_cameras():
+        return execute_init_cameras(self, context)
+    if not has_camera_navigation():
+        # hand placed cameras, attach them to the planes below
+        execute_attach_cameras(self, context)
+    return True
+
+def execute_setup_slideshow(self, context):
+    execute_setup_materials(self, context)
+    result1 = execute_setup_cameras(self, context)
+    result2 = execute_init_sequences(self, context)
+    return result1 and result2
+
+class SetupSlideshowOperator(bpy.types.Operator):
+    """Setup Slideshow"""
+    bl_idname = "dyn_slideshow.setup_slideshow"
+    bl_label = "Setup Slideshow"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        if execute_setup_slideshow(self, context):
+            return {'FINISHED'}
+        else:
+            return {'CANCELLED'}
+    
+    @classmethod
+    def poll(cls, context):
+        return not has_sequence()
+
+def execute_attach_cameras(self, context):
+    scene_cameras = get_sorted_scene_cameras_list()
+    attached_count = attach_cameras_to_planes(scene_cameras, ensure_slideshow_planes(context.scene))
+    if attached_count < len(scene_cameras):
+        self.report({'WARNING'}, str(len(scene_cameras) - attached_count)+' cameras without image plane.')
+    return attached_count > 0
+
+@instrumented('execute_retime_slideshow')
+def execute_retime_slideshow(self, context, sequence_length, effect_length, use_camera_lengths):
+    """
+    Move and resize all slideshow strips and camera actions in one pass for new
+    sequence and effect lengths. Strip order stays, strips and effects keep their
+    channels unless another strip blocks them.
+    """
+    scene = context.scene
+    se = scene.sequence_editor
+    wm = context.window_manager
+    scene_sequences, effect_sequences = get_slideshow_sequences()
+    if len(scene_sequences) == 0:
+        self.report({'ERROR'}, 'No slideshow strips found.')
+        return False
+    
+    sequence_lengths = None
+    if use_camera_lengths:
+        sequence_lengths = [seq.scene_camera.get('ds_sequence_length', sequence_length) for seq in scene_sequences]
+    plan = plan_slideshow(len(scene_sequences), scene_sequences[0].frame_final_start, sequence_length, effect_length,
+                          get_effect_settings_list(), wm.ds_effect_add_type, ChannelAllocator(), sequence_lengths, scene.ds_effect_seed)
+    
+    # without effect length the effects go, they are planned away
+    removed_effects = []
+    if effect_length == 0:
+        removed_effects = effect_sequences
+        effect_sequences = []
+    
+    # plan every change on the allocator before the first strip is touched
+    allocator = build_channel_allocator(se.sequences, set(removed_effects))
+    sequence_ranges = [(seq, seq_start_frame, duration) for seq, (seq_start_frame, duration, seq_channel) in zip(scene_sequences, plan['sequences'])]
+    moves = plan_scene_sequence_moves(sequence_ranges, allocator)
+    effect_channels = None
+    if moves != None:
+        sequence_layout = get_sequence_layout(scene_sequences, moves)
+        effect_channels = plan_effect_channels(effect_sequences, sequence_layout, allocator)
+    if effect_channels == None:
+        self.report({'ERROR'}, 'Could not move strips, not enough free VSE channels.')
+        return False
+    new_effects = []
+    if effect_length > 0:
+        sequence_positions = dict((seq, i) for i, seq in enumerate(scene_sequences))
+        joined_sequences = set((sequence_positions[seq.input_1], sequence_positions[seq.input_2]) for seq in effect_sequences)
+        new_effects = plan_missing_effects(plan, [sequence_layout[seq][0] for seq in scene_sequences], joined_sequences, allocator)
+        if new_effects == None:
+            self.report({'ERROR'}, 'Not enough free VSE channels.')
+            return False
+    
+    for seq in removed_effects:
+        se.sequences.remove(seq)
+    scene.frame_end = plan['frame_end']
+    action_movements = apply_scene_sequence_moves(moves)
+    apply_effect_channels(effect_channels)
+    add_missing_effects(new_effects, scene_sequences)
+    
+    move_actions_on_x(action_movements)
+    wm.ds_sequence_length = sequence_length
+    wm.ds_effect_length = effect_length
+    reset_sequence_index()
+    reset_textured_planes()
+    return True
+
+class RetimeSlideshowOperator(bpy.types.Operator):
+    """Change sequence and effect length of the existing slideshow"""
+    bl_idname = "dyn_slideshow.retime_slideshow"
+    bl_label = "Retime slideshow"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    sequence_length = IntProperty(name="Length", min = 1, default = 100, description='Sequence length without effect length')
+    effect_length = IntProperty(name="Effect length", min = 0, default = 25, description='Sequence effect length, added to sequence length')
+    use_camera_lengths = BoolProperty(name="Camera lengths", default = False, description="Use the 'ds_sequence_length' property of a camera as its length if it has one")
+    
+    def invoke(self, context, event):
+        wm = context.window_manager
+        self.sequence_length = wm.ds_sequence_length
+        self.effect_length = wm.ds_effect_length
+        return wm.invoke_props_dialog(self)
+    
+    def execute(self, context):
+        if execute_retime_slideshow(self, context, self.sequence_length, self.effect_length, self.use_camera_lengths):
+            return {'FINISHED'}
+        else:
+            return {'CANCELLED'}
+    
+    @classmethod
+    def poll(cls, context):
+        return has_sequence()
+
+class SyncSlideshowOperator(bpy.types.Operator):
+    """Update the slideshow strips after cameras were added, removed or reordered"""
+    bl_idname = "dyn_slideshow.sync_slideshow"
+    bl_label = "Sync slideshow"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        if execute_sync_slideshow(self, context):
+            return {'FINISHED'}
+        else:
+            return {'CANCELLED'}
+    
+    @classmethod
+    def poll(cls, context):
+        return has_sequence()
+
+class AttachCamerasToPlanesOperator(bpy.types.Operator):
+    """Attach each camera to the nearest image plane"""
+    bl_idname = "dyn_slideshow.attach_cameras_to_planes"
+    bl_label = "Attach cameras to planes"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        if execute_attach_cameras(self, context):
+            return {'FINISHED'}
+        else:
+            return {'CANCELLED'}
+    
+    @classmethod
+    def poll(cls, context):
+        return has_multiple_cameras()
 
-def execute_init_sequences(self, context):
-    wm = context.window_manager
-    
-    scene_sequence_name = 'scene'
+class RegisterSlideshowPlanesOperator(bpy.types.Operator):
+    """Use the selected meshes as slideshow image planes"""
+    bl_idname = "dyn_slideshow.register_planes"
+    bl_label = "Register selected planes"
+    bl_options = {'REGISTER', 'UNDO'}
     
-    # variables
-    channel_toggle = True
-    channel_a = get_first_free_vse_channel()
-    channel_b = channel_a + 1
-    effect_channel = channel_b + 1
-    seq_channel = channel_a
-    sequence_index = 0
-    effect_index = 0
-    effect_count_on_seq = 1
-    last_sequence = None
+    def execute(self, context):
+        planes = [obj for obj in context.scene.objects if obj.select and obj.type == 'MESH']
+        added_count = register_slideshow_planes(context.scene, planes)
+        reset_textured_planes()
+        self.report({'INFO'}, str(added_count)+' planes registered.')
+        return {'FINISHED'}
+
+class UnregisterSlideshowPlanesOperator(bpy.types.Operator):
+    """Stop using the selected meshes as slideshow image planes"""
+    bl_idname = "dyn_slideshow.unregister_planes"
+    bl_label = "Unregister selected planes"
+    bl_options = {'REGISTER', 'UNDO'}
     
-    # create sequences for each camera
-    bpy.context.scene.sequence_editor_create()
+    def execute(self, context):
+        planes = set(obj for obj in context.scene.objects if obj.select and obj.type == 'MESH')
+        removed_count = unregister_slideshow_planes(context.scene, planes)
+        # cameras of removed planes have no plane anymore
+        for cam in get_camera_navigation()['cameras']:
+            if cam.ds_picture_plane in planes:
+                cam.ds_picture_plane = None
+        reset_camera_navigation()
+        reset_textured_planes()
+        self.report({'INFO'}, str(removed_count)+' planes unregistered.')
+        return {'FINISHED'}
+
+class LayoutPlanesOperator(bpy.types.Operator):
+    """Arrange the slideshow planes, the slideshow follows the layout order"""
+    bl_idname = "dyn_slideshow.layout_planes"
+    bl_label = "Layout planes"
+    bl_options = {'REGISTER', 'UNDO'}
     
-    scene_cameras = get_sorted_scene_cameras_list()
-    scene_cameras.sort(key=lambda camera: camera.location[0]+camera.delta_location[0])
+    layout = EnumProperty(name="Layout", items=SLIDESHOW_LAYOUT_ITEMS, default='GRID')
+    columns = IntProperty(name="Columns", min=0, default=0, description='Columns of grid and serpentine layouts, 0 for a square')
+    gap = FloatProperty(name="Gap", min=0.0, default=0.2)
     
-    # resize scene length
-    bpy.context.scene.frame_end = wm.ds_start_frame + len(scene_cameras)*wm.ds_sequence_length + (len(scene_cameras)-1)*wm.ds_effect_length
+    def execute(self, context):
+        planes = ensure_slideshow_planes(context.scene)
+        if len(planes) == 0:
+            self.report({'ERROR'}, 'No image planes found.')
+            return {'CANCELLED'}
+        layout_slideshow_planes(planes, self.layout, self.gap, self.columns)
+        reset_textured_planes()
+        return {'FINISHED'}
     
-    for camera in scene_cameras:
-        if sequence_index > 0:
-            effect_index = sequence_index-1
-        seq_start_frame = wm.ds_start_frame + sequence_index*wm.ds_sequence_length + effect_index*wm.ds_effect_length
-        
-        # toggle sequence channel
-        if channel_toggle:
-            seq_channel = channel_a
-        else:
-            seq_channel = channel_b
-        channel_toggle = not channel_toggle
-        
-        new_sequence = bpy.context.scene.sequence_editor.sequences.new_scene(name=scene_sequence_name+'_'+str(camera.name), scene=bpy.context.scene, channel=seq_channel, frame_start=seq_start_frame)
-        new_sequence.frame_final_duration = wm.ds_sequence_length + effect_count_on_seq * wm.ds_effect_length
-        
-        # set offset in strip
-        seqDuration = new_sequence.frame_final_duration
-        new_sequence.animation_offset_start = seq_start_frame
-        new_sequence.frame_final_duration = seqDuration
-        
-        # move animation to strip frames
-        if camera.animation_data != None:
-            move_action_on_x(camera.animation_data.action, seq_start_frame)
-        
-        new_sequence.scene_camera = camera
-
-        if last_sequence != None and wm.ds_effect_length > 0:
-            add_new_effect(effect_index, effect_channel, seq_start_frame, seq_start_frame + wm.ds_effect_length, last_sequence, new_sequence)
-        
-        sequence_index = sequence_index+1
-        effect_index = effect_index+1
-        effect_count_on_seq = 2
-        last_sequence = new_sequence
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
 
-    new_sequence.frame_final_end = new_sequence.frame_final_end - wm.ds_effect_length + 1
+class KenBurnsOperator(bpy.types.Operator):
+    """Animate all slideshow cameras with pan and zoom over their picture"""
+    bl_idname = "dyn_slideshow.ken_burns"
+    bl_label = "Animate cameras"
+    bl_options = {'REGISTER', 'UNDO'}
     
-    return True
+    motion = EnumProperty(name="Motion", items=KEN_BURNS_MOTION_ITEMS, default='RANDOM')
+    zoom = FloatProperty(name="Zoom", min=1.0, max=4.0, default=1.25, description='Magnification of the zoomed view')
+    seed = IntProperty(name="Seed", min=0, default=0, description='Seed of the random motions')
+    
+    def execute(self, context):
+        animated_count = animate_ken_burns(context, get_camera_navigation()['cameras'], self.motion, self.zoom, self.seed)
+        if animated_count == 0:
+            self.report({'ERROR'}, 'No cameras with image plane found.')
+            return {'CANCELLED'}
+        self.report({'INFO'}, str(animated_count)+' cameras animated.')
+        return {'FINISHED'}
+    
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
 
-class SetupSlideshowOperator(bpy.types.Operator):
-    """Setup Slideshow"""
-    bl_idname = "dyn_slideshow.setup_slideshow"
-    bl_label = "Setup Slideshow"
+class RepackSlideshowChannelsOperator(bpy.types.Operator):
+    """Move the slideshow strips to the lowest free VSE channels"""
+    bl_idname = "dyn_slideshow.repack_channels"
+    bl_label = "Repack slideshow channels"
     bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
-        # set shadeless and wire
-        if is_draw_type_handling():
-            for mesh_obj in bpy.context.scene.objects:
-                if mesh_obj.type == 'MESH':
-                    for mat_slot in mesh_obj.material_slots:
-                        mat_slot.material.use_shadeless = True
-                    mesh_obj.draw_type = 'WIRE'
-                    if mesh_obj.location == Vector((0.0, 0.0, 0.0)):
-                        mesh_obj.draw_type = 'SOLID'
-
-        if not has_multiple_cameras():
-            result1 = execute_init_cameras(self, context)
-        else:
-            result1 = True
-        result2 = execute_init_sequences(self, context)
-        if result1 and result2:
-            return {'FINISHED'}
-        else:
+        se = context.scene.sequence_editor
+        scene_sequences, effect_sequences = get_slideshow_sequences()
+        slideshow_sequences = set(scene_sequences) | set(effect_sequences)
+        
+        # first fit in start order uses the minimum number of channels for the strips
+        target_allocator = build_channel_allocator(se.sequences, slideshow_sequences)
+        new_channels = {}
+        for seq in scene_sequences:
+            new_channels[seq] = target_allocator.allocate(seq.frame_final_start, seq.frame_final_end)
+            if new_channels[seq] == None:
+                self.report({'ERROR'}, 'Not enough free VSE channels.')
+                return {'CANCELLED'}
+        for seq in effect_sequences:
+            min_channel = max(new_channels[seq.input_1], new_channels[seq.input_2]) + 1
+            new_channels[seq] = target_allocator.allocate(seq.frame_final_start, seq.frame_final_end, min_channel)
+            if new_channels[seq] == None:
+                self.report({'ERROR'}, 'Not enough free VSE channels.')
+                return {'CANCELLED'}
+        
+        sequence_channels = [(seq, new_channels[seq]) for seq in scene_sequences + effect_sequences]
+        if not move_sequences_to_channels(sequence_channels, build_channel_allocator(se.sequences)):
+            self.report({'ERROR'}, 'Not enough free VSE channels.')
             return {'CANCELLED'}
+        reset_sequence_index()
+        
+        self.report({'INFO'}, 'Slideshow uses '+str(len(set(new_channels.values())))+' channels.')
+        return {'FINISHED'}
     
     @classmethod
     def poll(cls, context):
-        return not has_sequence()
+        return has_sequence()
+
+class DryRunSlideshowOperator(bpy.types.Operator):
+    """Report the timeline the slideshow setup would create"""
+    bl_idname = "dyn_slideshow.dry_run_slideshow"
+    bl_label = "Dry run slideshow"
+    
+    def execute(self, context):
+        camera_count = len(get_camera_navigation()['cameras'])
+        if camera_count == 1:
+            # setup will add a camera for each image plane
+            camera_count = len(get_slideshow_planes())
+            if camera_count == 0:
+                camera_count = len(get_image_plane_candidates(context.scene))
+        if camera_count == 0:
+            self.report({'ERROR'}, 'No cameras or image planes found.')
+            return {'CANCELLED'}
+        plan = get_slideshow_plan(context, camera_count, False)
+        if plan == None:
+            self.report({'ERROR'}, 'Not enough free VSE channels.')
+            return {'CANCELLED'}
+        self.report({'INFO'}, 'Frame end: '+str(plan['frame_end'])+', strips: '+str(len(plan['sequences'])+len(plan['effects']))+
+                    ' ('+str(len(plan['sequences']))+' scene, '+str(len(plan['effects']))+' effect)')
+        return {'FINISHED'}
 
 class ActivateSecuenceCameraOperator(bpy.types.Operator):
     """Acivate sequence camera"""
@@ -389,18 +2400,16 @@ class ActivateSecuenceCameraOperator(bpy.types.Operator):
         wm = context.window_manager
         
         se = bpy.context.scene.sequence_editor
-        print(se)
         if se == None:
             return {'CANCELLED'}
         act_seq = se.active_strip
-        print(act_seq)
         if act_seq.type == 'SCENE':
 #            if is_draw_type_handling():
-#                bpy.data.objects[bpy.context.scene.camera['picture_mesh']].draw_type = 'WIRE'
+#                set_plane_draw_type(get_camera_plane(bpy.context.scene.camera), 'WIRE')
             bpy.context.scene.camera = act_seq.scene_camera
             select_single_object(bpy.context.scene.camera)
 #            if is_draw_type_handling():
-#                bpy.data.objects[act_seq.scene_camera['picture_mesh']].draw_type = 'TEXTURED'
+#                set_plane_draw_type(get_camera_plane(act_seq.scene_camera), 'TEXTURED')
             bpy.context.scene.frame_current = act_seq.frame_start+wm.ds_effect_length
         return {'FINISHED'}
     
@@ -425,14 +2434,15 @@ class ActivateNextCameraOperator(bpy.types.Operator):
         if bpy.context.scene.camera == None:
             return {'CANCELLED'}
         if is_draw_type_handling():
-            bpy.data.objects[bpy.context.scene.camera['picture_mesh']].draw_type = 'WIRE'
+            set_plane_draw_type(get_camera_plane(bpy.context.scene.camera), 'WIRE')
         next_camera = get_next_camera()
         bpy.context.scene.camera = next_camera
         set_sequence_active_for_camera(next_camera)
         select_single_object(bpy.context.scene.camera)
         
         if is_draw_type_handling():
-            bpy.data.objects[bpy.context.scene.camera['picture_mesh']].draw_type = 'TEXTURED'
+            set_plane_draw_type(get_camera_plane(bpy.context.scene.camera), 'TEXTURED')
+            reset_textured_planes()
         return {'FINISHED'}
     
     @classmethod
@@ -449,14 +2459,15 @@ class ActivatePreviousCameraOperator(bpy.types.Operator):
         if bpy.context.scene.camera == None:
             return {'CANCELLED'}
         if is_draw_type_handling():
-            bpy.data.objects[bpy.context.scene.camera['picture_mesh']].draw_type = 'WIRE'
+            set_plane_draw_type(get_camera_plane(bpy.context.scene.camera), 'WIRE')
         prev_camera = get_prev_camera()
         bpy.context.scene.camera = prev_camera
         set_sequence_active_for_camera(prev_camera)
         select_single_object(bpy.context.scene.camera)
         
         if is_draw_type_handling():
-            bpy.data.objects[bpy.context.scene.camera['picture_mesh']].draw_type = 'TEXTURED'
+            set_plane_draw_type(get_camera_plane(bpy.context.scene.camera), 'TEXTURED')
+            reset_textured_planes()
         return {'FINISHED'}
     
     @classmethod
@@ -565,44 +2576,597 @@ class ManualAddEffectsTypeOperator(bpy.types.Operator):
     bl_label = "Manual add effects"
     bl_options = {'REGISTER', 'UNDO'}
     
+    @instrumented('ManualAddEffectsTypeOperator')
     def execute(self, context):
         sequence_list = []
         effect_channel = 1
         effect_index = 0
         seq1 = None
+        effect_settings_list = get_effect_settings_list()
         for sequ in context.scene.sequence_editor.sequences:
             if sequ.select ==True and (sequ.type == 'IMAGE' or sequ.type == 'META' or sequ.type == 'SCENE' or sequ.type == 'MOVIE' or sequ.type == 'MOVIECLIP'):
                 if effect_channel <= sequ.channel:
                    effect_channel =  sequ.channel + 1
                 sequence_list.append(sequ)
         
-        print('')
-        print('')
-        for s in sequence_list:
-            print(s.name)
-            print(s.frame_final_start)
         sequence_list.sort(key=lambda sequ: sequ.frame_final_start)
-        print('')
-        print('')
-        for s in sequence_list:
-            print(s.name)
-            print(s.frame_final_start)
-            print(s.frame_final_end)
-        print('')
-        print('')
+        effect_schedule = get_scene_effect_schedule(context, max(len(sequence_list)-1, 0), effect_settings_list)
         
         for s in sequence_list:
             if seq1 != None:
                 frame_start = s.frame_final_start
                 frame_end = seq1.frame_final_end
                 if frame_start < frame_end:
-                    add_new_effect(effect_index, effect_channel, frame_start, frame_end, seq1, s)
+                    add_effect_sequence(effect_settings_list[effect_schedule[effect_index]], effect_channel, frame_start, frame_end, seq1, s)
                 
                 effect_index += 1
             seq1 = s
         
         return {'FINISHED'}
 
+@instrumented('execute_retheme_effects')
+def execute_retheme_effects(self, context):
+    """
+    Apply the current effect list and schedule to the existing slideshow effects in
+    one pass. Strips keep range and channel, only strips of another type are replaced.
+    """
+    se = context.scene.sequence_editor
+    scene_sequences, effect_sequences = get_slideshow_sequences()
+    if len(effect_sequences) == 0:
+        self.report({'ERROR'}, 'No slideshow effects found.')
+        return False
+    
+    effect_settings_list = get_effect_settings_list()
+    effect_schedule = get_scene_effect_schedule(context, len(scene_sequences)-1, effect_settings_list)
+    sequence_positions = {}
+    for i, seq in enumerate(scene_sequences):
+        sequence_positions[seq] = i
+    
+    replaced_count = 0
+    changed_count = 0
+    for seq in effect_sequences:
+        # transition i joins the strips i and i+1
+        transition_index = max(sequence_positions[seq.input_1], sequence_positions[seq.input_2]) - 1
+        if transition_index < 0:
+            continue
+        effect_settings = effect_settings_list[effect_schedule[transition_index]]
+        if seq.type != effect_settings[1]:
+            effect_channel, seq_start_frame, seq_end_frame = seq.channel, seq.frame_final_start, seq.frame_final_end
+            sequence1, sequence2 = seq.input_1, seq.input_2
+            se.sequences.remove(seq)
+            add_effect_sequence(effect_settings, effect_channel, seq_start_frame, seq_end_frame, sequence1, sequence2)
+            replaced_count += 1
+        elif set_effect_sequence_settings(seq, effect_settings):
+            changed_count += 1
+    
+    reset_sequence_index()
+    self.report({'INFO'}, 'Effects re-themed: '+str(replaced_count)+' replaced, '+str(changed_count)+' changed.')
+    return True
+
+class RethemeEffectsOperator(bpy.types.Operator):
+    """Apply the effect list to the existing slideshow effects"""
+    bl_idname = "dyn_slideshow.retheme_effects"
+    bl_label = "Re-theme effects"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        if execute_retheme_effects(self, context):
+            return {'FINISHED'}
+        else:
+            return {'CANCELLED'}
+    
+    @classmethod
+    def poll(cls, context):
+        return has_sequence()
+
+def get_effect_sequence_settings(seq):
+    """
+    return: tuple. (name, type, wipe_type, direction, blur, angle) of an effect strip, like get_effect_settings()
+    """
+    if seq.type == 'WIPE':
+        return (seq.name, seq.type, seq.transition_type, seq.direction, seq.blur_width, seq.angle)
+    return (seq.name, seq.type, None, None, 0.0, 0.0)
+
+# render settings a scene rendering the slideshow VSE takes over from the slideshow scene
+RENDER_SCENE_SETTINGS = ('resolution_x', 'resolution_y', 'resolution_percentage', 'pixel_aspect_x', 'pixel_aspect_y', 'fps', 'fps_base', 'filepath', 'use_file_extension')
+RENDER_SCENE_IMAGE_SETTINGS = ('file_format', 'color_mode', 'color_depth', 'quality', 'compression')
+RENDER_SCENE_FFMPEG_SETTINGS = ('format', 'codec', 'video_bitrate', 'gopsize', 'audio_codec', 'audio_bitrate')
+
+def copy_settings(source, target, names):
+    for name in names:
+        if hasattr(source, name):
+            setattr(target, name, getattr(source, name))
+
+def clear_sequences(scene):
+    se = scene.sequence_editor_create()
+    # effects before their inputs
+    for seq in sorted(se.sequences, key=lambda seq: seq.type == 'SCENE'):
+        se.sequences.remove(seq)
+    return se
+
+# render settings that change the rendered frames of a strip
+FRAME_CACHE_RENDER_SETTINGS = ('engine', 'resolution_x', 'resolution_y', 'resolution_percentage', 'pixel_aspect_x', 'pixel_aspect_y', 'use_antialiasing', 'antialiasing_samples', 'alpha_mode', 'use_textures', 'use_shadows')
+FRAME_CACHE_VIEW_SETTINGS = ('view_transform', 'look', 'exposure', 'gamma')
+
+def get_frame_cache_dir():
+    wm = bpy.context.window_manager
+    if wm.ds_frame_cache_dir != '':
+        cache_dir = bpy.path.abspath(wm.ds_frame_cache_dir)
+    else:
+        cache_dir = os.path.join(tempfile.gettempdir(), 'dynamic_slideshow_frames')
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def get_render_settings_key(scene):
+    """
+    return: str. The render settings of scene that change every strip
+    """
+    render_settings = [getattr(scene.render, name, None) for name in FRAME_CACHE_RENDER_SETTINGS]
+    view_settings = [getattr(scene.view_settings, name, None) for name in FRAME_CACHE_VIEW_SETTINGS]
+    return repr((render_settings, view_settings, scene.frame_start))
+
+def update_action_hash(strip_hash, action):
+    for fcurve in action.fcurves:
+        strip_hash.update(repr((fcurve.data_path, fcurve.array_index)).encode())
+        point_count = len(fcurve.keyframe_points)
+        for attr in ('co', 'handle_left', 'handle_right'):
+            if numpy != None:
+                values = numpy.empty(point_count*2, dtype=numpy.float32)
+                fcurve.keyframe_points.foreach_get(attr, values)
+                strip_hash.update(values.tobytes())
+            else:
+                values = [0.0]*(point_count*2)
+                fcurve.keyframe_points.foreach_get(attr, values)
+                strip_hash.update(struct.pack('<'+str(len(values))+'f', *values))
+
+def update_object_hash(strip_hash, obj):
+    strip_hash.update(repr((obj.name, tuple(obj.location), tuple(obj.delta_location), tuple(obj.rotation_euler), tuple(obj.scale))).encode())
+
+def get_strip_cache_key(seq, render_settings_key):
+    """
+    Content hash of everything a SCENE strip renders: its frame range, the camera with its
+    animation, the picture plane with its image files and the render settings.
+    Other objects the camera may see are not part of the key.
+    return: str
+    """
+    strip_hash = hashlib.sha1()
+    strip_hash.update(render_settings_key.encode())
+    strip_hash.update(repr((seq.frame_final_start, seq.frame_final_end, seq.frame_start, seq.animation_offset_start)).encode())
+    camera = seq.scene_camera
+    update_object_hash(strip_hash, camera)
+    camera_data = camera.data
+    strip_hash.update(repr((camera_data.type, camera_data.lens, camera_data.sensor_width, camera_data.ortho_scale, camera_data.shift_x, camera_data.shift_y, camera_data.clip_start, camera_data.clip_end)).encode())
+    action = get_camera_action(camera)
+    if action != None:
+        update_action_hash(strip_hash, action)
+    plane = get_camera_plane(camera)
+    if plane != None:
+        update_object_hash(strip_hash, plane)
+        strip_hash.update(repr(tuple(plane.dimensions)).encode())
+        for filepath in sorted(bpy.path.abspath(image.filepath) for image in get_object_images(plane)):
+            # like the metadata cache, size and time stand for the file content
+            try:
+                stat = os.stat(filepath)
+                strip_hash.update(repr((filepath, stat.st_size, stat.st_mtime)).encode())
+            except OSError:
+                strip_hash.update(filepath.encode())
+    return strip_hash.hexdigest()
+
+def get_cached_frame_path(cache_dir, key, frame):
+    # the name Blender gives frame when rendering to <key>_
+    return os.path.join(cache_dir, key+'_{:04d}.png'.format(frame))
+
+def use_cached_frames(cache_dir, key, frame_start, frame_end):
+    """
+    Mark the cached frames of a strip as recently used.
+    return: bool. False if a frame is missing
+    """
+    frame_paths = [get_cached_frame_path(cache_dir, key, frame) for frame in range(frame_start, frame_end)]
+    if not all(os.path.exists(frame_path) for frame_path in frame_paths):
+        return False
+    for frame_path in frame_paths:
+        os.utime(frame_path)
+    return True
+
+def get_cache_scene(scene):
+    """
+    return: Scene. Scene rendering single strips to the frame cache and the cached frames to the output
+    """
+    cache_scene = scene.ds_cache_scene
+    if cache_scene == None:
+        cache_scene = bpy.data.scenes.new(scene.name+'_cache')
+        scene.ds_cache_scene = cache_scene
+    copy_settings(scene.render, cache_scene.render, FRAME_CACHE_RENDER_SETTINGS)
+    copy_settings(scene.view_settings, cache_scene.view_settings, FRAME_CACHE_VIEW_SETTINGS)
+    cache_scene.render.use_sequencer = True
+    return cache_scene
+
+@instrumented('render_strip_frames')
+def render_strip_frames(cache_scene, seq, cache_dir, key):
+    """
+    Render the frames of a SCENE strip into the frame cache, with a copy of the strip.
+    """
+    clear_sequences(cache_scene)
+    cache_seq = add_scene_sequence(seq.scene_camera, seq.frame_final_start, seq.frame_final_duration, 1, cache_scene)
+    if cache_seq.animation_offset_start != seq.animation_offset_start:
+        cache_seq.animation_offset_start = seq.animation_offset_start
+        cache_seq.frame_final_duration = seq.frame_final_duration
+    cache_scene.frame_start = seq.frame_final_start
+    cache_scene.frame_end = seq.frame_final_end - 1
+    cache_scene.render.filepath = os.path.join(cache_dir, key+'_')
+    cache_scene.render.use_file_extension = True
+    cache_scene.render.image_settings.file_format = 'PNG'
+    cache_scene.render.image_settings.color_mode = 'RGB'
+    bpy.ops.render.render(animation=True, scene=cache_scene.name)
+
+@instrumented('build_cached_sequences')
+def build_cached_sequences(scene, cache_scene, scene_sequences, effect_sequences, strip_keys, cache_dir):
+    """
+    Fill the VSE of cache_scene with an IMAGE strip of cached frames for each SCENE strip
+    and copies of the effects, in the channels of the slideshow. The output settings follow scene.
+    """
+    se = clear_sequences(cache_scene)
+    image_sequences = {}
+    for seq, key in zip(scene_sequences, strip_keys):
+        frame_start, frame_end = seq.frame_final_start, seq.frame_final_end
+        image_seq = se.sequences.new_image(seq.name, get_cached_frame_path(cache_dir, key, frame_start), seq.channel, frame_start)
+        for frame in range(frame_start + 1, frame_end):
+            image_seq.elements.append(os.path.basename(get_cached_frame_path(cache_dir, key, frame)))
+        image_sequences[seq] = image_seq
+    for seq in effect_sequences:
+        add_effect_sequence(get_effect_sequence_settings(seq), seq.channel, seq.frame_final_start, seq.frame_final_end, image_sequences[seq.input_1], image_sequences[seq.input_2], cache_scene)
+    
+    cache_scene.frame_start = scene.frame_start
+    cache_scene.frame_end = scene.frame_end
+    copy_settings(scene.render, cache_scene.render, RENDER_SCENE_SETTINGS)
+    copy_settings(scene.render.image_settings, cache_scene.render.image_settings, RENDER_SCENE_IMAGE_SETTINGS)
+    if hasattr(scene.render, 'ffmpeg'):
+        copy_settings(scene.render.ffmpeg, cache_scene.render.ffmpeg, RENDER_SCENE_FFMPEG_SETTINGS)
+    # the cached frames have the view transform applied already
+    cache_scene.view_settings.view_transform = 'Default'
+    cache_scene.view_settings.look = 'None'
+    cache_scene.view_settings.exposure = 0.0
+    cache_scene.view_settings.gamma = 1.0
+
+@instrumented('execute_cached_render')
+def execute_cached_render(self, context):
+    """
+    Render only the strips without cached frames, then the output from the cached frames.
+    """
+    scene = context.scene
+    wm = context.window_manager
+    scene_sequences, effect_sequences = get_slideshow_sequences()
+    if len(scene_sequences) == 0:
+        self.report({'ERROR'}, 'No slideshow strips found.')
+        return False
+    cache_dir = get_frame_cache_dir()
+    render_settings_key = get_render_settings_key(scene)
+    strip_keys = [get_strip_cache_key(seq, render_settings_key) for seq in scene_sequences]
+    cache_scene = get_cache_scene(scene)
+    
+    rendered_count = 0
+    wm.progress_begin(0, len(scene_sequences))
+    for i, (seq, key) in enumerate(zip(scene_sequences, strip_keys)):
+        if not use_cached_frames(cache_dir, key, seq.frame_final_start, seq.frame_final_end):
+            render_strip_frames(cache_scene, seq, cache_dir, key)
+            if not use_cached_frames(cache_dir, key, seq.frame_final_start, seq.frame_final_end):
+                wm.progress_end()
+                self.report({'ERROR'}, 'Rendering failed for strip '+seq.name+'.')
+                return False
+            rendered_count += 1
+        wm.progress_update(i + 1)
+    wm.progress_end()
+    
+    build_cached_sequences(scene, cache_scene, scene_sequences, effect_sequences, strip_keys, cache_dir)
+    bpy.ops.render.render(animation=True, scene=cache_scene.name)
+    evict_cache_files(cache_dir, wm.ds_frame_cache_size * 1024 * 1024)
+    self.report({'INFO'}, 'Rendered {} of {} strips, {} from the frame cache.'.format(rendered_count, len(scene_sequences), len(scene_sequences) - rendered_count))
+    return True
+
+def get_timeline_boundaries():
+    """
+    return: list. Frames where a slideshow strip or effect starts or ends
+    """
+    scene_sequences, effect_sequences = get_slideshow_sequences()
+    boundaries = set()
+    for seq in scene_sequences + effect_sequences:
+        boundaries.add(seq.frame_final_start)
+        boundaries.add(seq.frame_final_end)
+    return sorted(boundaries)
+
+def plan_render_chunks(frame_start, frame_end, boundaries, chunk_count):
+    """
+    Split frame_start..frame_end into at most chunk_count chunks, cut at the
+    boundaries closest to an even split.
+    return: list. (frame_start, frame_end) rows, both frames included
+    """
+    cuts = sorted(boundary for boundary in set(boundaries) if frame_start < boundary <= frame_end)
+    chosen_cuts = []
+    for i in range(1, chunk_count):
+        even_cut = frame_start + (frame_end - frame_start + 1) * i / chunk_count
+        j = bisect_left(cuts, even_cut)
+        candidates = cuts[max(j-1, 0):j+1]
+        if len(candidates) == 0:
+            break
+        cut = min(candidates, key=lambda candidate: abs(candidate - even_cut))
+        if len(chosen_cuts) == 0 or cut > chosen_cuts[-1]:
+            chosen_cuts.append(cut)
+    
+    chunks = []
+    chunk_start = frame_start
+    for cut in chosen_cuts:
+        chunks.append((chunk_start, cut-1))
+        chunk_start = cut
+    chunks.append((chunk_start, frame_end))
+    return chunks
+
+class ChunkRenderJob:
+    """
+    Render the chunks of blend_path with a pool of background Blender processes.
+    update() never waits, the caller polls it from a timer or a loop.
+    output_pattern: str. Output path per chunk, formatted with the chunk index, None keeps the file's output path
+    """
+    def __init__(self, blend_path, chunks, workers, threads, output_pattern=None):
+        self.blend_path = blend_path
+        self.chunks = chunks
+        self.workers = workers
+        self.threads = threads
+        self.output_pattern = output_pattern
+        self.pending = list(enumerate(chunks))
+        self.running = {}
+        self.chunk_times = [None]*len(chunks)
+        self.failed_chunks = []
+    
+    def get_finished_count(self):
+        return len(self.chunks) - len(self.pending) - len(self.running)
+    
+    def update(self):
+        """
+        Collect finished processes and start pending chunks on the free workers.
+        return: bool. True when all chunks are finished
+        """
+        for index, (process, chunk_start_time) in list(self.running.items()):
+            if process.poll() != None:
+                self.chunk_times[index] = time.time() - chunk_start_time
+                if process.returncode != 0:
+                    self.failed_chunks.append(index)
+                del self.running[index]
+        while len(self.pending) > 0 and len(self.running) < self.workers:
+            index, (frame_start, frame_end) = self.pending.pop(0)
+            args = [bpy.app.binary_path, '-b', self.blend_path, '-t', str(self.threads)]
+            if self.output_pattern != None:
+                args += ['-o', self.output_pattern.format(index)]
+            args += ['-s', str(frame_start), '-e', str(frame_end), '-a']
+            self.running[index] = (subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL), time.time())
+        return len(self.running) == 0
+    
+    def cancel(self):
+        for index, (process, chunk_start_time) in self.running.items():
+            process.terminate()
+            process.wait()
+        self.running = {}
+        self.pending = []
+
+def join_movie_chunks(chunk_files, output_path):
+    # lossless concatenation of the chunk movies
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg == None:
+        return False
+    list_path = os.path.join(os.path.dirname(chunk_files[0]), 'chunks.txt')
+    with open(list_path, 'w') as list_file:
+        for chunk_file in chunk_files:
+            list_file.write("file '"+chunk_file.replace("'", "'\\''")+"'\n")
+    return subprocess.call([ffmpeg, '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0', '-i', list_path, '-c', 'copy', output_path]) == 0
+
+def start_parallel_render(context, workers):
+    """
+    Save a copy of the file and start rendering its chunks in the background.
+    return: dict. The 'job' to poll, finish_parallel_render() takes the dict when the job is done
+    """
+    scene = context.scene
+    workers = max(1, workers)
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    chunks = plan_render_chunks(scene.frame_start, scene.frame_end, get_timeline_boundaries(), workers*2)
+    
+    chunk_dir = tempfile.mkdtemp(prefix='dynamic_slideshow_')
+    blend_path = os.path.join(chunk_dir, 'slideshow.blend')
+    bpy.ops.wm.save_as_mainfile(filepath=blend_path, copy=True)
+    
+    # the copy in chunk_dir would resolve a relative output path next to itself
+    if scene.render.is_movie_format:
+        output_pattern = os.path.join(chunk_dir, 'chunk_{:05d}_')
+    else:
+        output_pattern = bpy.path.abspath(scene.render.filepath).replace('{', '{{').replace('}', '}}')
+    
+    job = ChunkRenderJob(blend_path, chunks, workers, threads, output_pattern)
+    job.update()
+    return {
+        'job': job,
+        'chunk_dir': chunk_dir,
+        'start_time': time.time(),
+        }
+
+def finish_parallel_render(self, context, render):
+    """
+    Join the chunk movies and remove the chunk folder of a finished render.
+    render: dict. See start_parallel_render()
+    return: bool. False if a chunk failed
+    """
+    scene = context.scene
+    job = render['job']
+    chunk_dir = render['chunk_dir']
+    render_time = time.time() - render['start_time']
+    if len(job.failed_chunks) > 0:
+        self.report({'ERROR'}, 'Rendering failed for '+str(len(job.failed_chunks))+' chunks, see '+chunk_dir)
+        return False
+    
+    if scene.render.is_movie_format:
+        chunk_files = []
+        for index in range(len(job.chunks)):
+            chunk_prefix = os.path.basename(job.output_pattern.format(index))
+            chunk_files += sorted(os.path.join(chunk_dir, file_name) for file_name in os.listdir(chunk_dir) if file_name.startswith(chunk_prefix))
+        if not join_movie_chunks(chunk_files, bpy.path.abspath(scene.render.frame_path())):
+            self.report({'WARNING'}, 'Could not join chunk movies (ffmpeg missing?), they are in '+chunk_dir)
+            return True
+    
+    # image chunks are written to the output path, the folder only holds the copy of the file
+    shutil.rmtree(chunk_dir, ignore_errors=True)
+    self.report({'INFO'}, 'Rendered {} chunks with {} workers in {:.1f} s ({:.1f} s chunk time).'.format(len(job.chunks), job.workers, render_time, sum(job.chunk_times)))
+    return True
+
+def execute_parallel_render(self, context, workers):
+    # blocking variant for the command line, the operator polls from a timer
+    render = start_parallel_render(context, workers)
+    while not render['job'].update():
+        time.sleep(0.1)
+    return finish_parallel_render(self, context, render)
+
+class UseImageProxiesOperator(bpy.types.Operator):
+    """Replace the images of the image planes with downscaled cached copies"""
+    bl_idname = "dyn_slideshow.use_image_proxies"
+    bl_label = "Use image proxies"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        wm = context.window_manager
+        max_size = get_proxy_max_size(context.scene, wm.ds_proxy_scale)
+        source_images = []
+        for image in get_plane_images():
+            source_filepath = image.get('ds_source_filepath', bpy.path.abspath(image.filepath))
+            if os.path.isfile(source_filepath):
+                source_images.append((image, source_filepath))
+        if len(source_images) == 0:
+            self.report({'INFO'}, '0 images use proxies.')
+            return {'FINISHED'}
+        
+        cache_dir = get_proxy_cache_dir(os.path.dirname(source_images[0][1]))
+        for image, source_filepath in source_images:
+            proxy_path = get_image_proxy(source_filepath, max_size, cache_dir)
+            image['ds_source_filepath'] = source_filepath
+            if image.filepath != proxy_path:
+                image.filepath = proxy_path
+        evict_image_proxies(cache_dir)
+        self.report({'INFO'}, str(len(source_images))+' images use proxies.')
+        return {'FINISHED'}
+
+class UseImageOriginalsOperator(bpy.types.Operator):
+    """Switch the images of the image planes back to their original files"""
+    bl_idname = "dyn_slideshow.use_image_originals"
+    bl_label = "Use image originals"
+    bl_options = {'REGISTER', 'UNDO'}
+    
+    def execute(self, context):
+        for image in get_plane_images():
+            if 'ds_source_filepath' in image:
+                image.filepath = image['ds_source_filepath']
+                del image['ds_source_filepath']
+        return {'FINISHED'}
+
+class CachedRenderOperator(bpy.types.Operator):
+    """Render the slideshow, strips that did not change since the last cached render come from the frame cache"""
+    bl_idname = "dyn_slideshow.cached_render"
+    bl_label = "Cached render"
+    
+    def execute(self, context):
+        if execute_cached_render(self, context):
+            return {'FINISHED'}
+        else:
+            return {'CANCELLED'}
+    
+    @classmethod
+    def poll(cls, context):
+        return has_sequence()
+
+class ParallelRenderOperator(bpy.types.Operator):
+    """Render the slideshow in chunks with several background Blender processes, Esc cancels"""
+    bl_idname = "dyn_slideshow.parallel_render"
+    bl_label = "Parallel render"
+    
+    def execute(self, context):
+        if execute_parallel_render(self, context, context.window_manager.ds_render_workers):
+            return {'FINISHED'}
+        else:
+            return {'CANCELLED'}
+    
+    def invoke(self, context, event):
+        wm = context.window_manager
+        self.render = start_parallel_render(context, wm.ds_render_workers)
+        wm.progress_begin(0, len(self.render['job'].chunks))
+        # the processes are polled on a timer, the interface stays responsive
+        self.timer = wm.event_timer_add(0.1, context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def modal(self, context, event):
+        wm = context.window_manager
+        job = self.render['job']
+        if event.type == 'ESC':
+            job.cancel()
+            wm.event_timer_remove(self.timer)
+            wm.progress_end()
+            shutil.rmtree(self.render['chunk_dir'], ignore_errors=True)
+            self.report({'WARNING'}, 'Parallel render cancelled.')
+            return {'CANCELLED'}
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+        if not job.update():
+            wm.progress_update(job.get_finished_count())
+            return {'PASS_THROUGH'}
+        
+        wm.event_timer_remove(self.timer)
+        wm.progress_end()
+        if finish_parallel_render(self, context, self.render):
+            return {'FINISHED'}
+        else:
+            return {'CANCELLED'}
+    
+    @classmethod
+    def poll(cls, context):
+        return has_sequence()
+
+class DumpInstrumentationOperator(bpy.types.Operator):
+    """Save the recorded timings as JSON or the cProfile stats"""
+    bl_idname = "dyn_slideshow.dump_instrumentation"
+    bl_label = "Save timings"
+    
+    filepath = StringProperty(subtype='FILE_PATH')
+    type = EnumProperty(
+        name="Format:",
+        items=(('JSON', 'JSON', ''),
+               ('PSTATS', 'cProfile stats', '')),
+        default='JSON',
+        )
+    
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+    
+    def execute(self, context):
+        filepath = bpy.path.abspath(self.filepath)
+        if self.type == 'PSTATS':
+            if instrumentation_profile == None:
+                self.report({'ERROR'}, 'cProfile was not enabled.')
+                return {'CANCELLED'}
+            instrumentation_profile.dump_stats(filepath)
+        else:
+            with open(filepath, 'w') as json_file:
+                json.dump(get_instrumentation_report(), json_file, indent=2, sort_keys=True)
+        return {'FINISHED'}
+
+class ResetInstrumentationOperator(bpy.types.Operator):
+    """Clear the recorded timings"""
+    bl_idname = "dyn_slideshow.reset_instrumentation"
+    bl_label = "Reset timings"
+    
+    def execute(self, context):
+        wm = context.window_manager
+        reset_instrumentation()
+        set_instrumentation(wm.ds_instrumentation, wm.ds_instrumentation_cprofile)
+        return {'FINISHED'}
+
+def update_instrumentation(self, context):
+    set_instrumentation(self.ds_instrumentation, self.ds_instrumentation_cprofile)
+
 ################ UI code
 
 class SCENE_UL_ds_effect_collection(bpy.types.UIList):
@@ -680,6 +3244,9 @@ class EffectCollection(bpy.types.PropertyGroup):
     
     angle = FloatProperty(name='Angle:', min=-1.5708, max=1.5708, subtype='ANGLE', unit='ROTATION')
 
+class SlideshowPlaneItem(bpy.types.PropertyGroup):
+    plane = PointerProperty(type=bpy.types.Object)
+
 class DynamicSlideshowPanel(bpy.types.Panel):
     """UI panel for the Remesh and Boolean buttons"""
     bl_label = "Dyn. slideshow"
@@ -696,11 +3263,31 @@ class DynamicSlideshowPanel(bpy.types.Panel):
         
         layout.operator(InitSceneOperator.bl_idname, 'Init scene')
         
+        row = layout.row(align=True)
+        row.operator(ImportImagePlanesOperator.bl_idname, 'Import images', icon='TEXTURE')
         if 'io_import_images_as_planes' in bpy.context.user_preferences.addons.keys():
-            layout.operator('import_image.to_plane', ' Images as Planes', icon='TEXTURE')
-        else:
-            layout.label("Activate 'Images as Planes'")
+            row.operator('import_image.to_plane', ' Images as Planes')
                 
+        proxy_box = layout.box()
+        if not wm.ds_expand_proxies:
+            proxy_box.prop(wm, 'ds_expand_proxies', icon='TRIA_RIGHT', icon_only=False, text='Image memory', emboss=False)
+        else:
+            proxy_box.prop(wm, 'ds_expand_proxies', icon='TRIA_DOWN', icon_only=False, text='Image memory', emboss=False)
+            proxy_box.prop(wm, 'ds_proxy_scale', text="Render size factor")
+            proxy_box.prop(wm, 'ds_proxy_cache_size', text="Cache size (MB)")
+            proxy_box.prop(wm, 'ds_proxy_cache_dir', text="")
+            row = proxy_box.row(align=True)
+            row.operator(UseImageProxiesOperator.bl_idname, 'Use proxies')
+            row.operator(UseImageOriginalsOperator.bl_idname, 'Use originals')
+            proxy_box.separator()
+            proxy_box.prop(wm, 'ds_texture_residency', text="Load images around frame only")
+            if wm.ds_texture_residency:
+                row = proxy_box.row(align=True)
+                row.prop(wm, 'ds_residency_window', text="Window")
+                row.prop(wm, 'ds_residency_prefetch', text="Prefetch")
+                proxy_box.prop(wm, 'ds_residency_thread', text="Read ahead in background")
+            proxy_box.prop(wm, 'ds_playback_interval', text="Playback update interval (ms)")
+        
         layout.separator()
         
         box = layout.box()
@@ -717,6 +3304,8 @@ class DynamicSlideshowPanel(bpy.types.Panel):
                 effect_box.prop(wm, 'ds_expand_effect', icon='TRIA_DOWN', icon_only=False, text='Effect settings', emboss=False)
                 
                 effect_box.row().prop(wm, "ds_effect_add_type", text="Effect add type", expand=True)
+                if wm.ds_effect_add_type == 'RANDOM':
+                    effect_box.prop(scene, 'ds_effect_seed', text="Seed")
                 
                 row = effect_box.row()
                 col = row.column()
@@ -748,8 +3337,22 @@ class DynamicSlideshowPanel(bpy.types.Panel):
                         effect_box.prop(selected_effect, "blur", text="Blur Width:", slider=True)
                         if selected_effect.wipe_type == 'SINGLE' or selected_effect.wipe_type == 'DOUBLE':
                             effect_box.prop(selected_effect, "angle", text="Angle")
+                effect_box.operator("dyn_slideshow.retheme_effects", icon='FILE_REFRESH')
         
-        box.operator(SetupSlideshowOperator.bl_idname, 'Setup slideshow')
+        row = box.row(align=True)
+        row.operator(SetupSlideshowOperator.bl_idname, 'Setup slideshow')
+        row.operator(DryRunSlideshowOperator.bl_idname, '', icon='INFO')
+        row = box.row(align=True)
+        row.operator(SyncSlideshowOperator.bl_idname, 'Sync slideshow')
+        row.operator(RetimeSlideshowOperator.bl_idname, 'Retime')
+        box.operator(RepackSlideshowChannelsOperator.bl_idname, 'Repack channels')
+        box.operator(AttachCamerasToPlanesOperator.bl_idname, 'Attach cameras to planes')
+        box.operator(LayoutPlanesOperator.bl_idname, 'Layout planes')
+        box.operator(KenBurnsOperator.bl_idname, 'Animate cameras')
+        row = box.row(align=True)
+        row.label('Planes: '+str(len(get_slideshow_planes())))
+        row.operator(RegisterSlideshowPlanesOperator.bl_idname, '', icon='ZOOMIN')
+        row.operator(UnregisterSlideshowPlanesOperator.bl_idname, '', icon='ZOOMOUT')
         
         layout.separator()
         
@@ -760,18 +3363,78 @@ class DynamicSlideshowPanel(bpy.types.Panel):
         col.operator(ActivatePreviousCameraOperator.bl_idname, 'Previous')
         col.operator(ActivateNextCameraOperator.bl_idname, 'Next')
         
+        layout.separator()
+        
+        layout.label('Render:')
+        row = layout.row(align=True)
+        row.prop(wm, 'ds_render_workers', text="Workers")
+        row.operator(ParallelRenderOperator.bl_idname, 'Parallel render', icon='RENDER_ANIMATION')
+        row = layout.row(align=True)
+        row.prop(wm, 'ds_frame_cache_size', text="Cache size (MB)")
+        row.operator(CachedRenderOperator.bl_idname, 'Cached render', icon='RENDER_ANIMATION')
+        layout.prop(wm, 'ds_frame_cache_dir', text="")
+        
+        layout.separator()
+        
+        profiling_box = layout.box()
+        if not wm.ds_expand_instrumentation:
+            profiling_box.prop(wm, 'ds_expand_instrumentation', icon='TRIA_RIGHT', icon_only=False, text='Profiling', emboss=False)
+        else:
+            profiling_box.prop(wm, 'ds_expand_instrumentation', icon='TRIA_DOWN', icon_only=False, text='Profiling', emboss=False)
+            row = profiling_box.row()
+            row.prop(wm, 'ds_instrumentation', text="Record timings")
+            row.prop(wm, 'ds_instrumentation_cprofile', text="cProfile")
+            
+            report = get_instrumentation_report()
+            col = profiling_box.column(align=True)
+            for name in sorted(report['sections']):
+                stats = report['sections'][name]
+                col.label('{}: {}x, {:.2f} ms avg, {:.2f} ms max'.format(name, stats['count'], stats['mean_ms'], stats['max_ms']))
+            if frame_handler_histogram != [0]*len(frame_handler_histogram):
+                col.separator()
+                col.label('Frame change handler (ms):')
+                for bucket, count in report['frame_change_handler_ms']:
+                    col.label('  '+bucket+': '+str(count))
+            
+            row = profiling_box.row(align=True)
+            row.operator(DumpInstrumentationOperator.bl_idname, 'Save JSON').type = 'JSON'
+            row.operator(DumpInstrumentationOperator.bl_idname, 'Save cProfile').type = 'PSTATS'
+            row.operator(ResetInstrumentationOperator.bl_idname, '', icon='X')
+        
 #################
 
 def register():
     bpy.utils.register_module(__name__)
     
     bpy.app.handlers.frame_change_pre.append(frame_change_handler)
+    bpy.app.handlers.load_post.append(load_post_handler)
+    bpy.app.handlers.undo_post.append(undo_post_handler)
+    bpy.app.handlers.redo_post.append(undo_post_handler)
+    bpy.app.handlers.scene_update_post.append(scene_update_handler)
+    bpy.app.handlers.render_init.append(render_init_handler)
+    bpy.app.handlers.render_complete.append(render_end_handler)
+    bpy.app.handlers.render_cancel.append(render_end_handler)
     
     bpy.types.WindowManager.ds_sequence_length = IntProperty(min = 1, default = 100, description='Sequence length without effect length')
     bpy.types.WindowManager.ds_effect_length = IntProperty(min = 0, default = 25, description='Sequence effect length, added to sequence length')
     bpy.types.WindowManager.ds_start_frame = IntProperty(min = 1, default = 1, description='Frame the first sequence starts')
     
     bpy.types.WindowManager.ds_expand_effect = BoolProperty(default=False)
+    bpy.types.WindowManager.ds_expand_proxies = BoolProperty(default=False)
+    bpy.types.WindowManager.ds_proxy_scale = FloatProperty(min = 0.1, max = 4.0, default = 1.0, description='Proxy size as multiple of the render size')
+    bpy.types.WindowManager.ds_proxy_cache_size = IntProperty(min = 1, default = 2048, description='Size cap of the proxy cache in MB, least recently used proxies no image loads are removed')
+    bpy.types.WindowManager.ds_proxy_cache_dir = StringProperty(subtype='DIR_PATH', default='', description='Folder of the proxy cache, empty for a folder next to the blend file, or next to the images while it is not saved')
+    bpy.types.WindowManager.ds_texture_residency = BoolProperty(default=False, description='Only keep the images of the strips around the current frame loaded', update=lambda self, context: reset_resident_planes())
+    bpy.types.WindowManager.ds_residency_window = IntProperty(min = 0, default = 2, description='Strips before and after the current frame with loaded images')
+    bpy.types.WindowManager.ds_residency_prefetch = IntProperty(min = 0, default = 2, description='Strips ahead of the window with images loaded in advance')
+    bpy.types.WindowManager.ds_residency_thread = BoolProperty(default=False, description='Read the image files after the prefetch window in a background thread')
+    bpy.types.WindowManager.ds_playback_interval = IntProperty(min = 0, default = 100, description='Minimum time between plane updates during playback, frames in between are skipped. 0 updates every frame')
+    bpy.types.WindowManager.ds_expand_instrumentation = BoolProperty(default=False)
+    bpy.types.WindowManager.ds_instrumentation = BoolProperty(default=False, description='Record call counts and times of the slideshow operators and handlers', update=update_instrumentation)
+    bpy.types.WindowManager.ds_instrumentation_cprofile = BoolProperty(default=False, description='Also run cProfile while recording', update=update_instrumentation)
+    bpy.types.WindowManager.ds_render_workers = IntProperty(min = 1, default = os.cpu_count() or 1, description='Background Blender processes for parallel rendering')
+    bpy.types.WindowManager.ds_frame_cache_size = IntProperty(min = 1, default = 20480, description='Size cap of the rendered frame cache in MB, least recently used frames are removed')
+    bpy.types.WindowManager.ds_frame_cache_dir = StringProperty(subtype='DIR_PATH', default='', description='Folder of the rendered frame cache, empty for a temp folder')
     
     bpy.types.WindowManager.ds_effect_add_type = EnumProperty(
         name="Effect add type",
@@ -783,24 +3446,271 @@ def register():
     bpy.types.Scene.ds_effect_types = CollectionProperty(type=EffectCollection, name='Effect types:', description='Effect list for adding to VSE.')
     
     bpy.types.Scene.ds_effect_type_index = IntProperty(name='ds_effect_type_index')
+    bpy.types.Scene.ds_effect_seed = IntProperty(name='Seed', min=0, default=0, description='Seed of the random effect order, the same seed gives the same effects')
+    bpy.types.Scene.ds_planes = CollectionProperty(type=SlideshowPlaneItem, description='Image planes of the slideshow')
+    bpy.types.Scene.ds_layout = EnumProperty(name='Layout', items=(('MANUAL', 'Manual', 'Planes placed by hand, the slideshow runs along x'),)+SLIDESHOW_LAYOUT_ITEMS, default='MANUAL')
+    bpy.types.Scene.ds_cache_scene = PointerProperty(type=bpy.types.Scene, description='Scene rendering this slideshow through the frame cache')
+    bpy.types.Object.ds_picture_plane = PointerProperty(type=bpy.types.Object, description='Image plane shown by this camera')
     
 
 def unregister():
     bpy.utils.unregister_module(__name__)
     
     bpy.app.handlers.frame_change_pre.remove(frame_change_handler)
+    bpy.app.handlers.load_post.remove(load_post_handler)
+    bpy.app.handlers.undo_post.remove(undo_post_handler)
+    bpy.app.handlers.redo_post.remove(undo_post_handler)
+    bpy.app.handlers.scene_update_post.remove(scene_update_handler)
+    bpy.app.handlers.render_init.remove(render_init_handler)
+    bpy.app.handlers.render_complete.remove(render_end_handler)
+    bpy.app.handlers.render_cancel.remove(render_end_handler)
+    shutdown_prefetch_executor()
     
     try:
         del bpy.types.WindowManager.ds_sequence_length
         del bpy.types.WindowManager.ds_effect_length
         del bpy.types.WindowManager.ds_start_frame
         del bpy.types.WindowManager.ds_expand_effect
+        del bpy.types.WindowManager.ds_expand_proxies
+        del bpy.types.WindowManager.ds_proxy_scale
+        del bpy.types.WindowManager.ds_proxy_cache_size
+        del bpy.types.WindowManager.ds_proxy_cache_dir
+        del bpy.types.WindowManager.ds_texture_residency
+        del bpy.types.WindowManager.ds_residency_window
+        del bpy.types.WindowManager.ds_residency_prefetch
+        del bpy.types.WindowManager.ds_residency_thread
+        del bpy.types.WindowManager.ds_playback_interval
+        del bpy.types.WindowManager.ds_expand_instrumentation
+        del bpy.types.WindowManager.ds_instrumentation
+        del bpy.types.WindowManager.ds_instrumentation_cprofile
+        del bpy.types.WindowManager.ds_render_workers
+        del bpy.types.WindowManager.ds_frame_cache_size
+        del bpy.types.WindowManager.ds_frame_cache_dir
         del bpy.types.WindowManager.ds_effect_add_type
         del bpy.types.Scene.ds_effect_types
         del bpy.types.Scene.ds_effect_type_index
+        del bpy.types.Scene.ds_effect_seed
+        del bpy.types.Scene.ds_planes
+        del bpy.types.Scene.ds_layout
+        del bpy.types.Scene.ds_cache_scene
+        del bpy.types.Object.ds_picture_plane
         
     except:
         pass
 
-if __name__ == "__main__":
+################# Batch build
+
+# file types loaded by the batch build
+BATCH_IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.tif', '.tiff', '.bmp', '.tga', '.exr'}
+
+class BatchReporter:
+    """Stand-in for Operator.report() outside of operators"""
+    def report(self, type, message):
+        print(', '.join(sorted(type))+': '+message)
+
+def get_image_files(image_dir):
+    image_files = []
+    for file_name in sorted(os.listdir(image_dir)):
+        if os.path.splitext(file_name)[1].lower() in BATCH_IMAGE_EXTENSIONS:
+            image_files.append(os.path.join(image_dir, file_name))
+    return image_files
+
+# shared plane meshes exist for aspect ratios rounded to this many digits
+PLANE_ASPECT_DIGITS = 2
+PLANE_TEMPLATE_MATERIAL_NAME = 'ds_plane_template'
+
+def get_plane_template_material():
+    """
+    return: Material. Shadeless material with an empty UV mapped texture slot, copied for each image
+    """
+    material = bpy.data.materials.get(PLANE_TEMPLATE_MATERIAL_NAME)
+    if material == None:
+        material = bpy.data.materials.new(PLANE_TEMPLATE_MATERIAL_NAME)
+        material.use_shadeless = True
+        texture_slot = material.texture_slots.add()
+        texture_slot.texture_coords = 'UV'
+        # kept in the file when no plane uses it
+        material.use_fake_user = True
+    return material
+
+def get_plane_mesh(aspect, template_material):
+    """
+    return: Mesh. Plane with height 1 and width aspect, shared by all planes of this aspect ratio
+    """
+    name = 'ds_plane_{:.{}f}'.format(aspect, PLANE_ASPECT_DIGITS)
+    mesh = bpy.data.meshes.get(name)
+    if mesh == None:
+        half_width = 0.5 * aspect
+        mesh = bpy.data.meshes.new(name)
+        mesh.from_pydata([(-half_width, -0.5, 0.0), (half_width, -0.5, 0.0), (half_width, 0.5, 0.0), (-half_width, 0.5, 0.0)], [], [(0, 1, 2, 3)])
+        mesh.uv_textures.new()
+        mesh.uv_layers[0].data.foreach_set('uv', (0.0, 0.0, 1.0, 0.0, 1.0, 1.0, 0.0, 1.0))
+        # the planes link their own material to this slot
+        mesh.materials.append(template_material)
+    return mesh
+
+def get_plane_templates():
+    """
+    return: dict. 'material' template and shared 'meshes' by rounded aspect ratio, for create_image_plane()
+    """
+    return {'material': get_plane_template_material(), 'meshes': {}}
+
+def create_image_plane(image, location, name, size=None, plane_templates=None):
+    """
+    Create a shadeless plane with height 1 and the aspect ratio of image. Planes of the same
+    aspect ratio share one mesh, the object linked material is a copy of the template.
+    size: tuple. Pixel size from the file header, None reads image.size, which loads the image
+    plane_templates: dict. See get_plane_templates(), reuse it for many planes
+    return: Object. The new plane, linked to the scene
+    """
+    if plane_templates == None:
+        plane_templates = get_plane_templates()
+    width, height = size if size != None else image.size
+    aspect = width / max(height, 1)
+    mesh_aspect = max(round(aspect, PLANE_ASPECT_DIGITS), 10**-PLANE_ASPECT_DIGITS)
+    if mesh_aspect not in plane_templates['meshes']:
+        plane_templates['meshes'][mesh_aspect] = get_plane_mesh(mesh_aspect, plane_templates['material'])
+    
+    texture = bpy.data.textures.new(name, 'IMAGE')
+    texture.image = image
+    material = plane_templates['material'].copy()
+    material.name = name
+    material.use_fake_user = False
+    material.texture_slots[0].texture = texture
+    
+    plane = bpy.data.objects.new(name, plane_templates['meshes'][mesh_aspect])
+    plane.location = location
+    # exact aspect ratio of the image
+    plane.scale[0] = aspect / mesh_aspect
+    plane.material_slots[0].link = 'OBJECT'
+    plane.material_slots[0].material = material
+    bpy.context.scene.objects.link(plane)
+    return plane
+
+def import_image_planes(image_files, gap=0.2, proxy_max_size=None, metadata_list=None, left_edge=None):
+    """
+    Add a plane for each image in a row along x, the first one under the camera.
+    Images are loaded one at a time and their pixels are freed again.
+    proxy_max_size: tuple. Load cached copies downscaled to this size instead of the originals
+    metadata_list: list. Header metadata per file, see scan_image_metadata(). Images with a known size are not loaded
+    left_edge: float. Start the row at this x, None centers the first plane at 0
+    return: list. The new planes
+    """
+    if proxy_max_size != None and len(image_files) > 0:
+        cache_dir = get_proxy_cache_dir(os.path.dirname(image_files[0]))
+    plane_templates = get_plane_templates()
+    planes = []
+    x = 0.0
+    last_half_width = None
+    if metadata_list == None:
+        metadata_list = [None]*len(image_files)
+    for filepath, metadata in zip(image_files, metadata_list):
+        if proxy_max_size != None:
+            image = bpy.data.images.load(get_image_proxy(filepath, proxy_max_size, cache_dir), check_existing=True)
+            image['ds_source_filepath'] = filepath
+        else:
+            image = bpy.data.images.load(filepath, check_existing=True)
+        if metadata != None and metadata['width'] and metadata['height']:
+            # the proxy has the aspect ratio of the original
+            width, height = metadata['width'], metadata['height']
+        else:
+            width, height = image.size
+        half_width = 0.5 * width / max(height, 1)
+        if last_half_width != None:
+            x += last_half_width + gap + half_width
+        elif left_edge != None:
+            x = left_edge + half_width
+        planes.append(create_image_plane(image, (x, 0.0, 0.0), os.path.splitext(os.path.basename(filepath))[0], (width, height), plane_templates))
+        image.buffers_free()
+        last_half_width = half_width
+    if proxy_max_size != None and len(image_files) > 0:
+        evict_image_proxies(cache_dir)
+    return planes
+
+def build_slideshow(image_dir, output_path, sequence_length, effect_length, start_frame=1, proxy_scale=0.0, order='NAME', layout='LINE', ken_burns=None, seed=0):
+    """
+    Build and save a slideshow of the images in image_dir without UI context.
+    proxy_scale: float. Use proxies of this multiple of the render size, 0 for the original images
+    order: str. 'NAME' or 'TIME' for capture time order
+    layout: str. Plane layout, see SLIDESHOW_LAYOUT_ITEMS
+    ken_burns: str. Camera motion, see KEN_BURNS_MOTION_ITEMS, None keeps the template camera animation
+    seed: int. Seed of the random camera motions
+    return: bool. True if the slideshow was saved
+    """
+    context = bpy.context
+    reporter = BatchReporter()
+    wm = context.window_manager
+    wm.ds_sequence_length = sequence_length
+    wm.ds_effect_length = effect_length
+    wm.ds_start_frame = start_frame
+    proxy_max_size = None
+    if proxy_scale > 0:
+        proxy_max_size = get_proxy_max_size(context.scene, proxy_scale)
+    
+    images = {}
+    def scan_images():
+        image_files = get_image_files(image_dir)
+        metadata_list = scan_image_metadata(image_files)
+        if order == 'TIME':
+            sorted_images = sort_image_files_by_time(image_files, metadata_list)
+            image_files = [filepath for filepath, metadata in sorted_images]
+            metadata_list = [metadata for filepath, metadata in sorted_images]
+        images['files'] = image_files
+        images['metadata'] = metadata_list
+        return len(image_files) > 0
+    
+    stages = [
+        ('init scene', lambda: init_scene(context.scene) != None),
+        ('scan images', scan_images),
+        ('import images', lambda: register_slideshow_planes(context.scene, import_image_planes(images['files'], proxy_max_size=proxy_max_size, metadata_list=images['metadata'])) > 0),
+        ('layout planes', lambda: layout_slideshow_planes(get_slideshow_planes(), layout) == None),
+        ('setup materials', lambda: execute_setup_materials(reporter, context)),
+        ('setup cameras', lambda: execute_setup_cameras(reporter, context)),
+        ('setup sequences', lambda: execute_init_sequences(reporter, context)),
+        ]
+    if ken_burns != None:
+        stages.append(('animate cameras', lambda: animate_ken_burns(context, get_camera_navigation()['cameras'], ken_burns, seed=seed) > 0))
+    stages += [
+        ('save', lambda: 'FINISHED' in bpy.ops.wm.save_as_mainfile(filepath=os.path.abspath(output_path))),
+        ]
+    build_start = time.time()
+    for stage_name, stage in stages:
+        stage_start = time.time()
+        result = stage()
+        print('Dynamic Slideshow: '+stage_name+' {:.3f} s'.format(time.time() - stage_start))
+        if not result:
+            reporter.report({'ERROR'}, 'Batch build failed at stage: '+stage_name)
+            return False
+    print('Dynamic Slideshow: total {:.3f} s'.format(time.time() - build_start))
+    return True
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='blender -b -P dynamic_slideshow.py --', description='Build a slideshow from an image folder.')
+    parser.add_argument('--images', required=True, help='folder with the images')
+    parser.add_argument('--order', choices=['name', 'time'], default='name', help='add the images in file name or capture time order')
+    parser.add_argument('--layout', choices=[item[0].lower() for item in SLIDESHOW_LAYOUT_ITEMS], default='line', help='arrangement of the image planes')
+    parser.add_argument('--ken-burns', choices=[item[0].lower() for item in KEN_BURNS_MOTION_ITEMS], help='animate every camera with pan and zoom over its picture')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random camera motions')
+    parser.add_argument('--length', type=int, default=100, help='sequence length without effect length')
+    parser.add_argument('--effect-length', type=int, default=25, help='sequence effect length')
+    parser.add_argument('--start-frame', type=int, default=1, help='frame the first sequence starts')
+    parser.add_argument('--out', required=True, help='.blend file to save')
+    parser.add_argument('--proxy-scale', type=float, default=0.0, help='use cached proxies of this multiple of the render size instead of the original images')
+    parser.add_argument('--render-workers', type=int, default=0, help='render the slideshow with this many background processes after saving')
+    parser.add_argument('--cached-render', action='store_true', help='render the slideshow after saving, strips unchanged since the last cached render come from the frame cache')
+    args = parser.parse_args(argv)
+    
     register()
+    if not build_slideshow(args.images, args.out, args.length, args.effect_length, args.start_frame, args.proxy_scale, args.order.upper(), args.layout.upper(),
+                           args.ken_burns.upper() if args.ken_burns != None else None, args.seed):
+        sys.exit(1)
+    if args.render_workers > 0 and not execute_parallel_render(BatchReporter(), bpy.context, args.render_workers):
+        sys.exit(1)
+    if args.cached_render and not execute_cached_render(BatchReporter(), bpy.context):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    if '--' in sys.argv:
+        main(sys.argv[sys.argv.index('--')+1:])
+    else:
+        register()
@@ -0,0 +1,9 @@
+"""
+The tests run dynamic_slideshow.py against the in-memory bpy stand-in of the
+benchmarks, importing run_benchmarks installs it before the add-on is loaded.
+"""
+import os, sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import run_benchmarks
@@ -0,0 +1,78 @@
+"""
+Cached camera order and plane registry against the in-memory bpy stand-in:
+
+    python -m pytest tests
+"""
+import fake_bpy
+import run_benchmarks
+ds = run_benchmarks.ds
+
+
+def update_cameras(scene, cameras):
+    fake_bpy.data.objects.is_updated = True
+    for cam in cameras:
+        cam.is_updated = True
+    ds.scene_update_handler(scene)
+    fake_bpy.data.objects.is_updated = False
+    for cam in cameras:
+        cam.is_updated = False
+
+def test_playback_keeps_the_navigation_index():
+    context = run_benchmarks.new_setup_slideshow(5)
+    scene = context.scene
+    navigation = ds.get_camera_navigation()
+    # the actions move every camera far along x on each frame
+    for cam in navigation['cameras']:
+        cam.location.x += 10000.0
+    scene.objects.active = navigation['cameras'][0]
+    update_cameras(scene, navigation['cameras'])
+    assert ds.get_camera_navigation() is navigation
+
+def test_moved_cameras_change_the_order():
+    context = run_benchmarks.new_setup_slideshow(5)
+    scene = context.scene
+    cameras = ds.get_camera_navigation()['cameras']
+    # two selected cameras moved, neither of them active
+    scene.objects.active = cameras[2]
+    cameras[0].delta_location.x = cameras[-1].delta_location.x + 1.0
+    cameras[1].delta_location.x = cameras[-1].delta_location.x + 2.0
+    update_cameras(scene, cameras[:2])
+    assert ds.get_camera_navigation()['cameras'][-2:] == cameras[:2]
+
+def test_renamed_camera_keeps_its_position():
+    context = run_benchmarks.new_setup_slideshow(5)
+    cameras = ds.get_camera_navigation()['cameras']
+    context.scene.camera = cameras[1]
+    cameras[1].name = 'Renamed'
+    assert ds.get_next_camera() == cameras[2]
+    assert ds.get_prev_camera() == cameras[0]
+
+def test_animated_cameras_are_ordered_by_their_keys():
+    context = run_benchmarks.new_context()
+    scene = context.scene
+    cameras = [run_benchmarks.add_camera(scene) for i in range(3)]
+    # placed by hand: same delta_location, the location keys differ
+    for cam, x in zip(cameras, (5.0, -5.0, 0.0)):
+        keyframe_points = cam.animation_data.action.fcurves[0].keyframe_points
+        keyframe_points.foreach_set('co', [value for k in range(len(keyframe_points)) for value in (k*25.0 + 1.0, x)])
+        cam.location.x = 100.0 - x
+    assert ds.get_sorted_scene_cameras_list() == [cameras[1], cameras[2], cameras[0]]
+
+def test_deleted_plane_leaves_the_registry():
+    context = run_benchmarks.new_setup_slideshow(5)
+    planes = ds.get_slideshow_planes()
+    plane = planes[2]
+    # scene_update_post runs after the setup added the cameras
+    update_cameras(context.scene, [])
+    # deleted in the viewport, the object stays in bpy.data until it is saved
+    context.scene.objects.unlink(plane)
+    update_cameras(context.scene, [])
+    assert plane not in ds.get_slideshow_planes()
+    assert len(ds.get_slideshow_planes()) == len(planes) - 1
+
+def test_added_object_keeps_the_registry():
+    context = run_benchmarks.new_setup_slideshow(5)
+    registry = ds.get_plane_registry()
+    context.scene.objects.link(fake_bpy.data.objects.new('Empty', None))
+    update_cameras(context.scene, [])
+    assert ds.get_plane_registry() is registry
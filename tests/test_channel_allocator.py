@@ -0,0 +1,118 @@
+"""
+VSE channel allocation and the slideshow timeline plan:
+
+    python -m pytest tests
+"""
+import run_benchmarks
+ds = run_benchmarks.ds
+
+EFFECT_SETTINGS_LIST = [ds.DEFAULT_EFFECT_SETTINGS]
+
+
+def get_original_timeline(camera_count, start_frame, sequence_length, effect_length):
+    """
+    The timeline of the first add-on version, strips alternate between two
+    channels of an empty VSE with the effects in the channel above.
+    return: tuple. (frame_end, (frame_start, duration, channel) per strip, (frame_start, frame_end, channel) per effect)
+    """
+    sequences = []
+    effects = []
+    for sequence_index in range(camera_count):
+        effect_index = max(sequence_index-1, 0)
+        seq_start_frame = start_frame + sequence_index*sequence_length + effect_index*effect_length
+        duration = sequence_length + (1 if sequence_index == 0 else 2)*effect_length
+        if sequence_index == camera_count-1:
+            duration = duration - effect_length + 1
+        sequences.append((seq_start_frame, duration, 1 + sequence_index%2))
+        if sequence_index > 0 and effect_length > 0:
+            effects.append((seq_start_frame, seq_start_frame + effect_length, 3))
+    frame_end = start_frame + camera_count*sequence_length + (camera_count-1)*effect_length
+    return frame_end, sequences, effects
+
+def fill_channels(allocator, frame_start, frame_end):
+    for channel in range(1, ds.MAX_VSE_CHANNEL+1):
+        allocator.add(channel, frame_start, frame_end)
+
+def test_allocate_takes_the_lowest_free_channel():
+    allocator = ds.ChannelAllocator()
+    assert allocator.allocate(1, 11) == 1
+    assert allocator.allocate(5, 15) == 2
+    # frame_end is exclusive, touching ranges share a channel
+    assert allocator.allocate(11, 21) == 1
+    assert allocator.allocate(1, 5, min_channel=3) == 3
+
+def test_allocate_reuses_freed_channels():
+    allocator = ds.ChannelAllocator()
+    for i in range(3):
+        allocator.allocate(1, 11)
+    assert allocator.remove(2, 1, 11)
+    assert not allocator.remove(2, 1, 11)
+    assert allocator.is_free(2, 1, 11)
+    assert allocator.allocate(1, 11) == 2
+    assert allocator.allocate(1, 11) == 4
+
+def test_add_all_keeps_the_ranges_sorted():
+    allocator = ds.ChannelAllocator()
+    allocator.add_all([(1, 30, 40), (1, 1, 10), (1, 15, 20)])
+    assert allocator.channels[1] == ([1, 15, 30], [10, 20, 40])
+    assert allocator.is_free(1, 10, 15)
+    assert not allocator.is_free(1, 19, 21)
+
+def test_no_free_channel():
+    allocator = ds.ChannelAllocator()
+    fill_channels(allocator, 1, 101)
+    assert allocator.find_free_channel(50, 60) == None
+    assert allocator.allocate(50, 60) == None
+    assert allocator.allocate(101, 110) == 1
+    assert allocator.allocate(101, 110, min_channel=ds.MAX_VSE_CHANNEL+1) == None
+
+def test_plan_matches_the_original_timeline():
+    for camera_count in (1, 2, 3, 6):
+        for sequence_length, effect_length in ((100, 25), (50, 1), (10, 30)):
+            plan = ds.plan_slideshow(camera_count, 7, sequence_length, effect_length, EFFECT_SETTINGS_LIST)
+            frame_end, sequences, effects = get_original_timeline(camera_count, 7, sequence_length, effect_length)
+            assert plan['frame_end'] == frame_end
+            assert plan['sequences'] == sequences
+            assert [effect[:3] for effect in plan['effects']] == effects
+
+def test_plan_without_effects_keeps_one_channel():
+    # strips without effects do not overlap, the original version still alternated
+    plan = ds.plan_slideshow(4, 7, 50, 0, EFFECT_SETTINGS_LIST)
+    frame_end, sequences, effects = get_original_timeline(4, 7, 50, 0)
+    assert plan['frame_end'] == frame_end
+    assert plan['sequences'] == [(frame_start, duration, 1) for frame_start, duration, channel in sequences]
+    assert plan['effects'] == []
+
+def test_plan_effects_cover_the_overlap_of_their_strips():
+    sequence_lengths = [40, 100, 10, 60]
+    plan = ds.plan_slideshow(4, 1, 100, 20, EFFECT_SETTINGS_LIST, sequence_lengths=sequence_lengths)
+    sequences = plan['sequences']
+    for frame_start, frame_end, channel, sequence1, sequence2, effect_settings in plan['effects']:
+        assert frame_start == sequences[sequence2][0]
+        assert frame_end == sequences[sequence1][0] + sequences[sequence1][1]
+        assert channel > max(sequences[sequence1][2], sequences[sequence2][2])
+    # each strip is shown alone for its own length
+    assert [duration for frame_start, duration, channel in sequences] == [60, 140, 50, 81]
+    assert plan['frame_end'] == 1 + sum(sequence_lengths) + 3*20
+
+def test_plan_places_strips_around_existing_ones():
+    allocator = ds.ChannelAllocator()
+    allocator.add(1, 1, 1000)
+    plan = ds.plan_slideshow(3, 1, 100, 25, EFFECT_SETTINGS_LIST, allocator=allocator)
+    assert [channel for frame_start, duration, channel in plan['sequences']] == [2, 3, 2]
+    assert [effect[2] for effect in plan['effects']] == [4, 4]
+    # the planned ranges are taken
+    assert not allocator.is_free(2, 1, 10)
+
+def test_plan_without_cameras_or_free_channels():
+    assert ds.plan_slideshow(0, 5, 100, 25, EFFECT_SETTINGS_LIST) == {'frame_end': 5, 'sequences': [], 'effects': []}
+
+    allocator = ds.ChannelAllocator()
+    fill_channels(allocator, 1, 1000)
+    assert ds.plan_slideshow(2, 1, 100, 25, EFFECT_SETTINGS_LIST, allocator=allocator) == None
+
+    # strips fit, the effect above channel 31 and 32 does not
+    allocator = ds.ChannelAllocator()
+    for channel in range(1, ds.MAX_VSE_CHANNEL-1):
+        allocator.add(channel, 1, 1000)
+    assert ds.plan_slideshow(2, 1, 100, 25, EFFECT_SETTINGS_LIST, allocator=allocator) == None
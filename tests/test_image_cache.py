@@ -0,0 +1,80 @@
+"""
+Proxy cache location, eviction and hashing against the in-memory bpy stand-in:
+
+    python -m pytest tests
+"""
+import os, struct
+
+import fake_bpy
+import run_benchmarks
+ds = run_benchmarks.ds
+
+
+def test_eviction_keeps_the_image_metadata(tmpdir):
+    cache_dir = str(tmpdir)
+    metadata_path = os.path.join(cache_dir, ds.IMAGE_METADATA_CACHE_NAME)
+    with open(metadata_path, 'w') as metadata_file:
+        metadata_file.write('{}' + ' '*1000)
+    # the oldest file of the folder
+    os.utime(metadata_path, (0, 0))
+    for i in range(3):
+        with open(os.path.join(cache_dir, 'proxy_{}.jpg'.format(i)), 'wb') as proxy_file:
+            proxy_file.write(b'\0'*1000)
+    
+    assert ds.evict_cache_files(cache_dir, 1500, {ds.IMAGE_METADATA_CACHE_NAME}) == 2
+    assert os.path.exists(metadata_path)
+
+def write_png(filepath, width=4, height=4):
+    # header only, the stand-in reads the size from it
+    with open(filepath, 'wb') as png_file:
+        png_file.write(b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + struct.pack('>II', width, height))
+
+def test_file_hash_is_read_again_only_after_a_change(tmpdir, monkeypatch):
+    filepath = str(tmpdir.join('image.png'))
+    write_png(filepath)
+    file_hash = ds.get_file_hash(filepath)
+    monkeypatch.setattr(ds.hashlib, 'sha1', None)
+    assert ds.get_file_hash(filepath) == file_hash
+    
+    monkeypatch.undo()
+    # the size changes, two writes can fall into the same mtime
+    with open(filepath, 'ab') as png_file:
+        png_file.write(b'\0')
+    assert ds.get_file_hash(filepath) != file_hash
+
+def test_proxies_are_kept_next_to_the_blend_file_or_the_images(tmpdir, monkeypatch):
+    run_benchmarks.new_context()
+    monkeypatch.setattr(fake_bpy.window_manager, 'ds_proxy_cache_dir', '')
+    image_dir = str(tmpdir.mkdir('images'))
+    assert ds.get_proxy_cache_dir(image_dir) == os.path.join(image_dir, ds.PROXY_DIR_NAME)
+    
+    monkeypatch.setattr(fake_bpy.data, 'filepath', str(tmpdir.join('slideshow.blend')))
+    assert ds.get_proxy_cache_dir(image_dir) == str(tmpdir.join(ds.PROXY_DIR_NAME))
+
+def test_eviction_keeps_the_proxies_in_use(tmpdir, monkeypatch):
+    context = run_benchmarks.new_context()
+    cache_dir = str(tmpdir.mkdir('proxies'))
+    monkeypatch.setattr(context.window_manager, 'ds_proxy_cache_dir', cache_dir)
+    monkeypatch.setattr(context.window_manager, 'ds_proxy_cache_size', 0)
+    image_path = str(tmpdir.join('image.png'))
+    write_png(image_path)
+    proxy_path = ds.get_image_proxy(image_path, (100, 100), cache_dir)
+    unused_proxy_path = os.path.join(cache_dir, 'unused.png')
+    write_png(unused_proxy_path)
+    image = fake_bpy.data.images.load(proxy_path)
+    image['ds_source_filepath'] = image_path
+    
+    assert ds.evict_image_proxies(cache_dir) == 1
+    assert os.path.exists(proxy_path)
+    assert not os.path.exists(unused_proxy_path)
+
+def test_images_of_missing_proxies_load_the_originals(tmpdir):
+    run_benchmarks.new_context()
+    image_path = str(tmpdir.join('image.png'))
+    write_png(image_path)
+    image = fake_bpy.data.images.load(str(tmpdir.join('evicted_proxy.png')))
+    image['ds_source_filepath'] = image_path
+    
+    ds.load_post_handler(None)
+    assert image.filepath == image_path
+    assert 'ds_source_filepath' not in image
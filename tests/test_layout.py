@@ -0,0 +1,67 @@
+"""
+Plane layouts, with numpy and with the plain python fallback:
+
+    python -m pytest tests
+"""
+import pytest
+
+import run_benchmarks
+ds = run_benchmarks.ds
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def math_backend(request, monkeypatch):
+    if request.param == 'numpy' and ds.numpy == None:
+        pytest.skip('numpy is not installed')
+    if request.param == 'python':
+        monkeypatch.setattr(ds, 'numpy', None)
+    return request.param
+
+def get_cells(x, y, cell_width, cell_height):
+    return [(round(cx / cell_width), round(cy / cell_height)) for cx, cy in zip(x, y)]
+
+def test_spiral_cells_of_the_first_rings(math_backend):
+    x, y = ds.get_spiral_cells(10)
+    assert list(zip(x, y)) == [(0, 0), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1), (2, -1)]
+
+def test_spiral_cells_touch_and_never_repeat(math_backend):
+    x, y = ds.get_spiral_cells(200)
+    cells = list(zip(x, y))
+    assert len(set(cells)) == 200
+    for (x1, y1), (x2, y2) in zip(cells, cells[1:]):
+        assert abs(x2 - x1) + abs(y2 - y1) == 1
+
+def test_spiral_cells_of_no_and_one_plane(math_backend):
+    assert ds.get_spiral_cells(0) == ([], [])
+    assert ds.get_spiral_cells(1) == ([0], [0])
+
+def test_line_places_planes_edge_to_edge(math_backend):
+    x, y = ds.compute_layout([1.0, 2.0, 3.0], [1.0, 1.0, 1.0], 'LINE', gap=0.5)
+    assert x == pytest.approx([0.0, 2.0, 5.0])
+    assert y == [0.0, 0.0, 0.0]
+
+@pytest.mark.parametrize('layout', ['LINE', 'GRID', 'SERPENTINE', 'SPIRAL'])
+def test_layout_of_no_and_one_plane(math_backend, layout):
+    assert ds.compute_layout([], [], layout) == ([], [])
+    x, y = ds.compute_layout([1.5], [1.0], layout)
+    assert x == pytest.approx([0.0])
+    assert y == pytest.approx([0.0])
+
+def test_grid_of_a_non_square_count(math_backend):
+    # 5 planes fill 3 columns, rows run down from the first plane
+    x, y = ds.compute_layout([1.0]*5, [1.0]*5, 'GRID', gap=1.0)
+    assert get_cells(x, y, 2.0, 2.0) == [(0, 0), (1, 0), (2, 0), (0, -1), (1, -1)]
+
+def test_serpentine_reverses_every_second_row(math_backend):
+    x, y = ds.compute_layout([1.0]*7, [1.0]*7, 'SERPENTINE', gap=1.0)
+    assert get_cells(x, y, 2.0, 2.0) == [(0, 0), (1, 0), (2, 0), (2, -1), (1, -1), (0, -1), (0, -2)]
+
+def test_grid_with_fixed_columns_uses_the_largest_plane(math_backend):
+    x, y = ds.compute_layout([1.0, 3.0, 1.0], [1.0, 1.0, 2.0], 'GRID', gap=0.5, columns=2)
+    assert x == pytest.approx([0.0, 3.5, 0.0])
+    assert y == pytest.approx([0.0, 0.0, -2.5])
+
+def test_spiral_layout_uses_the_largest_plane(math_backend):
+    x, y = ds.compute_layout([1.0, 2.0, 1.0], [1.0, 1.0, 3.0], 'SPIRAL', gap=1.0)
+    assert get_cells(x, y, 3.0, 4.0) == [(0, 0), (1, 0), (1, 1)]
+    assert x == pytest.approx([0.0, 3.0, 3.0])
@@ -0,0 +1,49 @@
+"""
+Chunk rendering with background processes, python runs a script in place of Blender:
+
+    python -m pytest tests
+"""
+import sys, time
+
+import fake_bpy
+import run_benchmarks
+ds = run_benchmarks.ds
+
+# called like blender -b <file> -t <threads> -s <frame_start> -e <frame_end> -a, fails the chunk starting at frame 6
+RENDER_SCRIPT = """
+import sys, time
+time.sleep(0.2)
+sys.exit(1 if sys.argv[sys.argv.index('-s')+1] == '6' else 0)
+"""
+
+def test_chunk_render_job_polls_without_waiting(tmpdir, monkeypatch):
+    script_path = str(tmpdir.join('render.py'))
+    with open(script_path, 'w') as script_file:
+        script_file.write(RENDER_SCRIPT)
+    # python -b runs the script like blender -b loads the file
+    monkeypatch.setattr(fake_bpy.bpy_module.app, 'binary_path', sys.executable)
+    job = ds.ChunkRenderJob(script_path, [(1, 5), (6, 10), (11, 15)], 2, 1)
+
+    update_start_time = time.time()
+    assert not job.update()
+    assert time.time() - update_start_time < 0.2
+    assert len(job.running) == 2
+    while not job.update():
+        assert len(job.running) <= 2
+        time.sleep(0.05)
+    assert job.get_finished_count() == 3
+    assert job.failed_chunks == [1]
+    assert all(chunk_time >= 0.2 for chunk_time in job.chunk_times)
+
+def test_cancel_stops_the_running_chunks(tmpdir, monkeypatch):
+    script_path = str(tmpdir.join('render.py'))
+    with open(script_path, 'w') as script_file:
+        script_file.write('import time\ntime.sleep(30)\n')
+    monkeypatch.setattr(fake_bpy.bpy_module.app, 'binary_path', sys.executable)
+    job = ds.ChunkRenderJob(script_path, [(1, 5), (6, 10), (11, 15)], 2, 1)
+    job.update()
+    processes = [process for process, chunk_start_time in job.running.values()]
+
+    job.cancel()
+    assert all(process.returncode != None for process in processes)
+    assert job.update()
@@ -0,0 +1,23 @@
+"""
+Frame to strip lookup of the sequence index against the in-memory bpy stand-in:
+
+    python -m pytest tests
+"""
+import run_benchmarks
+ds = run_benchmarks.ds
+
+
+def test_strip_moved_into_the_frame_is_found():
+    context = run_benchmarks.new_setup_slideshow(10)
+    scene = context.scene
+    scene_sequences = ds.get_slideshow_sequences()[0]
+    scene.sequence_editor.active_strip = scene_sequences[0]
+    assert ds.get_sequences_for_frame(10) == [scene_sequences[0]]
+    
+    # the moved strip is neither active nor in the window the index checks
+    seq = scene_sequences[-1]
+    seq.channel = 10
+    seq.frame_start = 1
+    ds.last_sequence_check_time = 0.0
+    ds.scene_update_handler(scene)
+    assert seq in ds.get_sequences_for_frame(10)
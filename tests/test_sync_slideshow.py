@@ -0,0 +1,146 @@
+"""
+Slideshow setup, sync and retime against the in-memory bpy stand-in:
+
+    python -m pytest tests
+"""
+import fake_bpy
+import run_benchmarks
+ds = run_benchmarks.ds
+
+
+def get_first_key_offsets(cameras):
+    # first location key relative to the frame the action was moved to
+    return set(cam.animation_data.action.fcurves[0].keyframe_points.values['co'][0] - cam['ds_action_offset'] for cam in cameras)
+
+def assert_consistent_slideshow(context):
+    scene_sequences, effect_sequences = ds.get_slideshow_sequences()
+    cameras = ds.get_camera_navigation()['cameras']
+    assert [seq.scene_camera for seq in scene_sequences] == cameras
+
+    plan = ds.get_slideshow_plan(context, len(cameras), allocator=ds.ChannelAllocator())
+    for seq, (seq_start_frame, duration, seq_channel) in zip(scene_sequences, plan['sequences']):
+        assert (seq.frame_final_start, seq.frame_final_duration) == (seq_start_frame, duration)
+        assert seq.scene_camera['ds_action_offset'] == seq_start_frame
+    assert len(get_first_key_offsets(cameras)) == 1
+
+    # one effect per neighbour pair, above both of its strips
+    assert len(effect_sequences) == len(cameras) - 1
+    for seq in effect_sequences:
+        assert seq.channel > max(seq.input_1.channel, seq.input_2.channel)
+
+    ranges = {}
+    for seq in context.scene.sequence_editor.sequences:
+        for frame_start, frame_end in ranges.get(seq.channel, []):
+            assert seq.frame_final_end <= frame_start or frame_end <= seq.frame_final_start
+        ranges.setdefault(seq.channel, []).append((seq.frame_final_start, seq.frame_final_end))
+
+def sync(context):
+    operator = ds.SyncSlideshowOperator()
+    return operator.execute(context), operator.reports
+
+def test_sync_after_removing_a_middle_camera():
+    context = run_benchmarks.new_setup_slideshow(10)
+    camera = ds.get_camera_navigation()['cameras'][3]
+    context.scene.objects.unlink(camera)
+
+    result, reports = sync(context)
+    assert result == {'FINISHED'}, reports
+    assert camera not in [seq.scene_camera for seq in ds.get_slideshow_sequences()[0]]
+    assert_consistent_slideshow(context)
+
+def test_sync_after_swapping_two_cameras():
+    context = run_benchmarks.new_setup_slideshow(5)
+    cameras = ds.get_camera_navigation()['cameras']
+    camera_1, camera_3 = cameras[1], cameras[3]
+    camera_1.delta_location, camera_3.delta_location = camera_3.delta_location.copy(), camera_1.delta_location.copy()
+
+    result, reports = sync(context)
+    assert result == {'FINISHED'}, reports
+    assert ds.get_camera_navigation()['cameras'][1] == camera_3
+    assert_consistent_slideshow(context)
+
+def test_sync_after_moving_cameras_that_are_not_active():
+    context = run_benchmarks.new_setup_slideshow(5)
+    cameras = ds.get_camera_navigation()['cameras']
+    context.scene.objects.active = cameras[0]
+    camera_1, camera_3 = cameras[1], cameras[3]
+    camera_1.delta_location, camera_3.delta_location = camera_3.delta_location.copy(), camera_1.delta_location.copy()
+    
+    result, reports = sync(context)
+    assert result == {'FINISHED'}, reports
+    assert [seq.scene_camera for seq in ds.get_slideshow_sequences()[0]] == ds.get_sorted_scene_cameras_list()
+    assert ds.get_slideshow_sequences()[0][1].scene_camera == camera_3
+    assert_consistent_slideshow(context)
+
+def test_sync_failure_leaves_the_slideshow_unchanged():
+    context = run_benchmarks.new_setup_slideshow(10)
+    se = context.scene.sequence_editor
+    before = sorted((seq.name, seq.channel, seq.frame_final_start, seq.frame_final_end) for seq in se.sequences)
+    offsets = dict((cam.name, cam['ds_action_offset']) for cam in ds.get_camera_navigation()['cameras'])
+    context.scene.objects.unlink(ds.get_camera_navigation()['cameras'][3])
+    # no channel is left for a strip to move through
+    for channel in range(4, ds.MAX_VSE_CHANNEL + 1):
+        se.sequences.new_effect('blocker', 'COLOR', channel, 1, 100000)
+
+    result, reports = sync(context)
+    assert result == {'CANCELLED'}
+    after = sorted((seq.name, seq.channel, seq.frame_final_start, seq.frame_final_end) for seq in se.sequences if seq.name != 'blocker')
+    assert after == before
+    for cam in ds.get_camera_navigation()['cameras']:
+        assert cam['ds_action_offset'] == offsets[cam.name]
+
+def test_retime_keeps_effects_above_their_strips():
+    context = run_benchmarks.new_setup_slideshow(10)
+    operator = ds.RetimeSlideshowOperator()
+    assert ds.execute_retime_slideshow(operator, context, 60, 40, False), operator.reports
+    context.window_manager.ds_sequence_length = 60
+    context.window_manager.ds_effect_length = 40
+    assert_consistent_slideshow(context)
+
+def test_retime_failure_keeps_the_effects():
+    context = run_benchmarks.new_setup_slideshow(10)
+    se = context.scene.sequence_editor
+    effect_count = len(ds.get_slideshow_sequences()[1])
+    offsets = dict((cam.name, cam['ds_action_offset']) for cam in ds.get_camera_navigation()['cameras'])
+    for channel in range(1, ds.MAX_VSE_CHANNEL + 1):
+        se.sequences.new_effect('blocker', 'COLOR', channel, 100000, 200000)
+    # longer strips end behind the blockers
+    operator = ds.RetimeSlideshowOperator()
+    assert not ds.execute_retime_slideshow(operator, context, 100000, 0, False)
+    assert len(ds.get_slideshow_sequences()[1]) == effect_count
+    for cam in ds.get_camera_navigation()['cameras']:
+        assert cam['ds_action_offset'] == offsets[cam.name]
+
+def test_dry_run_without_cameras():
+    context = run_benchmarks.new_context()
+    assert ds.plan_slideshow(0, 1, 100, 25, ds.get_effect_settings_list())['frame_end'] == 1
+    operator = ds.DryRunSlideshowOperator()
+    assert operator.execute(context) == {'CANCELLED'}
+
+def test_init_scene_keeps_objects_of_other_scenes():
+    context = run_benchmarks.new_context()
+    scene = context.scene
+    other_scene = fake_bpy.data.scenes.new('Other')
+    shared_plane = fake_bpy.data.objects.new('Shared', fake_bpy.data.meshes.new('Shared'))
+    plane = fake_bpy.data.objects.new('Plane', fake_bpy.data.meshes.new('Plane'))
+    scene.objects.link(shared_plane)
+    other_scene.objects.link(shared_plane)
+    scene.objects.link(plane)
+    
+    ds.init_scene(scene)
+    assert shared_plane not in scene.objects
+    assert shared_plane in other_scene.objects
+    assert fake_bpy.data.objects.get('Shared') == shared_plane
+    assert fake_bpy.data.objects.get('Plane') == None
+
+def test_retime_with_camera_lengths_keeps_the_channels():
+    context = run_benchmarks.new_setup_slideshow(7)
+    scene_sequences, effect_sequences = ds.get_slideshow_sequences()
+    channels = [seq.channel for seq in scene_sequences + effect_sequences]
+    for cam, sequence_length in zip(ds.get_camera_navigation()['cameras'], (50, 200, 30, 300, 80, 40, 120)):
+        cam['ds_sequence_length'] = sequence_length
+    operator = ds.RetimeSlideshowOperator()
+    assert ds.execute_retime_slideshow(operator, context, 100, 25, True), operator.reports
+    scene_sequences, effect_sequences = ds.get_slideshow_sequences()
+    assert [seq.channel for seq in scene_sequences + effect_sequences] == channels
+    assert [seq.frame_final_duration for seq in scene_sequences] == [50+25, 200+50, 30+50, 300+50, 80+50, 40+50, 120+25+1]